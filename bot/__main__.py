@@ -61,7 +61,7 @@ async def main() -> None:
             command_prefix=commands.when_mentioned_or(constants.Bot.prefix),
             activity=discord.Game(name=f"Commands: {constants.Bot.prefix}help"),
             case_insensitive=True,
-            max_messages=10_000,
+            max_messages=constants.Bot.max_messages,
             allowed_mentions=discord.AllowedMentions(everyone=False, roles=allowed_roles),
             intents=intents,
             allowed_roles=list({discord.Object(id_) for id_ in constants.MODERATION_ROLES}),
@@ -10,6 +10,7 @@ from sentry_sdk import new_scope, start_transaction
 
 from bot import constants, exts
 from bot.log import get_logger
+from bot.utils.timers import TimerService
 
 log = get_logger("bot")
 
@@ -28,6 +29,7 @@ class Bot(BotBase):
     def __init__(self, *args, **kwargs):
 
         super().__init__(*args, **kwargs)
+        self.timers = TimerService()
 
     async def load_extension(self, name: str, *args, **kwargs) -> None:
         """Extend D.py's load_extension function to also record sentry performance stats."""
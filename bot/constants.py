@@ -7,6 +7,7 @@ By default, the values defined in the classes are used, these can be overridden
 """
 import os
 from enum import Enum
+from pathlib import Path
 
 from pydantic import BaseModel, computed_field
 from pydantic_settings import BaseSettings
@@ -38,6 +39,8 @@ class _Bot(EnvConfig, env_prefix="bot_"):
 
     prefix: str = "!"
     sentry_dsn: str = ""
+    # The number of messages kept in the bot's message cache.
+    max_messages: int = 10_000
     token: str
     trace_loggers: str = "*"
 
@@ -318,6 +321,21 @@ class _RedirectOutput(EnvConfig, env_prefix="redirect_output_"):
 RedirectOutput = _RedirectOutput()
 
 
+class _Doc(EnvConfig, env_prefix="doc_"):
+
+    # Where to keep the snapshot of the documentation inventories which is loaded on startup.
+    # This should be on a volume which outlives the container, otherwise every restart starts without a snapshot.
+    snapshot_path: Path = Path("data", "doc_inventories.json.gz")
+
+    # How many pages of documentation can be parsed at the same time.
+    parse_workers: int = 4
+    # How many parsed symbols are collected before they're written to redis together.
+    redis_batch_size: int = 50
+
+
+Doc = _Doc()
+
+
 class _DuckPond(EnvConfig, env_prefix="duck_pond_"):
 
     threshold: int = 7
@@ -394,9 +412,24 @@ class _Redis(EnvConfig, env_prefix="redis_"):
 Redis = _Redis()
 
 
+class _Filters(EnvConfig, env_prefix="filters_"):
+
+    # Whether the filter lists subscribed to an event are run concurrently rather than one after the other.
+    concurrent_dispatch: bool = True
+    # How many seconds a single filter list may take on an event before its result is dropped.
+    list_timeout: float = 5.0
+    # How many bytes may be read in total from the text attachments of a single message.
+    attachment_bytes_budget: int = 100_000
+
+
+Filters = _Filters()
+
+
 class _CleanMessages(EnvConfig, env_prefix="clean_"):
 
     message_limit: int = 10_000
+    # How many channel histories are scanned at once.
+    scan_concurrency: int = 5
 
 
 CleanMessages = _CleanMessages()
@@ -411,6 +444,50 @@ class _Stats(EnvConfig, env_prefix="stats_"):
 Stats = _Stats()
 
 
+class _UserSync(EnvConfig, env_prefix="user_sync_"):
+
+    # How long changes to users are collected before they're sent to the site.
+    flush_interval: float = 5.0
+    # The most users sent to the site in a single request.
+    batch_size: int = 500
+
+
+UserSync = _UserSync()
+
+
+class _Timers(EnvConfig, env_prefix="timers_"):
+
+    # The most scheduled coroutines which are run at once, for example when catching up on overdue ones.
+    max_concurrency: int = 25
+
+
+Timers = _Timers()
+
+
+class _OverdueReminders(EnvConfig, env_prefix="overdue_reminders_"):
+
+    # How many reminders which became due while the bot was down are sent at once.
+    concurrency: int = 5
+    # How many of the sent reminders are collected before they're deleted from the site.
+    delete_batch_size: int = 25
+
+
+OverdueReminders = _OverdueReminders()
+
+
+class _SnekboxJobs(EnvConfig, env_prefix="snekbox_jobs_"):
+
+    # How many jobs of each Python version are run by snekbox at once.
+    concurrency: int = 4
+    # How long the results of jobs are reused for identical jobs, in seconds.
+    result_ttl: int = 120
+    # The most job results which are kept for reuse.
+    result_cache_size: int = 256
+
+
+SnekboxJobs = _SnekboxJobs()
+
+
 class _Cooldowns(EnvConfig, env_prefix="cooldowns_"):
 
     tags: int = 60
@@ -426,6 +503,12 @@ class _Metabase(EnvConfig, env_prefix="metabase_"):
     base_url: str = "http://metabase.tooling.svc.cluster.local"
     public_url: str = "https://metabase.pydis.wtf"
     max_session_age: int = 20_160
+    # The most rows of an export which are read, and kept for internal eval.
+    max_export_rows: int = 100_000
+    # The most bytes of the text of an export which are read, and kept for internal eval.
+    max_export_bytes: int = 50_000_000
+    # How many of the latest exports are kept for internal eval.
+    max_cached_exports: int = 10
 
 
 Metabase = _Metabase()
@@ -147,7 +147,7 @@ class Branding(commands.Cog):
         log.info(f"Applying '{asset_type.value}' asset to the guild.")
 
         try:
-            file = await self.repository.fetch_file(download_url)
+            file = await self.repository.fetch_asset(download_url)
         except Exception:
             log.exception(f"Failed to fetch '{asset_type.value}' asset.")
             return False
@@ -1,5 +1,7 @@
+import asyncio
 import typing as t
 from datetime import UTC, date, datetime
+from urllib.parse import quote
 
 import frontmatter
 from aiohttp import ClientResponse, ClientResponseError
@@ -9,9 +11,12 @@ from bot.bot import Bot
 from bot.constants import Keys
 from bot.errors import BrandingMisconfigurationError
 from bot.log import get_logger
+from bot.utils.caching import TTLCache
 
 # Base URL for requests into the branding repository.
-BRANDING_URL = "https://api.github.com/repos/python-discord/branding/contents"
+BRANDING_URL = "https://api.github.com/repos/python-discord/branding"
+# Base URL for downloading files from the branding repository.
+BRANDING_RAW_URL = "https://raw.githubusercontent.com/python-discord/branding"
 
 PARAMS = {"ref": "main"}  # Target branch.
 HEADERS = {"Accept": "application/vnd.github.v3+json"}  # Ensure we use API v3.
@@ -27,6 +32,10 @@ ARBITRARY_YEAR = 2020
 # Format used to parse date strings after we inject `ARBITRARY_YEAR` at the end.
 DATE_FMT = "%B %d %Y"  # Ex: July 10 2020
 
+# Assets are kept by their SHA so that rotating back to one doesn't download it again. They can be a few MB each.
+ASSET_CACHE_SIZE = 16
+ASSET_CACHE_TTL = 7 * 24 * 60 * 60
+
 log = get_logger(__name__)
 
 
@@ -51,6 +60,19 @@ class RemoteObject:
         for annotation in self.__annotations__:
             setattr(self, annotation, dictionary[annotation])
 
+    @classmethod
+    def from_tree_entry(cls, entry: dict[str, t.Any]) -> "RemoteObject":
+        """Create an object from an entry of a git tree, which are identified by path only."""
+        is_file = entry["type"] == "blob"
+        return cls({
+            "sha": entry["sha"],
+            "name": entry["path"].rpartition("/")[2],
+            "path": entry["path"],
+            "type": "file" if is_file else "dir",
+            # Matches the download URL given by the contents API, which is what's stored in the rotation caches.
+            "download_url": f"{BRANDING_RAW_URL}/{PARAMS['ref']}/{quote(entry['path'])}" if is_file else None,
+        })
+
 
 class MetaFile(t.NamedTuple):
     """Attributes defined in a 'meta.md' file."""
@@ -115,8 +137,10 @@ class BrandingRepository:
     We work with the assumption that the branding repository checks for such conflicts and prevents them
     from reaching the main branch.
 
-    This class keeps no internal state. All `get_current_event` calls will result in GitHub API requests.
-    The caller is therefore responsible for being responsible and caching information to prevent API abuse.
+    The whole repository is discovered with a single request for its recursive git tree. The tree is revalidated
+    with its ETag, so an unchanged repository costs a single 304 response, which doesn't count against the rate limit.
+    Events are kept by the SHA of their directory, and are only constructed again when something in it changes.
+    Downloaded assets are also kept by their SHA, for a limited time.
 
     Requests are made using the HTTP session looked up on the bot instance.
     """
@@ -124,23 +148,64 @@ class BrandingRepository:
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+        self._tree: dict[str, RemoteObject] = {}
+        self._tree_etag: str | None = None
+        # Constructed events, by the SHA of their directory.
+        self._events: dict[str, Event] = {}
+        self._assets: TTLCache[str, bytes] = TTLCache(ASSET_CACHE_SIZE, ASSET_CACHE_TTL)
+
     @_retry_server_error
-    async def fetch_directory(self, path: str, types: t.Container[str] = ("file", "dir")) -> dict[str, RemoteObject]:
+    async def fetch_tree(self) -> dict[str, RemoteObject]:
         """
-        Fetch directory found at `path` in the branding repository.
+        Fetch every file and directory in the branding repository, mapped by their path from the repo root.
 
+        If the repository hasn't changed since the last fetch, the previous tree is returned.
         Raise an exception if the request fails, or if the response lacks the expected keys.
-
-        Passing custom `types` allows getting only files or directories. By default, both are included.
         """
-        full_url = f"{BRANDING_URL}/{path}"
-        log.debug(f"Fetching directory from branding repository: '{full_url}'.")
+        full_url = f"{BRANDING_URL}/git/trees/{PARAMS['ref']}"
+        log.debug(f"Fetching tree from branding repository: '{full_url}'.")
+
+        headers = HEADERS
+        if self._tree_etag:
+            headers = {**HEADERS, "If-None-Match": self._tree_etag}
+
+        async with self.bot.http_session.get(full_url, params={"recursive": "1"}, headers=headers) as response:
+            if response.status == 304:
+                log.trace("Branding repository tree hasn't changed.")
+                return self._tree
 
-        async with self.bot.http_session.get(full_url, params=PARAMS, headers=HEADERS) as response:
             _raise_for_status(response)
-            json_directory = await response.json()
+            json_tree = await response.json()
+            etag = response.headers.get("ETag")
+
+        if json_tree.get("truncated"):
+            log.warning("The branding repository tree was truncated by GitHub, some events may be missing.")
+
+        self._tree = {
+            entry["path"]: RemoteObject.from_tree_entry(entry)
+            for entry in json_tree["tree"]
+            if entry["type"] in ("blob", "tree")  # Skip submodules.
+        }
+        self._tree_etag = etag
+        return self._tree
+
+    @staticmethod
+    def list_directory(
+        tree: dict[str, RemoteObject],
+        path: str,
+        types: t.Container[str] = ("file", "dir"),
+    ) -> dict[str, RemoteObject]:
+        """
+        List the directory found at `path` in the `tree`, mapping names to objects.
 
-        return {file["name"]: RemoteObject(file) for file in json_directory if file["type"] in types}
+        Passing custom `types` allows getting only files or directories. By default, both are included.
+        """
+        prefix = f"{path}/"
+        return {
+            obj.name: obj
+            for obj_path, obj in tree.items()
+            if obj_path.startswith(prefix) and "/" not in obj_path[len(prefix):] and obj.type in types
+        }
 
     @_retry_server_error
     async def fetch_file(self, download_url: str) -> bytes:
@@ -155,6 +220,22 @@ class BrandingRepository:
             _raise_for_status(response)
             return await response.read()
 
+    async def fetch_asset(self, download_url: str) -> bytes:
+        """
+        Fetch an asset from `download_url`, unless the same version of it was downloaded recently.
+
+        Assets are identified by their SHA in the last fetched tree. Assets which aren't in it are always downloaded.
+        """
+        sha = next((obj.sha for obj in self._tree.values() if obj.download_url == download_url), None)
+        if sha is not None and (asset := self._assets.get(sha)) is not None:
+            log.trace(f"Using cached asset for '{download_url}'.")
+            return asset
+
+        asset = await self.fetch_file(download_url)
+        if sha is not None:
+            self._assets.set(sha, asset)
+        return asset
+
     def parse_meta_file(self, raw_file: bytes) -> MetaFile:
         """
         Parse a 'meta.md' file from raw bytes.
@@ -182,21 +263,21 @@ class BrandingRepository:
 
         return MetaFile(is_fallback=False, start_date=start_date, end_date=end_date, description=description)
 
-    async def construct_event(self, directory: RemoteObject) -> Event:
+    async def construct_event(self, directory: RemoteObject, tree: dict[str, RemoteObject]) -> Event:
         """
-        Construct an `Event` instance from an event `directory`.
+        Construct an `Event` instance from an event `directory` in the `tree`.
 
         The caller is responsible for handling errors caused by misconfiguration.
         """
-        contents = await self.fetch_directory(directory.path)
+        contents = self.list_directory(tree, directory.path)
 
         missing_assets = {"meta.md", "server_icons", "banners"} - contents.keys()
 
         if missing_assets:
             raise BrandingMisconfigurationError(f"Directory is missing following assets: {missing_assets}")
 
-        server_icons = await self.fetch_directory(contents["server_icons"].path, types=("file",))
-        banners = await self.fetch_directory(contents["banners"].path, types=("file",))
+        server_icons = self.list_directory(tree, contents["server_icons"].path, types=("file",))
+        banners = self.list_directory(tree, contents["banners"].path, types=("file",))
 
         if len(server_icons) == 0:
             raise BrandingMisconfigurationError("Found no server icons!")
@@ -213,18 +294,24 @@ class BrandingRepository:
         """
         Discover available events in the branding repository.
 
-        Propagate errors if an event fails to fetch or deserialize.
+        Events whose directory hasn't changed since they were last constructed are reused, and the rest are
+        constructed concurrently. Propagate errors if an event fails to fetch or deserialize.
         """
         log.debug("Discovering events in branding repository.")
 
-        event_directories = await self.fetch_directory("events", types=("dir",))  # Skip files.
+        tree = await self.fetch_tree()
+        event_directories = self.list_directory(tree, "events", types=("dir",))  # Skip files.
 
-        instances: list[Event] = []
-
-        for event_directory in event_directories.values():
+        async def get_event(event_directory: RemoteObject) -> Event:
+            if (event := self._events.get(event_directory.sha)) is not None:
+                return event
             log.trace(f"Reading event directory: '{event_directory.path}'.")
-            instance = await self.construct_event(event_directory)
-            instances.append(instance)
+            return await self.construct_event(event_directory, tree)
+
+        instances = await asyncio.gather(*(get_event(directory) for directory in event_directories.values()))
+        self._events = {
+            directory.sha: instance for directory, instance in zip(event_directories.values(), instances, strict=True)
+        }
 
         return instances
 
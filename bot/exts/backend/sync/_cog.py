@@ -1,15 +1,14 @@
 import asyncio
-from typing import Any
 
 from discord import Guild, Member, Role, User
 from discord.ext import commands
 from discord.ext.commands import Cog, Context
-from pydis_core.site_api import ResponseCodeError
 from pydis_core.utils.scheduling import create_task
 
 from bot import constants
 from bot.bot import Bot
 from bot.exts.backend.sync import _syncers
+from bot.exts.backend.sync._user_queue import UserUpdateQueue
 from bot.log import get_logger
 
 log = get_logger(__name__)
@@ -22,7 +21,7 @@ class Sync(Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
         self.guild: Guild | None = None
-
+        self.user_queue = UserUpdateQueue(bot)
 
     async def cog_load(self) -> None:
         """Syncs the roles/users of the guild with the database."""
@@ -48,6 +47,10 @@ class Sync(Cog):
             await asyncio.sleep(10)
         create_task(self.sync())
 
+    async def cog_unload(self) -> None:
+        """Send the pending changes to users before unloading."""
+        await self.user_queue.close()
+
     async def sync(self) -> None:
         await asyncio.sleep(10)  # Give time to other cogs starting up
 
@@ -55,16 +58,6 @@ class Sync(Cog):
         for syncer in (_syncers.RoleSyncer, _syncers.UserSyncer):
             await syncer.sync(self.guild)
 
-    async def patch_user(self, user_id: int, json: dict[str, Any], ignore_404: bool = False) -> None:
-        """Send a PATCH request to partially update a user in the database."""
-        try:
-            await self.bot.api_client.patch(f"bot/users/{user_id}", json=json)
-        except ResponseCodeError as e:
-            if e.response.status != 404:
-                raise
-            if not ignore_404:
-                log.warning("Unable to update user, got 404. Assuming race condition from join event.")
-
     @Cog.listener()
     async def on_guild_role_create(self, role: Role) -> None:
         """Adds newly create role to the database table over the API."""
@@ -123,6 +116,8 @@ class Sync(Cog):
         If the joining member is a user that is already known to the database (i.e., a user that
         previously left), it will update the user's information. If the user is not yet known by
         the database, the user is added.
+
+        Like the other user events, the change is queued and sent to the site in a batch.
         """
         if member.guild.id != constants.Guild.id:
             return
@@ -134,24 +129,7 @@ class Sync(Cog):
             "name": member.name,
             "roles": sorted(role.id for role in member.roles)
         }
-
-        got_error = False
-
-        try:
-            # First try an update of the user to set the `in_guild` field and other
-            # fields that may have changed since the last time we've seen them.
-            await self.bot.api_client.put(f"bot/users/{member.id}", json=packed)
-
-        except ResponseCodeError as e:
-            # If we didn't get 404, something else broke - propagate it up.
-            if e.response.status != 404:
-                raise
-
-            got_error = True  # yikes
-
-        if got_error:
-            # If we got `404`, the user is new. Create them.
-            await self.bot.api_client.post("bot/users", json=packed)
+        self.user_queue.create(member.id, packed)
 
     @Cog.listener()
     async def on_member_remove(self, member: Member) -> None:
@@ -159,7 +137,7 @@ class Sync(Cog):
         if member.guild.id != constants.Guild.id:
             return
 
-        await self.patch_user(member.id, json={"in_guild": False})
+        self.user_queue.update(member.id, {"in_guild": False})
 
     @Cog.listener()
     async def on_member_update(self, before: Member, after: Member) -> None:
@@ -169,7 +147,7 @@ class Sync(Cog):
 
         if before.roles != after.roles:
             updated_information = {"roles": sorted(role.id for role in after.roles)}
-            await self.patch_user(after.id, json=updated_information)
+            self.user_queue.update(after.id, updated_information)
 
     @Cog.listener()
     async def on_user_update(self, before: User, after: User) -> None:
@@ -180,8 +158,8 @@ class Sync(Cog):
                 "name": after.name,
                 "discriminator": int(after.discriminator),
             }
-            # A 404 likely means the user is in another guild.
-            await self.patch_user(after.id, json=updated_information, ignore_404=True)
+            # The user may not be in the database if they're only in another guild, which is ignored.
+            self.user_queue.update(after.id, updated_information)
 
     @commands.group(name="sync")
     @commands.has_permissions(administrator=True)
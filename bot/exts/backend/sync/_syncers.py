@@ -1,7 +1,11 @@
 import abc
+import asyncio
+import math
+import time
 import typing as t
-from collections import namedtuple
-from itertools import batched
+from collections import deque, namedtuple
+from contextlib import suppress
+from itertools import batched, islice
 
 import discord.errors
 from discord import Guild
@@ -14,6 +18,12 @@ from bot.log import get_logger
 log = get_logger(__name__)
 
 CHUNK_SIZE = 1000
+# How many pages of users are requested from the site at the same time.
+MAX_CONCURRENT_PAGES = 3
+# The most members that can be requested through a single gateway member request.
+MEMBER_QUERY_LIMIT = 100
+# How often the progress message of a sync is edited, in seconds.
+PROGRESS_INTERVAL = 5
 
 # These objects are declared as namedtuples because tuples are hashable,
 # something that we make use of when diffing site roles against guild roles.
@@ -45,12 +55,22 @@ class Syncer(abc.ABC):
         """Perform the API calls for synchronisation."""
         raise NotImplementedError  # pragma: no cover
 
+    @classmethod
+    async def _get_diffs(cls, guild: Guild) -> t.AsyncIterator[_Diff]:
+        """
+        Yield the difference between the cache of `guild` and the database in parts, as they're found.
+
+        By default, the whole diff is yielded at once.
+        """
+        yield await cls._get_diff(guild)
+
     @classmethod
     async def sync(cls, guild: Guild, ctx: Context | None = None) -> None:
         """
         Synchronise the database with the cache of `guild`.
 
-        If `ctx` is given, send a message with the results.
+        Each part of the diff is synchronised as soon as it's found.
+        If `ctx` is given, send a message with the results, which is updated with the progress of the sync.
         """
         log.info(f"Starting {cls.name} syncer.")
 
@@ -58,10 +78,19 @@ class Syncer(abc.ABC):
             message = await ctx.send(f"📊 Synchronising {cls.name}s.")
         else:
             message = None
-        diff = await cls._get_diff(guild)
 
+        totals = {}
+        last_progress = time.monotonic()
         try:
-            await cls._sync(diff)
+            async for diff in cls._get_diffs(guild):
+                await cls._sync(diff)
+
+                for name, val in diff._asdict().items():
+                    if val is not None:
+                        totals[name] = totals.get(name, 0) + len(val)
+                if message and time.monotonic() - last_progress > PROGRESS_INTERVAL:
+                    last_progress = time.monotonic()
+                    await message.edit(content=f"📊 Synchronising {cls.name}s: {cls._format_totals(totals)}")
         except ResponseCodeError as e:
             log.exception(f"{cls.name} syncer failed!")
 
@@ -69,9 +98,7 @@ class Syncer(abc.ABC):
             results = f"status {e.status}\n```{e.response_json or 'See log output for details'}```"
             content = f":x: Synchronisation of {cls.name}s failed: {results}"
         else:
-            diff_dict = diff._asdict()
-            results = (f"{name} `{len(val)}`" for name, val in diff_dict.items() if val is not None)
-            results = ", ".join(results)
+            results = cls._format_totals(totals)
 
             log.info(f"{cls.name} syncer finished: {results}.")
             content = f":ok_hand: Synchronisation of {cls.name}s complete: {results}"
@@ -79,6 +106,11 @@ class Syncer(abc.ABC):
         if message:
             await message.edit(content=content)
 
+    @staticmethod
+    def _format_totals(totals: dict[str, int]) -> str:
+        """Format the amount of synchronised objects of each kind for the result messages."""
+        return ", ".join(f"{name} `{total}`" for name, total in totals.items())
+
 
 class RoleSyncer(Syncer):
     """Synchronise the database with roles in the cache."""
@@ -142,54 +174,77 @@ class UserSyncer(Syncer):
     @staticmethod
     async def _get_diff(guild: Guild) -> _Diff:
         """Return the difference of users between the cache of `guild` and the database."""
-        log.trace("Getting the diff for users.")
-
         users_to_create = []
         users_to_update = []
+        async for diff in UserSyncer._get_diffs(guild):
+            users_to_create.extend(diff.created)
+            users_to_update.extend(diff.updated)
+
+        return _Diff(users_to_create, users_to_update, None)
+
+    @staticmethod
+    async def _get_diffs(guild: Guild) -> t.AsyncIterator[_Diff]:
+        """
+        Yield the difference of users between the cache of `guild` and the database.
+
+        The updated users are yielded for each page of database users as it's fetched,
+        and the users to create are yielded last, once all of the database users were seen.
+        """
+        log.trace("Getting the diff for users.")
+
         seen_guild_users = set()
 
-        async for db_user in UserSyncer._get_users():
-            # Store user fields which are to be updated.
-            updated_fields = {}
-
-            def maybe_update(db_field: str, guild_value: str | int) -> None:
-                # Equalize DB user and guild user attributes.
-                if db_user[db_field] != guild_value:  # noqa: B023
-                    updated_fields[db_field] = guild_value  # noqa: B023
-
-            guild_user = guild.get_member(db_user["id"])
-            if not guild_user and db_user["in_guild"]:
-                # The member was in the guild during the last sync.
-                # We try to fetch them to verify cache integrity.
-                try:
-                    guild_user = await guild.fetch_member(db_user["id"])
-                except discord.errors.NotFound:
-                    guild_user = None
-
-            if guild_user:
-                seen_guild_users.add(guild_user.id)
-
-                maybe_update("name", guild_user.name)
-                maybe_update("display_name", guild_user.display_name)
-                maybe_update("discriminator", int(guild_user.discriminator))
-                maybe_update("in_guild", True)
-
-                guild_roles = [role.id for role in guild_user.roles]
-                if set(db_user["roles"]) != set(guild_roles):
-                    updated_fields["roles"] = guild_roles
-
-            elif db_user["in_guild"]:
-                # The user is known in the DB but not the guild, and the
-                # DB currently specifies that the user is a member of the guild.
-                # This means that the user has left since the last sync.
-                # Update the `in_guild` attribute of the user on the site
-                # to signify that the user left.
-                updated_fields["in_guild"] = False
-
-            if updated_fields:
-                updated_fields["id"] = db_user["id"]
-                users_to_update.append(updated_fields)
+        async for db_users in UserSyncer._get_user_pages():
+            users_to_update = []
+
+            guild_users = {db_user["id"]: guild.get_member(db_user["id"]) for db_user in db_users}
+            # Members missing from the cache that were in the guild during the last sync.
+            # We try to fetch them to verify cache integrity.
+            missing_ids = [
+                db_user["id"] for db_user in db_users if db_user["in_guild"] and not guild_users[db_user["id"]]
+            ]
+            if missing_ids:
+                guild_users.update(await UserSyncer._fetch_members(guild, missing_ids))
+
+            for db_user in db_users:
+                # Store user fields which are to be updated.
+                updated_fields = {}
 
+                def maybe_update(db_field: str, guild_value: str | int) -> None:
+                    # Equalize DB user and guild user attributes.
+                    if db_user[db_field] != guild_value:  # noqa: B023
+                        updated_fields[db_field] = guild_value  # noqa: B023
+
+                guild_user = guild_users[db_user["id"]]
+
+                if guild_user:
+                    seen_guild_users.add(guild_user.id)
+
+                    maybe_update("name", guild_user.name)
+                    maybe_update("display_name", guild_user.display_name)
+                    maybe_update("discriminator", int(guild_user.discriminator))
+                    maybe_update("in_guild", True)
+
+                    guild_roles = [role.id for role in guild_user.roles]
+                    if set(db_user["roles"]) != set(guild_roles):
+                        updated_fields["roles"] = guild_roles
+
+                elif db_user["in_guild"]:
+                    # The user is known in the DB but not the guild, and the
+                    # DB currently specifies that the user is a member of the guild.
+                    # This means that the user has left since the last sync.
+                    # Update the `in_guild` attribute of the user on the site
+                    # to signify that the user left.
+                    updated_fields["in_guild"] = False
+
+                if updated_fields:
+                    updated_fields["id"] = db_user["id"]
+                    users_to_update.append(updated_fields)
+
+            if users_to_update:
+                yield _Diff([], users_to_update, None)
+
+        users_to_create = []
         for member in guild.members:
             if member.id not in seen_guild_users:
                 # The user is known on the guild but not on the API. This means
@@ -204,20 +259,69 @@ class UserSyncer(Syncer):
                 }
                 users_to_create.append(new_user)
 
-        return _Diff(users_to_create, users_to_update, None)
+        yield _Diff(users_to_create, [], None)
 
     @staticmethod
-    async def _get_users() -> t.AsyncIterable:
-        """GET users from database."""
-        query_params = {
-            "page": 1
-        }
-        while query_params["page"]:
-            res = await bot.instance.api_client.get("bot/users", params=query_params)
-            for user in res["results"]:
-                yield user
+    async def _fetch_members(guild: Guild, user_ids: list[int]) -> dict[int, discord.Member]:
+        """
+        Fetch the members of `guild` with the given ids, mapped by their ids.
 
-            query_params["page"] = res["next_page_no"]
+        The members are requested through the gateway in chunks of ids,
+        falling back to fetching each member separately if a request times out.
+        """
+        members = {}
+        for chunk in batched(user_ids, MEMBER_QUERY_LIMIT):
+            try:
+                chunk_members = await guild.query_members(user_ids=list(chunk), limit=len(chunk))
+            except TimeoutError:
+                log.info(f"Member request of {len(chunk)} users timed out, fetching them separately.")
+                chunk_members = []
+                for user_id in chunk:
+                    with suppress(discord.errors.NotFound):
+                        chunk_members.append(await guild.fetch_member(user_id))
+            members.update((member.id, member) for member in chunk_members)
+        return members
+
+    @staticmethod
+    async def _get_user_pages() -> t.AsyncIterator[list[dict]]:
+        """
+        GET the pages of users from the database, in order.
+
+        The amount of pages is known after the first one, after which up to
+        `MAX_CONCURRENT_PAGES` pages are requested ahead of the page that's being yielded.
+        """
+        async def get_page(page_no: int) -> dict:
+            try:
+                return await bot.instance.api_client.get("bot/users", params={"page": page_no})
+            except ResponseCodeError as e:
+                # The last pages may not exist anymore if users were deleted since the amount of pages was known.
+                if e.status == 404 and page_no > 1:
+                    return {"results": [], "next_page_no": None}
+                raise
+
+        res = await get_page(1)
+        yield res["results"]
+
+        if res["next_page_no"] and res.get("count") and res["results"]:
+            page_count = math.ceil(res["count"] / len(res["results"]))
+            page_numbers = iter(range(res["next_page_no"], page_count + 1))
+            requests = deque(
+                asyncio.create_task(get_page(page_no)) for page_no in islice(page_numbers, MAX_CONCURRENT_PAGES)
+            )
+            try:
+                while requests:
+                    res = await requests.popleft()
+                    if (page_no := next(page_numbers, None)) is not None:
+                        requests.append(asyncio.create_task(get_page(page_no)))
+                    yield res["results"]
+            finally:
+                for request in requests:
+                    request.cancel()
+
+        # Users may have been added since the amount of pages was known, follow the pages until the last one.
+        while res["next_page_no"]:
+            res = await get_page(res["next_page_no"])
+            yield res["results"]
 
     @staticmethod
     async def _sync(diff: _Diff) -> None:
@@ -0,0 +1,195 @@
+import asyncio
+import itertools
+import re
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from pydis_core.site_api import ResponseCodeError
+from pydis_core.utils import scheduling
+
+from bot.bot import Bot
+from bot.constants import UserSync
+from bot.log import get_logger
+from bot.utils.caching import TTLCache
+
+log = get_logger(__name__)
+
+# How many users the site reported as missing are remembered, and for how long, so their updates aren't sent.
+UNKNOWN_USERS_CACHE_SIZE = 10_000
+UNKNOWN_USERS_TTL = 60 * 60
+
+
+@dataclass(slots=True)
+class PendingUser:
+    """The changes to a user which weren't sent to the site yet."""
+
+    fields: dict[str, Any]
+    # Set when the user joined, in which case `fields` contains the whole user and it may have to be created.
+    create: bool = False
+
+
+class UserUpdateQueue:
+    """
+    Write-behind queue of changes to users, which are sent to the site in batches.
+
+    Changes to the same user are merged until they're sent, so for example a join followed by a role update
+    results in a single record. Pending changes are sent once `UserSync.flush_interval` passes after a change,
+    or right away once there are `UserSync.batch_size` users with pending changes.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._pending: dict[int, PendingUser] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: asyncio.Task | None = None
+        # Users which aren't in the database, whose updates would make the site reject the whole bulk update.
+        self._unknown_users: TTLCache[int, bool] = TTLCache(UNKNOWN_USERS_CACHE_SIZE, UNKNOWN_USERS_TTL)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def create(self, user_id: int, fields: dict[str, Any]) -> None:
+        """Queue the whole user to be created, or updated if the user is already in the database."""
+        self._put(user_id, fields, create=True)
+
+    def update(self, user_id: int, fields: dict[str, Any]) -> None:
+        """Queue `fields` to be updated on the user, if the user is in the database."""
+        self._put(user_id, fields, create=False)
+
+    def _put(self, user_id: int, fields: dict[str, Any], *, create: bool) -> None:
+        """Merge `fields` into the pending changes of the user, and schedule the changes to be sent."""
+        if create:
+            self._unknown_users.pop(user_id)
+        if (pending := self._pending.get(user_id)) is None:
+            self._pending[user_id] = PendingUser(fields.copy(), create)
+        else:
+            pending.fields.update(fields)
+            pending.create = pending.create or create
+        self._report_depth()
+
+        if len(self._pending) >= UserSync.batch_size:
+            if not self._flush_lock.locked():
+                scheduling.create_task(self.flush(), name="User sync flush")
+        elif self._flush_timer is None:
+            self._flush_timer = scheduling.create_task(self._flush_later(), name="User sync flush timer")
+
+    async def _flush_later(self) -> None:
+        """Send the pending changes once the flush interval passes."""
+        await asyncio.sleep(UserSync.flush_interval)
+        # Unset before flushing, so that the timer is only ever cancelled while it's sleeping.
+        self._flush_timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send all pending changes to the site, in batches of up to `UserSync.batch_size` users."""
+        async with self._flush_lock:
+            while self._pending:
+                batch = dict(itertools.islice(self._pending.items(), UserSync.batch_size))
+                for user_id in batch:
+                    del self._pending[user_id]
+                self._report_depth()
+
+                start = time.perf_counter()
+                await self._send(batch)
+                self.bot.stats.timing("sync.users.flush_time", (time.perf_counter() - start) * 1000)
+                self.bot.stats.gauge("sync.users.batch_size", len(batch))
+
+    async def close(self) -> None:
+        """Cancel the scheduled flush and send all pending changes right away."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        await self.flush()
+
+    async def _send(self, batch: dict[int, PendingUser]) -> None:
+        """
+        Send the changes in `batch` through the bulk endpoints.
+
+        Users that joined are created first, which ignores users that already exist,
+        and then all users are patched with their changes.
+        Updates of users the site recently reported as missing are left out.
+        If the site rejects the batch, the changes are sent for each user separately instead.
+        """
+        batch = {
+            user_id: pending for user_id, pending in batch.items()
+            if pending.create or user_id not in self._unknown_users
+        }
+        if not batch:
+            return
+
+        created = [pending.fields for pending in batch.values() if pending.create]
+        updated = [{**pending.fields, "id": user_id} for user_id, pending in batch.items()]
+        try:
+            if created:
+                await self.bot.api_client.post("bot/users", json=created)
+            await self._bulk_patch(updated)
+        except ResponseCodeError as e:
+            if not 400 <= e.status < 500:
+                log.exception(f"Failed to send the changes of {len(batch)} users to the site.")
+                return
+            log.info(f"Bulk update of {len(batch)} users was rejected with status {e.status}, sending separately.")
+            for user_id, pending in batch.items():
+                if pending.create or user_id not in self._unknown_users:
+                    await self._send_user(user_id, pending)
+        except Exception:
+            log.exception(f"Failed to send the changes of {len(batch)} users to the site.")
+
+    async def _bulk_patch(self, updated: list[dict[str, Any]]) -> None:
+        """
+        Patch the users in `updated` through the bulk endpoint.
+
+        The site rejects the whole update with a 404 if any of the users doesn't exist.
+        In that case the missing user named in the response is left out, and the update is retried once.
+        """
+        try:
+            await self.bot.api_client.patch("bot/users/bulk_patch", json=updated)
+        except ResponseCodeError as e:
+            missing = self._missing_user_ids(e, updated)
+            if e.status != 404 or not missing:
+                raise
+
+            log.debug(f"Users {missing} are not in the database, retrying the bulk update without them.")
+            for user_id in missing:
+                self._unknown_users.set(user_id, True)
+            if updated := [user for user in updated if user["id"] not in missing]:
+                await self.bot.api_client.patch("bot/users/bulk_patch", json=updated)
+
+    @staticmethod
+    def _missing_user_ids(error: ResponseCodeError, updated: list[dict[str, Any]]) -> set[int]:
+        """Return the IDs of the users in `updated` which are named in the response of the rejected update."""
+        response = str(error.response_json or error.response_text or "")
+        mentioned = {int(match) for match in re.findall(r"\d+", response)}
+        return {user["id"] for user in updated} & mentioned
+
+    async def _send_user(self, user_id: int, pending: PendingUser) -> None:
+        """Send the changes of a single user to the site."""
+        try:
+            if pending.create:
+                await self._put_or_create(user_id, pending.fields)
+            else:
+                await self.bot.api_client.patch(f"bot/users/{user_id}", json=pending.fields)
+        except ResponseCodeError as e:
+            if e.status != 404:
+                log.exception(f"Failed to update user {user_id}.")
+            else:
+                # Users can be in other guilds the bot is in, without being in the database.
+                log.debug(f"Unable to update user {user_id}, got 404.")
+                self._unknown_users.set(user_id, True)
+
+    async def _put_or_create(self, user_id: int, fields: dict[str, Any]) -> None:
+        """Update the whole user, or create them if they're not in the database yet."""
+        try:
+            # First try an update of the user to set the `in_guild` field and other
+            # fields that may have changed since the last time we've seen them.
+            await self.bot.api_client.put(f"bot/users/{user_id}", json=fields)
+        except ResponseCodeError as e:
+            # If we didn't get 404, something else broke - propagate it up.
+            if e.status != 404:
+                raise
+            # If we got `404`, the user is new. Create them.
+            await self.bot.api_client.post("bot/users", json=fields)
+
+    def _report_depth(self) -> None:
+        """Send the amount of users with pending changes to stats."""
+        self.bot.stats.gauge("sync.users.queue_depth", len(self._pending))
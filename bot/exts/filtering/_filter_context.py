@@ -8,7 +8,8 @@ from enum import Enum, auto
 import discord
 from discord import DMChannel, Embed, Member, Message, StageChannel, TextChannel, Thread, User, VoiceChannel
 
-from bot.utils.message_cache import MessageCache
+from bot.exts.filtering._message_windows import AuthorWindowedMessageCache
+from bot.exts.filtering._utils import NormalizedContent
 
 if typing.TYPE_CHECKING:
     from bot.exts.filtering._filter_lists import FilterList
@@ -39,7 +40,7 @@ class FilterContext:
     embeds: list[Embed] = field(default_factory=list)  # Any embeds involved
     attachments: list[discord.Attachment | FileAttachment] = field(default_factory=list)  # Any attachments sent.
     before_message: Message | None = None
-    message_cache: MessageCache | None = None
+    message_cache: AuthorWindowedMessageCache | None = None
     # Output context
     dm_content: str = ""  # The content to DM the invoker
     dm_embed: str = ""  # The embed description to DM the invoker
@@ -59,6 +60,8 @@ class FilterContext:
     related_channels: set[TextChannel | Thread | DMChannel] = field(default_factory=set)
     uploaded_attachments: dict[int, list[str]] = field(default_factory=dict)  # Message ID to attachment URLs.
     upload_deletion_logs: bool = True  # Whether it's allowed to upload deletion logs.
+    # The normalized forms of the content, shared by all the filter lists checking this context.
+    _normalized: NormalizedContent | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # If it's in the context of a DM channel, self.channel won't be None, but self.channel.guild will.
@@ -66,7 +69,11 @@ class FilterContext:
 
     @classmethod
     def from_message(
-        cls, event: Event, message: Message, before: Message | None = None, cache: MessageCache | None = None
+        cls,
+        event: Event,
+        message: Message,
+        before: Message | None = None,
+        cache: AuthorWindowedMessageCache | None = None
     ) -> FilterContext:
         """Create a filtering context from the attributes of a message."""
         return cls(
@@ -81,6 +88,16 @@ class FilterContext:
             cache
         )
 
+    @property
+    def normalized(self) -> NormalizedContent:
+        """The normalized forms of the content. Only available when the content is a string."""
+        if self._normalized is None or self._normalized.content is not self.content:
+            self._normalized = NormalizedContent(self.content)
+        return self._normalized
+
     def replace(self, **changes) -> FilterContext:
         """Return a new context object assigning new values to the specified fields."""
-        return replace(self, **changes)
+        new_ctx = replace(self, **changes)
+        if new_ctx.content is self.content:
+            new_ctx._normalized = self._normalized
+        return new_ctx
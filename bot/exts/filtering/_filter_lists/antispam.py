@@ -5,7 +5,6 @@ from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, field
 from datetime import timedelta
 from functools import reduce
-from itertools import takewhile
 from operator import add, or_
 
 import arrow
@@ -33,7 +32,9 @@ class AntispamList(UniquesListBase):
     """
     A list of anti-spam rules.
 
-    Messages from the last X seconds are passed to each rule, which decides whether it triggers across those messages.
+    The author's messages from the last X seconds are passed to each rule, which decides whether it triggers across
+    those messages. The messages are taken from the author's window in the message cache, so the cost of a check
+    doesn't depend on how busy the rest of the server is.
 
     The infraction reason is set dynamically.
     """
@@ -66,9 +67,7 @@ class AntispamList(UniquesListBase):
         max_interval = max(filter_.extra_fields.interval for filter_ in potential_filters)
 
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=max_interval)
-        relevant_messages = list(
-            takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.message_cache)
-        )
+        relevant_messages = ctx.message_cache.author_window(ctx.author, earliest_relevant_at)
         new_ctx = ctx.replace(content=relevant_messages)
         triggers = await sublist.filter_list_result(new_ctx)
         if not triggers:
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import re
 import typing
+from collections import defaultdict
+from itertools import chain
 
 from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filter_lists.filter_list import FilterList, ListType
-from bot.exts.filtering._filters.domain import DomainFilter
+from bot.exts.filtering._filters.domain import DomainFilter, extract_url
 from bot.exts.filtering._filters.filter import Filter
 from bot.exts.filtering._settings import ActionSettings
-from bot.exts.filtering._utils import clean_input
 
 if typing.TYPE_CHECKING:
     from bot.exts.filtering.filtering import Filtering
@@ -33,6 +34,9 @@ class DomainsList(FilterList[DomainFilter]):
 
     def __init__(self, filtering_cog: Filtering):
         super().__init__()
+        # Maps each list type to the filters of that list grouped by registered domain.
+        # The filters are stored along with their position in the list, to be able to restore the original order.
+        self.domain_indexes: dict[ListType, dict[str, list[tuple[int, DomainFilter]]]] = {}
         filtering_cog.subscribe(self, Event.MESSAGE, Event.MESSAGE_EDIT, Event.SNEKBOX)
 
     def get_filter_type(self, content: str) -> type[Filter]:
@@ -44,6 +48,24 @@ class DomainsList(FilterList[DomainFilter]):
         """Return the types of filters used by this list."""
         return {DomainFilter}
 
+    def filters_changed(self, list_type: ListType) -> None:
+        """Rebuild the index of filters by registered domain for the list of the specified type."""
+        super().filters_changed(list_type)
+        index = defaultdict(list)
+        for position, filter_ in enumerate(self[list_type].filters.values()):
+            index[filter_.registered_domain].append((position, filter_))
+        self.domain_indexes[list_type] = dict(index)
+
+    def candidates(self, list_type: ListType, urls: set[str]) -> list[DomainFilter]:
+        """
+        Return the filters of the specified list type which share a registered domain with any of the URLs.
+
+        Other filters can't trigger on the URLs. The filters are returned in the same order as in the list.
+        """
+        index = self.domain_indexes[list_type]
+        domains = {extract_url(url).registered_domain for url in urls}
+        return [filter_ for _, filter_ in sorted(chain.from_iterable(index.get(domain, ()) for domain in domains))]
+
     async def actions_for(
         self, ctx: FilterContext
     ) -> tuple[ActionSettings | None, list[str], dict[ListType, list[Filter]]]:
@@ -52,11 +74,13 @@ class DomainsList(FilterList[DomainFilter]):
         if not text:
             return None, [], {}
 
-        text = clean_input(text)
+        text = ctx.normalized.cleaned
         urls = {match.group(1).lower().rstrip("/") for match in URL_RE.finditer(text)}
         new_ctx = ctx.replace(content=urls)
 
-        triggers = await self[ListType.DENY].filter_list_result(new_ctx)
+        deny_list = self[ListType.DENY]
+        candidates = self.candidates(ListType.DENY, urls)
+        triggers = await deny_list._create_filter_list_result(new_ctx, deny_list.defaults, candidates)
         ctx.notification_domain = new_ctx.notification_domain
         unknown_urls = urls - {filter_.content.lower() for filter_ in triggers}
         if unknown_urls:
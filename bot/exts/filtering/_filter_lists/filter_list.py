@@ -6,6 +6,7 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum
 from functools import reduce
+from operator import itemgetter
 from typing import Any
 
 import arrow
@@ -13,7 +14,7 @@ from discord.ext.commands import BadArgument, Context, Converter
 
 from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filters.filter import Filter, UniqueFilter
-from bot.exts.filtering._settings import ActionSettings, Defaults, create_settings
+from bot.exts.filtering._settings import ActionSettings, Defaults, ValidationSettings, create_settings
 from bot.exts.filtering._utils import FieldRequiring, past_tense
 from bot.log import get_logger
 
@@ -65,11 +66,34 @@ class AtomicList:
     defaults: Defaults
     filters: dict[int, Filter]
 
+    # Filters without overrides, and groups of filters sharing the same validation overrides.
+    # Each filter is stored with its position in the list. Rebuilt by `partition_filters`.
+    default_scoped: list[tuple[int, Filter]] = dataclasses.field(default_factory=list, init=False, repr=False)
+    override_groups: list[tuple[ValidationSettings, list[tuple[int, Filter]]]] = dataclasses.field(
+        default_factory=list, init=False, repr=False
+    )
+
     @property
     def label(self) -> str:
         """Provide a short description identifying the list with its name and type."""
         return f"{past_tense(self.list_type.name.lower())} {self.name.lower()}"
 
+    def partition_filters(self) -> None:
+        """
+        Split the filters into ones using the default validations, and groups of ones with identical overrides.
+
+        Validation overrides are interned when the filters are created, so filters with the same overrides share the
+        same object.
+        """
+        groups: dict[int, tuple[ValidationSettings, list[tuple[int, Filter]]]] = {}
+        self.default_scoped.clear()
+        for position, filter_ in enumerate(self.filters.values()):
+            if not filter_.validations:
+                self.default_scoped.append((position, filter_))
+            else:
+                groups.setdefault(id(filter_.validations), (filter_.validations, []))[1].append((position, filter_))
+        self.override_groups[:] = groups.values()
+
     async def filter_list_result(self, ctx: FilterContext) -> list[Filter]:
         """
         Sift through the list of filters, and return only the ones which apply to the given context.
@@ -83,27 +107,53 @@ class AtomicList:
             successful override.
 
         If the filter is relevant in context, see if it actually triggers.
+
+        The validations are checked once for each group of filters from `partition_filters`, rather than per filter.
         """
-        return await self._create_filter_list_result(ctx, self.defaults, self.filters.values())
+        passed_by_default, failed_by_default = self.defaults.validations.evaluate(ctx)
+
+        relevant_filters = []
+        if not failed_by_default:
+            relevant_filters.extend(self.default_scoped)
+        for validations, group in self.override_groups:
+            passed, failed = validations.evaluate(ctx)
+            if not failed and failed_by_default < passed:
+                relevant_filters.extend(group)
+        relevant_filters.sort(key=itemgetter(0))
+
+        triggered = [filter_ for _, filter_ in relevant_filters if await filter_.triggered_on(ctx)]
+        return self._ignore_previously_triggered(ctx, triggered)
 
     async def _create_filter_list_result(
         self, ctx: FilterContext, defaults: Defaults, filters: Iterable[Filter]
     ) -> list[Filter]:
-        """A helper function to evaluate the result of `filter_list_result`."""
+        """
+        Return which of the given filters apply to the context, following the strategy of `filter_list_result`.
+
+        Each distinct set of validation overrides is only evaluated once.
+        """
         passed_by_default, failed_by_default = defaults.validations.evaluate(ctx)
         default_answer = not bool(failed_by_default)
 
+        validation_results: dict[int, bool] = {}
         relevant_filters = []
         for filter_ in filters:
             if not filter_.validations:
                 if default_answer and await filter_.triggered_on(ctx):
                     relevant_filters.append(filter_)
             else:
-                passed, failed = filter_.validations.evaluate(ctx)
-                if not failed and failed_by_default < passed:
-                    if await filter_.triggered_on(ctx):
-                        relevant_filters.append(filter_)
+                is_relevant = validation_results.get(id(filter_.validations))
+                if is_relevant is None:
+                    passed, failed = filter_.validations.evaluate(ctx)
+                    is_relevant = not failed and failed_by_default < passed
+                    validation_results[id(filter_.validations)] = is_relevant
+                if is_relevant and await filter_.triggered_on(ctx):
+                    relevant_filters.append(filter_)
+
+        return self._ignore_previously_triggered(ctx, relevant_filters)
 
+    def _ignore_previously_triggered(self, ctx: FilterContext, relevant_filters: list[Filter]) -> list[Filter]:
+        """Drop filters which were already triggered by the message before it was edited."""
         if ctx.event == Event.MESSAGE_EDIT and ctx.message and self.list_type == ListType.DENY:
             previously_triggered = ctx.message_cache.get_message_metadata(ctx.message.id)
             # The message might not be cached.
@@ -190,6 +240,7 @@ class FilterList(dict[ListType, AtomicList], typing.Generic[T], FieldRequiring):
             defaults,
             filters
         )
+        self.filters_changed(list_type)
         return self[list_type]
 
     def add_filter(self, list_type: ListType, filter_data: dict) -> T | None:
@@ -197,8 +248,24 @@ class FilterList(dict[ListType, AtomicList], typing.Generic[T], FieldRequiring):
         new_filter = self._create_filter(filter_data, self[list_type].defaults)
         if new_filter:
             self[list_type].filters[filter_data["id"]] = new_filter
+            self.filters_changed(list_type)
         return new_filter
 
+    def remove_filter(self, list_type: ListType, filter_id: int) -> T | None:
+        """Remove the filter with the given ID from the list of the specified type, and return it if it was found."""
+        removed_filter = self[list_type].filters.pop(filter_id, None)
+        if removed_filter:
+            self.filters_changed(list_type)
+        return removed_filter
+
+    def filters_changed(self, list_type: ListType) -> None:
+        """
+        Called whenever filters are loaded, added, edited, or removed from the list of the specified type.
+
+        Subclasses which precompute structures from their filters should rebuild them here, and call this method too.
+        """
+        self[list_type].partition_filters()
+
     @abstractmethod
     def get_filter_type(self, content: str) -> type[T]:
         """Get a subclass of filter matching the filter list and the filter's content."""
@@ -302,6 +369,7 @@ class UniquesListBase(FilterList[UniqueFilter], ABC):
         new_list.filters.update(filters)
         if hasattr(self.filtering_cog, "subscribe"):  # Subscribe the filter list to any new events found.
             self.filtering_cog.subscribe(self, *events)
+        self.filters_changed(list_type)
         return new_list
 
     @property
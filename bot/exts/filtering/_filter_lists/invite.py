@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import re
 import typing
+from functools import partial
 
 from discord import Embed, Invite
 from discord.errors import NotFound
@@ -13,7 +15,7 @@ from bot.exts.filtering._filter_lists.filter_list import FilterList, ListType
 from bot.exts.filtering._filters.filter import Filter
 from bot.exts.filtering._filters.invite import InviteFilter
 from bot.exts.filtering._settings import ActionSettings
-from bot.exts.filtering._utils import clean_input
+from bot.utils.caching import AsyncTTLCache
 
 if typing.TYPE_CHECKING:
     from bot.exts.filtering.filtering import Filtering
@@ -25,6 +27,10 @@ REFINED_INVITE_CODE = re.compile(
     r"$"                            # Up until the end of the string.
 )
 
+# Resolved invites are cached, including ones which don't resolve, since the same invites tend to be spammed repeatedly.
+INVITE_CACHE_SIZE = 1_000
+INVITE_CACHE_TTL = 10 * 60  # Seconds.
+
 
 class InviteList(FilterList[InviteFilter]):
     """
@@ -45,6 +51,9 @@ class InviteList(FilterList[InviteFilter]):
 
     def __init__(self, filtering_cog: Filtering):
         super().__init__()
+        self.invite_cache = AsyncTTLCache[str, Invite | None](
+            INVITE_CACHE_SIZE, INVITE_CACHE_TTL, stats_prefix="filters.invite_cache"
+        )
         filtering_cog.subscribe(self, Event.MESSAGE, Event.MESSAGE_EDIT, Event.SNEKBOX)
 
     def get_filter_type(self, content: str) -> type[Filter]:
@@ -60,7 +69,7 @@ class InviteList(FilterList[InviteFilter]):
         self, ctx: FilterContext
     ) -> tuple[ActionSettings | None, list[str], dict[ListType, list[Filter]]]:
         """Dispatch the given event to the list's filters, and return actions to take and messages to relay to mods."""
-        text = clean_input(ctx.content, keep_newlines=True)
+        text = ctx.normalized.cleaned_with_newlines
 
         matches = list(DISCORD_INVITE.finditer(text))
         invite_codes = {m.group("invite") for m in matches}
@@ -84,17 +93,19 @@ class InviteList(FilterList[InviteFilter]):
         # Sort the invites into two categories:
         invites_for_inspection = dict()  # Found guild invites requiring further inspection.
         unknown_invites = dict()  # Either don't resolve or group DMs.
-        for invite_code in refined_invites.values():
-            try:
-                invite = await bot.instance.fetch_invite(invite_code)
-            except NotFound:
+        unique_codes = list(dict.fromkeys(refined_invites.values()))
+        resolved_invites = await asyncio.gather(*(
+            self.invite_cache.get_or_fetch(invite_code, partial(self._fetch_invite, invite_code))
+            for invite_code in unique_codes
+        ))
+        for invite_code, invite in zip(unique_codes, resolved_invites, strict=True):
+            if invite is None:
                 if check_if_allowed:
                     unknown_invites[invite_code] = None
-            else:
-                if invite.guild:
-                    invites_for_inspection[invite_code] = invite
-                elif check_if_allowed:  # Group DM
-                    unknown_invites[invite_code] = invite
+            elif invite.guild:
+                invites_for_inspection[invite_code] = invite
+            elif check_if_allowed:  # Group DM
+                unknown_invites[invite_code] = invite
 
         # Find any blocked invites
         new_ctx = ctx.replace(content={invite.guild.id for invite in invites_for_inspection.values()})
@@ -151,6 +162,14 @@ class InviteList(FilterList[InviteFilter]):
         ]
         return actions, messages, all_triggers
 
+    @staticmethod
+    async def _fetch_invite(invite_code: str) -> Invite | None:
+        """Fetch the invite with the given code, or return None if it doesn't resolve."""
+        try:
+            return await bot.instance.fetch_invite(invite_code)
+        except NotFound:
+            return None
+
     @staticmethod
     def _guild_embed(invite: Invite) -> Embed:
         """Return an embed representing the guild invites to."""
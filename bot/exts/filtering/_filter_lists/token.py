@@ -2,18 +2,124 @@ from __future__ import annotations
 
 import re
 import typing
+from collections.abc import Iterable
 
 from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filter_lists.filter_list import FilterList, ListType
 from bot.exts.filtering._filters.filter import Filter
 from bot.exts.filtering._filters.token import TokenFilter
 from bot.exts.filtering._settings import ActionSettings
-from bot.exts.filtering._utils import clean_input
 
 if typing.TYPE_CHECKING:
     from bot.exts.filtering.filtering import Filtering
 
-SPOILER_RE = re.compile(r"(\|\|.+?\|\|)", re.DOTALL)
+# Backreferences and conditionals rely on group numbers and names, which change once patterns are joined together.
+GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+# How many patterns are joined into each of the combined regexes used to narrow down a match.
+MATCHER_BLOCK_SIZE = 64
+# Characters which are matched literally at the start of a pattern, and can be shared between alternatives.
+LITERAL_PREFIX_RE = re.compile(r"[a-zA-Z0-9 ]{0,16}")
+QUANTIFIER_CHARS = ("*", "+", "?", "{")
+
+
+class _PrefixTrie:
+    """
+    A trie of the literal prefixes of regex patterns.
+
+    Python's regex engine tries every alternative of an alternation at each position of the content. Factoring out
+    shared literal prefixes means most alternatives are ruled out after a single character comparison.
+    """
+
+    def __init__(self):
+        self.children: dict[str, _PrefixTrie] = {}
+        self.remainders: list[str] = []
+
+    def add(self, pattern: str) -> None:
+        """Add the pattern to the trie, splitting off its literal prefix if it's safe to do so."""
+        prefix = ""
+        if "|" not in pattern:  # Otherwise the prefix might only belong to one of the pattern's own alternatives.
+            prefix = LITERAL_PREFIX_RE.match(pattern).group()
+            if prefix and pattern[len(prefix):len(prefix) + 1] in QUANTIFIER_CHARS:
+                prefix = prefix[:-1]  # The last character is quantified, so it isn't a literal.
+
+        node = self
+        for char in prefix.lower():
+            node = node.children.setdefault(char, _PrefixTrie())
+        node.remainders.append(pattern[len(prefix):])
+
+    def to_regex(self) -> str:
+        """Return a regex alternation which matches the same content as the patterns added to the trie."""
+        alternatives = [f"(?:{remainder})" for remainder in dict.fromkeys(self.remainders)]
+        alternatives += [re.escape(char) + child.to_regex() for char, child in self.children.items()]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return f"(?:{'|'.join(alternatives)})"
+
+
+class TokenMatcher:
+    """
+    Screens content against all the token filters of a list using combined regexes.
+
+    The patterns are joined into a single alternation, which matches if and only if at least one of the filters would
+    trigger. Most content is clean, in which case that single scan is all the work done. Otherwise, the patterns are
+    also joined in blocks, and only the filters in the blocks that matched are returned as candidates for the full
+    per-filter search.
+
+    Patterns which can't be safely joined (such as ones with backreferences or global inline flags) are always returned
+    as candidates.
+    """
+
+    def __init__(self, filters: Iterable[TokenFilter]):
+        self.filters = list(filters)
+        self.standalone: list[TokenFilter] = []
+
+        combinable = []
+        for filter_ in self.filters:
+            if self._is_combinable(filter_):
+                combinable.append(filter_)
+            else:
+                self.standalone.append(filter_)
+
+        self._combined = self._combine(combinable) if combinable else None
+        self._blocks = [
+            (self._combine(block), block)
+            for block in (combinable[i:i + MATCHER_BLOCK_SIZE] for i in range(0, len(combinable), MATCHER_BLOCK_SIZE))
+        ]
+
+    def candidates(self, content: str) -> list[TokenFilter]:
+        """Return the filters which might trigger on the content, in the order they were given."""
+        if self._combined is None or not self._combined.search(content):
+            return self.standalone
+
+        if len(self._blocks) == 1:
+            return self.filters
+
+        candidates = set(self.standalone)
+        for pattern, block in self._blocks:
+            if pattern.search(content):
+                candidates.update(block)
+        return [filter_ for filter_ in self.filters if filter_ in candidates]
+
+    @staticmethod
+    def _is_combinable(filter_: TokenFilter) -> bool:
+        """Whether the filter's pattern can be part of an alternation without changing its meaning."""
+        if GROUP_REFERENCE_RE.search(filter_.content):
+            return False
+        try:
+            if filter_.pattern.groupindex:  # Named groups can clash with those of other patterns.
+                return False
+            re.compile(f"(?:{filter_.content})")  # Global inline flags are only allowed at the start.
+        except re.error:
+            return False
+        return True
+
+    @staticmethod
+    def _combine(filters: list[TokenFilter]) -> re.Pattern:
+        """Join the patterns of the filters into a single alternation."""
+        trie = _PrefixTrie()
+        for filter_ in filters:
+            trie.add(filter_.content)
+        return re.compile(trie.to_regex(), flags=re.IGNORECASE)
 
 
 class TokensList(FilterList[TokenFilter]):
@@ -32,6 +138,7 @@ class TokensList(FilterList[TokenFilter]):
 
     def __init__(self, filtering_cog: Filtering):
         super().__init__()
+        self.matchers: dict[ListType, TokenMatcher] = {}
         filtering_cog.subscribe(
             self, Event.MESSAGE, Event.MESSAGE_EDIT, Event.NICKNAME, Event.THREAD_NAME, Event.SNEKBOX
         )
@@ -45,6 +152,11 @@ class TokensList(FilterList[TokenFilter]):
         """Return the types of filters used by this list."""
         return {TokenFilter}
 
+    def filters_changed(self, list_type: ListType) -> None:
+        """Rebuild the combined matcher for the list of the specified type."""
+        super().filters_changed(list_type)
+        self.matchers[list_type] = TokenMatcher(self[list_type].filters.values())
+
     async def actions_for(
         self, ctx: FilterContext
     ) -> tuple[ActionSettings | None, list[str], dict[ListType, list[Filter]]]:
@@ -52,23 +164,15 @@ class TokensList(FilterList[TokenFilter]):
         text = ctx.content
         if not text:
             return None, [], {}
-        if SPOILER_RE.search(text):
-            text = self._expand_spoilers(text)
-        text = clean_input(text)
+        text = ctx.normalized.spoilers_expanded
         ctx = ctx.replace(content=text)
 
-        triggers = await self[ListType.DENY].filter_list_result(ctx)
+        deny_list = self[ListType.DENY]
+        candidates = self.matchers[ListType.DENY].candidates(text)
+        triggers = await deny_list._create_filter_list_result(ctx, deny_list.defaults, candidates)
         actions = None
         messages = []
         if triggers:
             actions = self[ListType.DENY].merge_actions(triggers)
             messages = self[ListType.DENY].format_messages(triggers)
         return actions, messages, {ListType.DENY: triggers}
-
-    @staticmethod
-    def _expand_spoilers(text: str) -> str:
-        """Return a string containing all interpretations of a spoilered message."""
-        split_text = SPOILER_RE.split(text)
-        return "".join(
-            split_text[0::2] + split_text[1::2] + split_text
-        )
@@ -33,8 +33,9 @@ class AttachmentsFilter(UniqueFilter):
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
 
-        detected_messages = {msg for msg in relevant_messages if msg.author == ctx.author and len(msg.attachments) > 0}
-        total_recent_attachments = sum(len(msg.attachments) for msg in detected_messages)
+        detected_features = [features for features in relevant_messages if features.attachments > 0]
+        detected_messages = {features.message for features in detected_features}
+        total_recent_attachments = sum(features.attachments for features in detected_features)
 
         if total_recent_attachments > self.extra_fields.threshold:
             ctx.related_messages |= detected_messages
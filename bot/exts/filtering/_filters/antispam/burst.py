@@ -33,7 +33,7 @@ class BurstFilter(UniqueFilter):
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
 
-        detected_messages = {msg for msg in relevant_messages if msg.author == ctx.author}
+        detected_messages = {features.message for features in relevant_messages}
         if len(detected_messages) > self.extra_fields.threshold:
             ctx.related_messages |= detected_messages
             ctx.filter_info[self] = f"sent {len(detected_messages)} messages"
@@ -33,8 +33,8 @@ class CharsFilter(UniqueFilter):
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
 
-        detected_messages = {msg for msg in relevant_messages if msg.author == ctx.author}
-        total_recent_chars = sum(len(msg.content) for msg in detected_messages)
+        detected_messages = {features.message for features in relevant_messages}
+        total_recent_chars = sum(features.chars for features in relevant_messages)
 
         if total_recent_chars > self.extra_fields.threshold:
             ctx.related_messages |= detected_messages
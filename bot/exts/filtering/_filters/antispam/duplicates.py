@@ -33,9 +33,14 @@ class DuplicatesFilter(UniqueFilter):
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
 
+        content = ctx.message.content
+        if not content:
+            return False
+        # Compare the hashes first, so that only likely duplicates have their whole content compared.
+        content_hash = hash(content)
         detected_messages = {
-            msg for msg in relevant_messages
-            if msg.author == ctx.author and msg.content == ctx.message.content and msg.content
+            features.message for features in relevant_messages
+            if features.content_hash == content_hash and features.message.content == content
         }
         if len(detected_messages) > self.extra_fields.threshold:
             ctx.related_messages |= detected_messages
@@ -1,18 +1,13 @@
-import re
 from datetime import timedelta
 from itertools import takewhile
 from typing import ClassVar
 
 import arrow
-from emoji import demojize
 from pydantic import BaseModel
 
 from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filters.filter import UniqueFilter
 
-DISCORD_EMOJI_RE = re.compile(r"<:\w+:\d+>|:\w+:")
-CODE_BLOCK_RE = re.compile(r"```.*?```", flags=re.DOTALL)
-
 
 class ExtraEmojiSettings(BaseModel):
     """Extra settings for when to trigger the antispam rule."""
@@ -37,14 +32,8 @@ class EmojiFilter(UniqueFilter):
         """Search for the filter's content within a given context."""
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
-        detected_messages = {msg for msg in relevant_messages if msg.author == ctx.author}
-
-        # Get rid of code blocks in the message before searching for emojis.
-        # Convert Unicode emojis to :emoji: format to get their count.
-        total_emojis = sum(
-            len(DISCORD_EMOJI_RE.findall(demojize(CODE_BLOCK_RE.sub("", msg.content))))
-            for msg in detected_messages
-        )
+        detected_messages = {features.message for features in relevant_messages}
+        total_emojis = sum(features.emojis for features in relevant_messages)
 
         if total_emojis > self.extra_fields.threshold:
             ctx.related_messages |= detected_messages
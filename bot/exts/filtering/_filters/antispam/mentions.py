@@ -44,7 +44,7 @@ class MentionsFilter(UniqueFilter):
         """Search for the filter's content within a given context."""
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
-        detected_messages = {msg for msg in relevant_messages if msg.author == ctx.author}
+        detected_messages = {features.message for features in relevant_messages}
 
         # We use `msg.mentions` here as that is supplied by the api itself, to determine who was mentioned.
         # Additionally, `msg.mentions` includes the user replied to, even if the mention doesn't occur in the body.
@@ -1,4 +1,3 @@
-import re
 from datetime import timedelta
 from itertools import takewhile
 from typing import ClassVar
@@ -9,8 +8,6 @@ from pydantic import BaseModel
 from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filters.filter import UniqueFilter
 
-NEWLINES = re.compile(r"(\n+)")
-
 
 class ExtraNewlinesSettings(BaseModel):
     """Extra settings for when to trigger the antispam rule."""
@@ -39,15 +36,11 @@ class NewlinesFilter(UniqueFilter):
         """Search for the filter's content within a given context."""
         earliest_relevant_at = arrow.utcnow() - timedelta(seconds=self.extra_fields.interval)
         relevant_messages = list(takewhile(lambda msg: msg.created_at > earliest_relevant_at, ctx.content))
-        detected_messages = {msg for msg in relevant_messages if msg.author == ctx.author}
+        detected_messages = {features.message for features in relevant_messages}
 
-        # Identify groups of newline characters and get group & total counts
-        newline_counts = []
-        for msg in detected_messages:
-            newline_counts += [len(group) for group in NEWLINES.findall(msg.content)]
-        total_recent_newlines = sum(newline_counts)
+        total_recent_newlines = sum(features.newlines for features in relevant_messages)
         # Get maximum newline group size
-        max_newline_group = max(newline_counts, default=0)
+        max_newline_group = max((features.max_consecutive_newlines for features in relevant_messages), default=0)
 
         # Check first for total newlines, if this passes then check for large groupings
         if total_recent_newlines > self.extra_fields.threshold:
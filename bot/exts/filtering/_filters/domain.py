@@ -1,10 +1,12 @@
 import re
+from functools import cached_property, lru_cache
 from typing import ClassVar
 from urllib.parse import urlparse
 
 import tldextract
 from discord.ext.commands import BadArgument
 from pydantic import BaseModel
+from tldextract.tldextract import ExtractResult
 
 from bot.exts.filtering._filter_context import FilterContext
 from bot.exts.filtering._filters.filter import Filter
@@ -12,6 +14,12 @@ from bot.exts.filtering._filters.filter import Filter
 URL_RE = re.compile(r"(?:https?://)?(\S+?)[\\/]*", flags=re.IGNORECASE)
 
 
+@lru_cache(maxsize=4096)
+def extract_url(url: str) -> ExtractResult:
+    """Split the URL into its subdomain, domain and suffix. The same URLs tend to come up repeatedly, so it's cached."""
+    return tldextract.extract(url)
+
+
 class ExtraDomainSettings(BaseModel):
     """Extra settings for how domains should be matched in a message."""
 
@@ -34,13 +42,19 @@ class DomainFilter(Filter):
     name = "domain"
     extra_fields_type = ExtraDomainSettings
 
+    @cached_property
+    def registered_domain(self) -> str:
+        """The registered domain (domain and suffix) of the filter's content, in lowercase."""
+        return extract_url(self.content).registered_domain.lower()
+
     async def triggered_on(self, ctx: FilterContext) -> bool:
         """Searches for a domain within a given context."""
-        domain = tldextract.extract(self.content).registered_domain.lower()
+        domain = self.registered_domain
+        content = self.content.lower()
 
         for found_url in ctx.content:
-            extract = tldextract.extract(found_url)
-            if self.content.lower() in found_url and extract.registered_domain == domain:
+            extract = extract_url(found_url)
+            if content in found_url and extract.registered_domain == domain:
                 if self.extra_fields.only_subdomains:
                     if not extract.subdomain and not urlparse(f"https://{found_url}").path:
                         return False
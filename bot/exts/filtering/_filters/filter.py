@@ -5,7 +5,7 @@ import arrow
 from pydantic import ValidationError
 
 from bot.exts.filtering._filter_context import Event, FilterContext
-from bot.exts.filtering._settings import Defaults, create_settings
+from bot.exts.filtering._settings import Defaults, create_settings, intern_validations
 from bot.exts.filtering._utils import FieldRequiring
 
 
@@ -29,7 +29,8 @@ class Filter(FieldRequiring):
         self.description = filter_data["description"]
         self.created_at = arrow.get(filter_data["created_at"])
         self.updated_at = arrow.get(filter_data["updated_at"])
-        self.actions, self.validations = create_settings(filter_data["settings"], defaults=defaults)
+        self.actions, validations = create_settings(filter_data["settings"], defaults=defaults)
+        self.validations = intern_validations(validations)
         if self.extra_fields_type:
             self.extra_fields = self.extra_fields_type.model_validate(filter_data["additional_settings"])
         else:
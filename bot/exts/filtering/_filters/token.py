@@ -1,4 +1,5 @@
 import re
+from functools import cached_property
 
 from discord.ext.commands import BadArgument
 
@@ -11,11 +12,14 @@ class TokenFilter(Filter):
 
     name = "token"
 
+    @cached_property
+    def pattern(self) -> re.Pattern:
+        """The compiled form of the filter's regex."""
+        return re.compile(self.content, flags=re.IGNORECASE)
+
     async def triggered_on(self, ctx: FilterContext) -> bool:
         """Searches for a regex pattern within a given context."""
-        pattern = self.content
-
-        match = re.search(pattern, ctx.content, flags=re.IGNORECASE)
+        match = self.pattern.search(ctx.content)
         if match:
             ctx.matches.append(match[0])
             return True
@@ -0,0 +1,129 @@
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import takewhile
+
+from discord import Member, Message, User
+from emoji import demojize
+
+from bot.utils.message_cache import MessageCache
+
+DISCORD_EMOJI_RE = re.compile(r"<:\w+:\d+>|:\w+:")
+CODE_BLOCK_RE = re.compile(r"```.*?```", flags=re.DOTALL)
+LINK_RE = re.compile(r"(https?://\S+)")
+NEWLINES_RE = re.compile(r"(\n+)")
+
+
+@dataclass(frozen=True, slots=True)
+class MessageFeatures:
+    """A cached message along with the properties of its content that the antispam rules look at."""
+
+    message: Message
+    created_at: datetime
+    content_hash: int
+    chars: int
+    attachments: int
+    emojis: int
+    links: int
+    newlines: int
+    max_consecutive_newlines: int
+    role_mentions: int
+
+    @classmethod
+    def from_message(cls, message: Message) -> "MessageFeatures":
+        """Parse the message's content once, so the antispam rules don't need to on every new message."""
+        content = message.content
+        newline_groups = [len(group) for group in NEWLINES_RE.findall(content)]
+        return cls(
+            message=message,
+            created_at=message.created_at,
+            content_hash=hash(content),
+            chars=len(content),
+            attachments=len(message.attachments),
+            # Get rid of code blocks in the message before searching for emojis.
+            # Convert Unicode emojis to :emoji: format to get their count.
+            emojis=len(DISCORD_EMOJI_RE.findall(demojize(CODE_BLOCK_RE.sub("", content)))),
+            links=len(LINK_RE.findall(content)),
+            newlines=sum(newline_groups),
+            max_consecutive_newlines=max(newline_groups, default=0),
+            role_mentions=len(message.role_mentions),
+        )
+
+
+class AuthorWindowedMessageCache(MessageCache):
+    """
+    A message cache which additionally keeps the cached messages of each author in a separate window.
+
+    Each window holds the features of the author's messages, newest first. The windows only ever hold messages which
+    are still in the cache, so looking at an author's window is the same as filtering the whole cache by that author,
+    without going over the messages of everyone else.
+    """
+
+    def __init__(self, maxlen: int):
+        super().__init__(maxlen, newest_first=True)
+        self._windows: dict[int, deque[MessageFeatures]] = {}
+
+    def append(self, message: Message, *, metadata: dict | None = None) -> None:
+        """Add the received message to the beginning of the cache and to its author's window."""
+        if len(self) == self.maxlen:
+            self._remove_from_window(self[-1])  # About to be evicted.
+        super().append(message, metadata=metadata)
+        self._windows.setdefault(message.author.id, deque()).appendleft(MessageFeatures.from_message(message))
+
+    def update(self, message: Message, *, metadata: dict | None = None) -> bool:
+        """
+        Update a cached message with new contents.
+
+        Return True if the given message had a matching ID in the cache.
+        """
+        previous = self.get_message(message.id)
+        if not super().update(message, metadata=metadata):
+            return False
+        if previous is not message:
+            window = self._windows[message.author.id]
+            for index, features in enumerate(window):
+                if features.message.id == message.id:
+                    window[index] = MessageFeatures.from_message(message)
+                    break
+        return True
+
+    def pop(self) -> Message:
+        """Remove the last message in the cache and return it."""
+        message = super().pop()
+        self._remove_from_window(message)
+        return message
+
+    def popleft(self) -> Message:
+        """Remove the first message in the cache and return it."""
+        message = super().popleft()
+        self._remove_from_window(message)
+        return message
+
+    def clear(self) -> None:
+        """Remove all messages from the cache."""
+        super().clear()
+        self._windows.clear()
+
+    def author_window(self, author: User | Member, since: datetime) -> list[MessageFeatures]:
+        """Return the author's cached messages which were created after `since`, newest first."""
+        window = self._windows.get(author.id, ())
+        return list(takewhile(lambda features: features.created_at > since, window))
+
+    def _remove_from_window(self, message: Message) -> None:
+        """Remove the message from its author's window."""
+        window = self._windows.get(message.author.id)
+        if not window:
+            return
+        # Messages leave the cache oldest first, so they're normally at the end of the window.
+        if window[-1].message.id == message.id:
+            window.pop()
+        elif window[0].message.id == message.id:
+            window.popleft()
+        else:
+            for features in window:
+                if features.message.id == message.id:
+                    window.remove(features)
+                    break
+        if not window:
+            del self._windows[message.author.id]
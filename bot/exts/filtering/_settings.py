@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import operator
 import traceback
+import weakref
 from abc import abstractmethod
 from copy import copy
 from functools import reduce
@@ -162,6 +163,32 @@ class ValidationSettings(Settings[ValidationEntry]):
         return passed, failed
 
 
+# Identical validation settings share a single object, so that they can be evaluated once per context.
+_interned_validations: weakref.WeakValueDictionary[frozenset, ValidationSettings] = weakref.WeakValueDictionary()
+
+
+def _freeze(value: Any) -> Any:
+    """Return a hashable equivalent of the value."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set | frozenset):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+def intern_validations(validations: ValidationSettings | None) -> ValidationSettings | None:
+    """Return a previously interned validation settings object equal to the given one, or intern it if there's none."""
+    if validations is None:
+        return None
+    key = frozenset(
+        (name, type(entry), _freeze(entry.model_dump()), frozenset(entry.overrides))
+        for name, entry in validations.items()
+    )
+    return _interned_validations.setdefault(key, validations)
+
+
 class ActionSettings(Settings[ActionEntry]):
     """
     A collection of action settings.
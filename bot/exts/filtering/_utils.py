@@ -5,13 +5,14 @@ import importlib.util
 import inspect
 import pkgutil
 import types
+import unicodedata
 import urllib.parse
 import warnings
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from functools import cache
+from functools import cache, cached_property
 from typing import Any, Self, TypeVar, Union, get_args, get_origin
 
 import discord
@@ -27,6 +28,7 @@ from bot.constants import Guild
 VARIATION_SELECTORS = r"\uFE00-\uFE0F\U000E0100-\U000E01EF"
 INVISIBLE_RE = regex.compile(rf"[{VARIATION_SELECTORS}\p{{UNASSIGNED}}\p{{FORMAT}}\p{{CONTROL}}--\s]", regex.V1)
 ZALGO_RE = regex.compile(rf"[\p{{NONSPACING MARK}}\p{{ENCLOSING MARK}}--[{VARIATION_SELECTORS}]]", regex.V1)
+SPOILER_RE = regex.compile(r"(\|\|.+?\|\|)", regex.DOTALL)
 
 
 T = TypeVar("T")
@@ -68,6 +70,54 @@ def clean_input(string: str, *, keep_newlines: bool = False) -> str:
     return INVISIBLE_RE.sub("", content)
 
 
+def expand_spoilers(text: str) -> str:
+    """Return a string containing all interpretations of a spoilered message."""
+    split_text = SPOILER_RE.split(text)
+    return "".join(
+        split_text[0::2] + split_text[1::2] + split_text
+    )
+
+
+class NormalizedContent:
+    """
+    The normalized forms of some content, each computed the first time it's needed.
+
+    Filter lists looking at the same event take the form they need from here, instead of each normalizing the content
+    separately.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+
+    @cached_property
+    def cleaned_with_newlines(self) -> str:
+        """The content without zalgo, invisible characters and escape characters, and with URL quoting undone."""
+        return clean_input(self.content, keep_newlines=True)
+
+    @cached_property
+    def cleaned(self) -> str:
+        """The cleaned content, without newlines."""
+        # Cleaning never adds or removes newlines other than the ones it drops, so there's no need to clean again.
+        return self.cleaned_with_newlines.replace("\n", "")
+
+    @cached_property
+    def spoilers_expanded(self) -> str:
+        """The cleaned content, with every interpretation of the spoilers in it."""
+        if not SPOILER_RE.search(self.content):
+            return self.cleaned
+        return clean_input(expand_spoilers(self.content))
+
+    @cached_property
+    def nfkc(self) -> str:
+        """The content normalized with the NFKC form."""
+        return unicodedata.normalize("NFKC", self.content)
+
+    @cached_property
+    def nfkc_without_combining(self) -> str:
+        """The NFKC normalized content, without combining characters."""
+        return "".join([c for c in self.nfkc if not unicodedata.combining(c)])
+
+
 def past_tense(word: str) -> str:
     """Return the past tense form of the input word."""
     if not word:
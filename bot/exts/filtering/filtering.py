@@ -1,8 +1,10 @@
+import asyncio
+import codecs
 import datetime
 import io
 import json
 import re
-import unicodedata
+import time
 from collections import defaultdict
 from collections.abc import Iterable, Mapping
 from functools import partial, reduce
@@ -17,7 +19,6 @@ from discord import Colour, Embed, HTTPException, Message, MessageType, Thread
 from discord.ext import commands, tasks
 from discord.ext.commands import BadArgument, Cog, Context, command, has_any_role
 from pydis_core.site_api import ResponseCodeError
-from pydis_core.utils import scheduling
 from pydis_core.utils.paste_service import PasteFile, PasteTooLongError, PasteUploadError, send_to_paste_service
 
 import bot
@@ -30,6 +31,7 @@ from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filter_lists import FilterList, ListType, ListTypeConverter, filter_list_types
 from bot.exts.filtering._filter_lists.filter_list import AtomicList
 from bot.exts.filtering._filters.filter import Filter, UniqueFilter
+from bot.exts.filtering._message_windows import AuthorWindowedMessageCache
 from bot.exts.filtering._settings import ActionSettings
 from bot.exts.filtering._settings_types.actions.infraction_and_notification import Infraction
 from bot.exts.filtering._ui.filter import (
@@ -54,7 +56,6 @@ from bot.log import get_logger
 from bot.pagination import LinePaginator
 from bot.utils.channel import is_mod_channel
 from bot.utils.lock import lock_arg
-from bot.utils.message_cache import MessageCache
 
 log = get_logger(__name__)
 
@@ -66,15 +67,65 @@ OFFENSIVE_MSG_DELETE_TIME = datetime.timedelta(days=7)
 WEEKLY_REPORT_ISO_DAY = 3  # 1=Monday, 7=Sunday
 
 
-async def _extract_text_file_content(att: discord.Attachment) -> str:
-    """Extract up to the first 30 lines or first 2000 characters (whichever is shorter) of an attachment."""
+ATTACHMENT_MAX_LINES = 30
+ATTACHMENT_MAX_CHARS = 2_000
+# Enough bytes for the characters kept from an attachment in any of the usual encodings (up to 4 bytes per character),
+# with room for a BOM and for line terminators which are dropped when the lines are joined.
+ATTACHMENT_MAX_BYTES = 4 * (ATTACHMENT_MAX_CHARS + 2 * ATTACHMENT_MAX_LINES)
+
+
+async def _read_attachment_prefix(att: discord.Attachment, max_bytes: int) -> bytes:
+    """Read up to `max_bytes` bytes from the start of the attachment, without downloading the rest of it."""
+    if att.size <= max_bytes:
+        return await att.read()
+
+    # Servers which ignore the range header send the whole file, so stop reading the body once there's enough.
+    headers = {"Range": f"bytes=0-{max_bytes - 1}"}
+    chunks = []
+    remaining = max_bytes
+    async with bot.instance.http_session.get(att.url, headers=headers, raise_for_status=True) as response:
+        while remaining > 0 and (chunk := await response.content.read(remaining)):
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+async def _extract_text_file_content(att: discord.Attachment, max_bytes: int = ATTACHMENT_MAX_BYTES) -> str:
+    """
+    Extract up to the first 30 lines or first 2000 characters (whichever is shorter) of an attachment.
+
+    At most `max_bytes` bytes are read from the attachment.
+    """
     file_encoding = re.search(r"charset=(\S+)", att.content_type).group(1)
-    file_content_bytes = await att.read()
-    file_lines = file_content_bytes.decode(file_encoding).splitlines()
-    first_n_lines = "\n".join(file_lines[:30])[:2_000]
+    file_content_bytes = await _read_attachment_prefix(att, max_bytes)
+    # A character might be cut in the middle when reading only part of the file, so leave incomplete ones out.
+    decoder = codecs.getincrementaldecoder(file_encoding)()
+    file_content = decoder.decode(file_content_bytes, final=att.size <= max_bytes)
+    file_lines = file_content.splitlines()
+    first_n_lines = "\n".join(file_lines[:ATTACHMENT_MAX_LINES])[:ATTACHMENT_MAX_CHARS]
     return f"{att.filename}: {first_n_lines}"
 
 
+async def _extract_text_attachments(attachments: Iterable[discord.Attachment]) -> list[str]:
+    """
+    Extract the beginning of each text attachment concurrently.
+
+    The total number of bytes read is limited by the per-message budget. Attachments past the budget are skipped.
+    """
+    budget = constants.Filters.attachment_bytes_budget
+    extractions = []
+    for att in attachments:
+        if not att.content_type or "charset" not in att.content_type:
+            continue
+        if budget <= 0:
+            log.trace(f"Skipping attachment {att.filename}, since the byte budget for the message was used up.")
+            continue
+        max_bytes = min(ATTACHMENT_MAX_BYTES, budget)
+        budget -= min(max_bytes, att.size)
+        extractions.append(_extract_text_file_content(att, max_bytes))
+    return list(await asyncio.gather(*extractions))
+
+
 class Filtering(Cog):
     """Filtering and alerting for content posted on the server."""
 
@@ -90,14 +141,14 @@ class Filtering(Cog):
         self.bot = bot
         self.filter_lists: dict[str, FilterList] = {}
         self._subscriptions = defaultdict[Event, list[FilterList]](list)
-        self.delete_scheduler = scheduling.Scheduler(self.__class__.__name__)
+        self.delete_scheduler = bot.timers.scheduler(self.__class__.__name__)
         self.webhook: discord.Webhook | None = None
 
         self.loaded_settings = {}
         self.loaded_filters = {}
         self.loaded_filter_settings = {}
 
-        self.message_cache = MessageCache(CACHE_SIZE, newest_first=True)
+        self.message_cache = AuthorWindowedMessageCache(CACHE_SIZE)
 
     async def cog_load(self) -> None:
         """
@@ -233,10 +284,7 @@ class Filtering(Cog):
 
         ctx = FilterContext.from_message(Event.MESSAGE, msg, None, self.message_cache)
 
-        text_contents = [
-            await _extract_text_file_content(a)
-            for a in msg.attachments if "charset" in a.content_type
-        ]
+        text_contents = await _extract_text_attachments(msg.attachments)
 
         if text_contents:
             attachment_content = "\n\n".join(text_contents)
@@ -597,7 +645,7 @@ class Filtering(Cog):
             """The actual removal routine."""
             await bot.instance.api_client.delete(f"bot/filter/filters/{filter_id}")
             log.info(f"Successfully deleted filter with ID {filter_id}.")
-            filter_list[list_type].filters.pop(filter_id)
+            filter_list.remove_filter(list_type, filter_id)
             await ctx.reply(f"✅ Deleted filter: {filter_}")
 
         result = self._get_filter_by_id(filter_id)
@@ -964,11 +1012,17 @@ class Filtering(Cog):
         Additionally, a message is possibly provided from each filter list describing the triggers,
         which should be relayed to the moderators.
         """
+        filter_lists = list(self._subscriptions[ctx.event])
+        if constants.Filters.concurrent_dispatch:
+            results = await asyncio.gather(*(self._list_actions_for(filter_list, ctx) for filter_list in filter_lists))
+        else:
+            results = [await self._list_actions_for(filter_list, ctx) for filter_list in filter_lists]
+
         actions = []
         messages = {}
         triggers = {}
-        for filter_list in self._subscriptions[ctx.event]:
-            list_actions, list_message, list_triggers = await filter_list.actions_for(ctx)
+        # The results are merged in subscription order regardless of which list finished first.
+        for filter_list, (list_actions, list_message, list_triggers) in zip(filter_lists, results, strict=True):
             triggers.update({filter_list[list_type]: filters for list_type, filters in list_triggers.items()})
             if list_actions:
                 actions.append(list_actions)
@@ -981,6 +1035,28 @@ class Filtering(Cog):
 
         return result_actions, messages, triggers
 
+    async def _list_actions_for(
+        self, filter_list: FilterList, ctx: FilterContext
+    ) -> tuple[ActionSettings | None, list[str], dict[ListType, list[Filter]]]:
+        """
+        Return the result of a single filter list in the given context, recording how long it took.
+
+        If the filter list doesn't finish within its time budget, it's treated as if nothing was triggered,
+        so that a hanging list doesn't hold back actioning the results of the rest.
+        """
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(filter_list.actions_for(ctx), constants.Filters.list_timeout)
+        except TimeoutError:
+            log.warning(
+                f"The {filter_list.name} filter list timed out after {constants.Filters.list_timeout} seconds "
+                f"on a {ctx.event.name} event, skipping it."
+            )
+            self.bot.stats.incr(f"filters.lists.{filter_list.name}.timeout")
+            return None, [], {}
+        finally:
+            self.bot.stats.timing(f"filters.lists.{filter_list.name}.latency", (time.perf_counter() - start) * 1000)
+
     async def _send_alert(self, ctx: FilterContext, triggered_filters: dict[FilterList, Iterable[str]]) -> None:
         """Build an alert message from the filter context, and send it via the alert webhook."""
         if not self.webhook:
@@ -1023,8 +1099,8 @@ class Filtering(Cog):
     async def _check_bad_name(self, ctx: FilterContext) -> FilterContext:
         """Check filter triggers for some given name (thread name, a member's display name)."""
         name = ctx.content
-        normalised_name = unicodedata.normalize("NFKC", name)
-        cleaned_normalised_name = "".join([c for c in normalised_name if not unicodedata.combining(c)])
+        normalised_name = ctx.normalized.nfkc
+        cleaned_normalised_name = ctx.normalized.nfkc_without_combining
 
         # Run filters against normalised, cleaned normalised and the original name,
         # in case there are filters for one but not another.
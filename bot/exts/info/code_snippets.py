@@ -1,16 +1,21 @@
+import asyncio
 import logging
 import re
 import textwrap
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 from urllib.parse import quote_plus
 
 import discord
-from aiohttp import ClientResponseError
+from aiohttp import ClientResponse, ClientResponseError
 from discord.ext.commands import Cog
+from yarl import URL
 
 from bot.bot import Bot
 from bot.constants import Channels
 from bot.log import get_logger
+from bot.utils.caching import AsyncTTLCache, TTLCache
 from bot.utils.messages import wait_for_deletion
 
 log = get_logger(__name__)
@@ -26,6 +31,7 @@ GITHUB_GIST_RE = re.compile(
     r"(-L(?P<start_line>\d+)([-~:]L(?P<end_line>\d+))?)"
 )
 
+GITHUB_API_URL = "https://api.github.com"
 GITHUB_HEADERS = {"Accept": "application/vnd.github.v3.raw"}
 
 GITLAB_RE = re.compile(
@@ -38,6 +44,19 @@ BITBUCKET_RE = re.compile(
     r"/(?P<file_path>[^#>]+)(\?[^#>]+)?(#lines-(?P<start_line>\d+)(:(?P<end_line>\d+))?)"
 )
 
+# A full commit SHA, like the ones in permalinks. The contents of files at a commit never change.
+COMMIT_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+# The branches and tags of a repo are cached for a short while, since new ones can be pushed at any time.
+REFS_CACHE_SIZE = 256
+REFS_TTL = 5 * 60
+# Files at a commit are immutable, so they're only expired to make room for others.
+CONTENTS_CACHE_SIZE = 128
+CONTENTS_TTL = 24 * 60 * 60
+
+# The most snippets of a single message which are fetched at once.
+MAX_CONCURRENT_FETCHES = 4
+
 
 class CodeSnippets(Cog):
     """
@@ -50,6 +69,17 @@ class CodeSnippets(Cog):
         """Initializes the cog's bot."""
         self.bot = bot
 
+        # Maps a repo's host and name to its branches and tags.
+        self._refs: AsyncTTLCache[tuple[str, str], list[dict]] = AsyncTTLCache(
+            REFS_CACHE_SIZE, REFS_TTL, stats_prefix="code_snippets.refs"
+        )
+        # Maps the URL of a file at a commit to its contents.
+        self._contents: AsyncTTLCache[str, str] = AsyncTTLCache(
+            CONTENTS_CACHE_SIZE, CONTENTS_TTL, stats_prefix="code_snippets.contents"
+        )
+        # Maps a GitHub API URL to the ETag and body of its last response, to revalidate it once it expires.
+        self._github_etags: TTLCache[str, tuple[str, Any]] = TTLCache(REFS_CACHE_SIZE * 2, CONTENTS_TTL)
+
         self.pattern_handlers = [
             (GITHUB_RE, self._fetch_github_snippet),
             (GITHUB_GIST_RE, self._fetch_github_gist_snippet),
@@ -60,12 +90,64 @@ class CodeSnippets(Cog):
     async def _fetch_response(self, url: str, response_format: str, **kwargs) -> Any:
         """Makes http requests using aiohttp."""
         async with self.bot.http_session.get(url, raise_for_status=True, **kwargs) as response:
+            self._record_github_rate_limit(response)
             if response_format == "text":
                 return await response.text()
             if response_format == "json":
                 return await response.json()
             return None
 
+    async def _fetch_github_json(self, url: str) -> Any:
+        """
+        Fetch JSON from the GitHub API, revalidating the last response to the URL if there was one.
+
+        Conditional requests which are answered with 304 Not Modified don't count against the rate limit.
+        """
+        headers = dict(GITHUB_HEADERS)
+        if cached := self._github_etags.get(url):
+            headers["If-None-Match"] = cached[0]
+
+        async with self.bot.http_session.get(url, raise_for_status=True, headers=headers) as response:
+            self._record_github_rate_limit(response)
+            if response.status == 304 and cached:
+                self.bot.stats.incr("code_snippets.github.not_modified")
+                return cached[1]
+
+            body = await response.json()
+            if etag := response.headers.get("ETag"):
+                self._github_etags.set(url, (etag, body))
+            return body
+
+    def _record_github_rate_limit(self, response: ClientResponse) -> None:
+        """Report how many requests to the GitHub API are left until the rate limit resets."""
+        if response.url.host == URL(GITHUB_API_URL).host:
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                self.bot.stats.gauge("code_snippets.github.ratelimit_remaining", int(remaining))
+
+    async def _fetch_contents(self, url: str, ref: str, **kwargs) -> str:
+        """Fetch the text of the file at the URL, caching it if `ref` is a commit."""
+        fetch = partial(self._fetch_response, url, "text", **kwargs)
+        if COMMIT_SHA_RE.fullmatch(ref):
+            return await self._contents.get_or_fetch(url, fetch)
+        return await fetch()
+
+    async def _fetch_github_refs(self, repo: str) -> list[dict]:
+        """Fetch the branches and tags of a GitHub repo."""
+        branches, tags = await asyncio.gather(
+            self._fetch_github_json(f"{GITHUB_API_URL}/repos/{repo}/branches"),
+            self._fetch_github_json(f"{GITHUB_API_URL}/repos/{repo}/tags"),
+        )
+        return branches + tags
+
+    async def _fetch_gitlab_refs(self, enc_repo: str) -> list[dict]:
+        """Fetch the branches and tags of a GitLab project."""
+        branches, tags = await asyncio.gather(
+            self._fetch_response(f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/branches", "json"),
+            self._fetch_response(f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/tags", "json"),
+        )
+        return branches + tags
+
     def _find_ref(self, path: str, refs: tuple) -> tuple:
         """Loops through all branches and tags to find the required ref."""
         # Base case: there is no slash in the branch name
@@ -86,19 +168,15 @@ class CodeSnippets(Cog):
         end_line: str
     ) -> str:
         """Fetches a snippet from a GitHub repo."""
-        # Search the GitHub API for the specified branch
-        branches = await self._fetch_response(
-            f"https://api.github.com/repos/{repo}/branches",
-            "json",
-            headers=GITHUB_HEADERS
-        )
-        tags = await self._fetch_response(f"https://api.github.com/repos/{repo}/tags", "json", headers=GITHUB_HEADERS)
-        refs = branches + tags
-        ref, file_path = self._find_ref(path, refs)
-
-        file_contents = await self._fetch_response(
-            f"https://api.github.com/repos/{repo}/contents/{file_path}?ref={ref}",
-            "text",
+        ref, file_path = path.split("/", 1)
+        # Permalinks don't need the branches and tags to find where the ref ends
+        if not COMMIT_SHA_RE.fullmatch(ref):
+            refs = await self._refs.get_or_fetch(("github", repo), partial(self._fetch_github_refs, repo))
+            ref, file_path = self._find_ref(path, refs)
+
+        file_contents = await self._fetch_contents(
+            f"{GITHUB_API_URL}/repos/{repo}/contents/{file_path}?ref={ref}",
+            ref,
             headers=GITHUB_HEADERS,
         )
         return self._snippet_to_codeblock(file_contents, file_path, start_line, end_line)
@@ -113,7 +191,7 @@ class CodeSnippets(Cog):
     ) -> str:
         """Fetches a snippet from a GitHub gist."""
         gist_json = await self._fetch_response(
-            f'https://api.github.com/gists/{gist_id}{f"/{revision}" if len(revision) > 0 else ""}',
+            f'{GITHUB_API_URL}/gists/{gist_id}{f"/{revision}" if len(revision) > 0 else ""}',
             "json",
             headers=GITHUB_HEADERS,
         )
@@ -121,9 +199,10 @@ class CodeSnippets(Cog):
         # Check each file in the gist for the specified file
         for gist_file in gist_json["files"]:
             if file_path == gist_file.lower().replace(".", "-"):
-                file_contents = await self._fetch_response(
-                    gist_json["files"][gist_file]["raw_url"],
-                    "text",
+                # The raw URL points to the file at a specific revision, so it's always immutable
+                raw_url = gist_json["files"][gist_file]["raw_url"]
+                file_contents = await self._contents.get_or_fetch(
+                    raw_url, partial(self._fetch_response, raw_url, "text")
                 )
                 return self._snippet_to_codeblock(file_contents, gist_file, start_line, end_line)
         return ""
@@ -138,20 +217,17 @@ class CodeSnippets(Cog):
         """Fetches a snippet from a GitLab repo."""
         enc_repo = quote_plus(repo)
 
-        # Searches the GitLab API for the specified branch
-        branches = await self._fetch_response(
-            f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/branches",
-            "json"
-        )
-        tags = await self._fetch_response(f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/tags", "json")
-        refs = branches + tags
-        ref, file_path = self._find_ref(path, refs)
+        ref, file_path = path.split("/", 1)
+        # Searches the GitLab API for the specified branch, unless it's a permalink
+        if not COMMIT_SHA_RE.fullmatch(ref):
+            refs = await self._refs.get_or_fetch(("gitlab", repo), partial(self._fetch_gitlab_refs, enc_repo))
+            ref, file_path = self._find_ref(path, refs)
         enc_ref = quote_plus(ref)
         enc_file_path = quote_plus(file_path)
 
-        file_contents = await self._fetch_response(
+        file_contents = await self._fetch_contents(
             f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/files/{enc_file_path}/raw?ref={enc_ref}",
-            "text",
+            ref,
         )
         return self._snippet_to_codeblock(file_contents, file_path, start_line, end_line)
 
@@ -164,9 +240,9 @@ class CodeSnippets(Cog):
         end_line: str
     ) -> str:
         """Fetches a snippet from a BitBucket repo."""
-        file_contents = await self._fetch_response(
+        file_contents = await self._fetch_contents(
             f"https://bitbucket.org/{quote_plus(repo)}/raw/{quote_plus(ref)}/{quote_plus(file_path)}",
-            "text",
+            ref,
         )
         return self._snippet_to_codeblock(file_contents, file_path, start_line, end_line)
 
@@ -225,14 +301,17 @@ class CodeSnippets(Cog):
         return f"{ret}``` ```"
 
     async def _parse_snippets(self, content: str) -> str:
-        """Parse message content and return a string with a code block for each URL found."""
-        all_snippets = []
+        """
+        Parse message content and return a string with a code block for each URL found.
+
+        The snippets are fetched concurrently, at most `MAX_CONCURRENT_FETCHES` at a time.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
 
-        for pattern, handler in self.pattern_handlers:
-            for match in pattern.finditer(content):
+        async def fetch_snippet(match: re.Match, handler: Callable[..., Awaitable[str]]) -> tuple[int, str] | None:
+            async with semaphore:
                 try:
-                    snippet = await handler(**match.groupdict())
-                    all_snippets.append((match.start(), snippet))
+                    return match.start(), await handler(**match.groupdict())
                 except ClientResponseError as error:
                     error_message = error.message
                     log.log(
@@ -240,9 +319,20 @@ class CodeSnippets(Cog):
                         f"Failed to fetch code snippet from {match[0]!r}: {error.status} "
                         f"{error_message} for GET {error.request_info.real_url.human_repr()}"
                     )
+                    return None
+                except Exception:
+                    # Skip just this link, so the other snippets of the message are still sent.
+                    log.exception(f"Failed to fetch code snippet from {match[0]!r}.")
+                    return None
+
+        all_snippets = await asyncio.gather(*(
+            fetch_snippet(match, handler)
+            for pattern, handler in self.pattern_handlers
+            for match in pattern.finditer(content)
+        ))
 
         # Sorts the list of snippets by their match index and joins them into a single message
-        return "\n".join(x[1] for x in sorted(all_snippets))
+        return "\n".join(x[1] for x in sorted(snippet for snippet in all_snippets if snippet is not None))
 
     @Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-import collections
-from collections import defaultdict, deque
-from contextlib import suppress
-from operator import attrgetter
-from typing import NamedTuple
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from enum import IntEnum
 
 import discord
 from bs4 import BeautifulSoup
 from pydis_core.utils import scheduling
 
 import bot
-from bot.constants import Channels
+from bot.constants import Channels, Doc
 from bot.log import get_logger
 
 from . import _cog, doc_cache
@@ -54,23 +55,75 @@ class StaleInventoryNotifier:
                 await self._dev_log.send(embed=embed)
 
 
-class QueueItem(NamedTuple):
-    """Contains a `DocItem` and the `BeautifulSoup` object needed to parse it."""
+class Priority(IntEnum):
+    """The order in which symbols are parsed, symbols with lower values are parsed first."""
 
-    doc_item: _cog.DocItem
-    soup: BeautifulSoup
+    USER_REQUESTED = 0
+    BACKGROUND = 1
 
-    def __eq__(self, other: QueueItem | _cog.DocItem):
-        if isinstance(other, _cog.DocItem):
-            return self.doc_item == other
-        return NamedTuple.__eq__(self, other)
+
+class PageQueue:
+    """
+    The symbols of a single page which are waiting to be parsed, along with the page's `BeautifulSoup` object.
+
+    Parsing a symbol modifies the soup, so only one symbol of a page is parsed at a time;
+    `parsing` is set while a worker is parsing one of the page's symbols.
+    """
+
+    def __init__(self, url: str, soup: BeautifulSoup, doc_items: Iterable[_cog.DocItem], order: int):
+        self.url = url
+        self.soup = soup
+        # Keeps pages with the same priority in the order they were queued in.
+        self.order = order
+        self.parsing = False
+        # The page's current entry in the parser's page queue, older entries are skipped.
+        self.queue_entry: tuple[Priority, int, PageQueue] | None = None
+
+        self._pending = set[_cog.DocItem]()
+        self._heap: list[tuple[Priority, int, _cog.DocItem]] = []
+        self._counter = itertools.count()
+        for doc_item in doc_items:
+            self.push(doc_item, Priority.BACKGROUND)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, doc_item: _cog.DocItem):
+        return doc_item in self._pending
+
+    @property
+    def priority(self) -> Priority:
+        """The priority of the most urgent symbol waiting to be parsed."""
+        self._drop_stale()
+        return self._heap[0][0]
+
+    def push(self, doc_item: _cog.DocItem, priority: Priority) -> None:
+        """
+        Queue `doc_item` to be parsed with `priority`.
+
+        If the item is already queued, it's parsed with whichever of the priorities is more urgent.
+        """
+        self._pending.add(doc_item)
+        heapq.heappush(self._heap, (priority, next(self._counter), doc_item))
+
+    def pop(self) -> _cog.DocItem:
+        """Remove and return the most urgent symbol waiting to be parsed."""
+        self._drop_stale()
+        _, _, doc_item = heapq.heappop(self._heap)
+        self._pending.remove(doc_item)
+        return doc_item
+
+    def _drop_stale(self) -> None:
+        """Drop the entries of items that were already popped through a more urgent entry from the top of the heap."""
+        while self._heap[0][2] not in self._pending:
+            heapq.heappop(self._heap)
 
 
 class ParseResultFuture(asyncio.Future):
     """
     Future with metadata for the parser class.
 
-    `user_requested` is set by the parser when a Future is requested by an user and moved to the front,
+    `user_requested` is set by the parser when a Future is requested by an user and its symbol is prioritized,
     allowing the futures to only be waited for when clearing if they were user requested.
     """
 
@@ -86,13 +139,22 @@ class BatchParser:
     DocItems are added through the `add_item` method which adds them to the `_page_doc_items` dict.
     `get_markdown` is used to fetch the Markdown; when this is used for the first time on a page,
     all of the symbols are queued to be parsed to avoid multiple web requests to the same page.
+
+    The queued pages are parsed by a bounded pool of workers, with the pages of symbols requested by users
+    taking priority over parsing the rest of the symbols in the background.
+    The parsed Markdown is written to redis in batches.
     """
 
     def __init__(self):
-        self._queue: deque[QueueItem] = collections.deque()
+        self._pages: dict[str, PageQueue] = {}
+        self._page_queue: list[tuple[Priority, int, PageQueue]] = []
+        self._page_order = itertools.count()
         self._page_doc_items: dict[str, list[_cog.DocItem]] = defaultdict(list)
         self._item_futures: dict[_cog.DocItem, ParseResultFuture] = defaultdict(ParseResultFuture)
-        self._parse_task = None
+        self._workers = set[asyncio.Task]()
+        # Parsed Markdown which wasn't written to redis yet.
+        self._pending_writes: dict[_cog.DocItem, str] = {}
+        self._write_lock = asyncio.Lock()
 
         self.stale_inventory_notifier = StaleInventoryNotifier()
 
@@ -105,74 +167,147 @@ class BatchParser:
 
         Not safe to run while `self.clear` is running.
         """
-        if doc_item not in self._item_futures and doc_item not in self._queue:
-            self._item_futures[doc_item].user_requested = True
-
-            async with bot.instance.http_session.get(doc_item.url, raise_for_status=True) as response:
-                soup = await bot.instance.loop.run_in_executor(
-                    None,
-                    BeautifulSoup,
-                    await response.text(encoding="utf8"),
-                    "lxml",
-                )
+        if (markdown := self._pending_writes.get(doc_item)) is not None:
+            return markdown
 
-            self._queue.extendleft(QueueItem(item, soup) for item in self._page_doc_items[doc_item.url])
-            log.debug(f"Added items from {doc_item.url} to the parse queue.")
+        start = time.perf_counter()
+        if doc_item not in self._item_futures:
+            future = self._item_futures[doc_item]
+            future.user_requested = True
 
-            if self._parse_task is None:
-                self._parse_task = scheduling.create_task(self._parse_queue(), name="Queue parse")
+            if (page := self._pages.get(doc_item.url)) is None:
+                try:
+                    page = await self._queue_page(doc_item.url)
+                except Exception as e:
+                    del self._item_futures[doc_item]
+                    future.set_exception(e)
+                    # The exception is raised below, retrieve it here so the future doesn't log it.
+                    future.exception()
+                    raise
+
+            page.push(doc_item, Priority.USER_REQUESTED)
+            self._schedule_page(page)
+            self._start_workers()
         else:
-            self._item_futures[doc_item].user_requested = True
-        with suppress(ValueError):
-            # If the item is not in the queue then the item is already parsed or is being parsed
-            self._move_to_front(doc_item)
-        return await self._item_futures[doc_item]
-
-    async def _parse_queue(self) -> None:
+            future = self._item_futures[doc_item]
+            future.user_requested = True
+
+        markdown = await future
+        bot.instance.stats.timing("doc.user_result_time", (time.perf_counter() - start) * 1000)
+        return markdown
+
+    async def _queue_page(self, url: str) -> PageQueue:
+        """Fetch the page at `url` and queue all of its symbols to be parsed."""
+        async with bot.instance.http_session.get(url, raise_for_status=True) as response:
+            soup = await bot.instance.loop.run_in_executor(
+                None,
+                BeautifulSoup,
+                await response.text(encoding="utf8"),
+                "lxml",
+            )
+
+        # The page may have been queued by another request while it was being fetched.
+        if (page := self._pages.get(url)) is None:
+            page = PageQueue(url, soup, self._page_doc_items[url], next(self._page_order))
+            self._pages[url] = page
+            log.debug(f"Added items from {url} to the parse queue.")
+            self._report_queue_depth()
+        return page
+
+    def _schedule_page(self, page: PageQueue) -> None:
+        """Put `page` into the page queue with the priority of its most urgent symbol, replacing its previous entry."""
+        if page.parsing or not page:
+            return
+        page.queue_entry = (page.priority, page.order, page)
+        heapq.heappush(self._page_queue, page.queue_entry)
+
+    def _next_page(self) -> PageQueue | None:
+        """Return the most urgent page that isn't already being parsed, or None if there are no such pages."""
+        while self._page_queue:
+            entry = heapq.heappop(self._page_queue)
+            page = entry[2]
+            if entry is page.queue_entry and self._pages.get(page.url) is page:
+                page.queue_entry = None
+                return page
+        return None
+
+    def _start_workers(self) -> None:
+        """Start parse workers until there's one for each queued page, up to the configured amount of workers."""
+        while len(self._workers) < min(Doc.parse_workers, len(self._pages)):
+            worker = scheduling.create_task(self._parse_worker(), name="Documentation parse worker")
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def _parse_worker(self) -> None:
         """
-        Parse all items from the queue, setting their result Markdown on the futures and sending them to redis.
+        Parse symbols from the most urgent page, until there are no pages left which aren't already being parsed.
 
-        The coroutine will run as long as the queue is not empty, resetting `self._parse_task` to None when finished.
+        Pages are put back into the queue after each symbol, so a page with more urgent symbols can be picked up
+        even while other pages with many queued symbols are being parsed.
         """
-        log.trace("Starting queue parsing.")
+        while (page := self._next_page()) is not None:
+            page.parsing = True
+            try:
+                await self._parse_item(page.soup, page.pop())
+            finally:
+                page.parsing = False
+
+            if page:
+                self._schedule_page(page)
+            elif self._pages.get(page.url) is page:
+                del self._pages[page.url]
+            self._report_queue_depth()
+
+        # Leave the pool before flushing, so a page queued during the flush starts a new worker.
+        self._workers.discard(asyncio.current_task())
+        await self._flush_writes()
+
+    async def _parse_item(self, soup: BeautifulSoup, doc_item: _cog.DocItem) -> None:
+        """Parse the Markdown of `doc_item` from `soup`, setting it on the item's future and queueing it for redis."""
+        future = self._item_futures[doc_item]
+        markdown = None
+
+        start = time.perf_counter()
         try:
-            while self._queue:
-                item, soup = self._queue.pop()
-                markdown = None
-
-                if (future := self._item_futures[item]).done():
-                    # Some items are present in the inventories multiple times under different symbol names,
-                    # if we already parsed an equal item, we can just skip it.
-                    continue
+            markdown = await bot.instance.loop.run_in_executor(None, get_symbol_markdown, soup, doc_item)
+        except Exception:
+            log.exception(f"Unexpected error when handling {doc_item}")
+        else:
+            bot.instance.stats.timing("doc.parse_time", (time.perf_counter() - start) * 1000)
+            if markdown is None:
+                # Don't wait for this coro as the parsing doesn't depend on anything it does.
+                scheduling.create_task(
+                    self.stale_inventory_notifier.send_warning(doc_item), name="Stale inventory warning"
+                )
 
-                try:
-                    markdown = await bot.instance.loop.run_in_executor(None, get_symbol_markdown, soup, item)
-                    if markdown is not None:
-                        await doc_cache.set(item, markdown)
-                    else:
-                        # Don't wait for this coro as the parsing doesn't depend on anything it does.
-                        scheduling.create_task(
-                            self.stale_inventory_notifier.send_warning(item), name="Stale inventory warning"
-                        )
-                except Exception:
-                    log.exception(f"Unexpected error when handling {item}")
-                future.set_result(markdown)
-                del self._item_futures[item]
-                await asyncio.sleep(0.1)
-        finally:
-            self._parse_task = None
-            log.trace("Finished parsing queue.")
-
-    def _move_to_front(self, item: QueueItem | _cog.DocItem) -> None:
-        """Move `item` to the front of the parse queue."""
-        # The parse queue stores soups along with the doc symbols in QueueItem objects,
-        # in case we're moving a DocItem we have to get the associated QueueItem first and then move it.
-        item_index = self._queue.index(item)
-        queue_item = self._queue[item_index]
-        del self._queue[item_index]
-
-        self._queue.append(queue_item)
-        log.trace(f"Moved {item} to the front of the queue.")
+        if not future.done():
+            future.set_result(markdown)
+        del self._item_futures[doc_item]
+
+        if markdown is not None:
+            self._pending_writes[doc_item] = markdown
+            if len(self._pending_writes) >= Doc.redis_batch_size:
+                await self._flush_writes()
+
+    async def _flush_writes(self) -> None:
+        """Write the parsed Markdown that's waiting to be written to redis."""
+        async with self._write_lock:
+            values = self._pending_writes.copy()
+            if not values:
+                return
+            try:
+                await doc_cache.set_many(values)
+            except Exception:
+                log.exception(f"Failed to write the Markdown of {len(values)} symbols to redis.")
+            finally:
+                # The values are kept until they're in redis, so they can still be looked up in the meantime.
+                for doc_item in values:
+                    self._pending_writes.pop(doc_item, None)
+            log.trace(f"Wrote the Markdown of {len(values)} symbols to redis.")
+
+    def _report_queue_depth(self) -> None:
+        """Send the amount of symbols waiting to be parsed to stats."""
+        bot.instance.stats.gauge("doc.parse_queue_depth", sum(map(len, self._pages.values())))
 
     def add_item(self, doc_item: _cog.DocItem) -> None:
         """Map a DocItem to its page so that the symbol will be parsed once the page is requested."""
@@ -184,10 +319,13 @@ class BatchParser:
 
         Wait for all user-requested symbols to be parsed before clearing the parser.
         """
-        for future in filter(attrgetter("user_requested"), self._item_futures.values()):
-            await future
-        if self._parse_task is not None:
-            self._parse_task.cancel()
-        self._queue.clear()
+        if user_requested := [future for future in self._item_futures.values() if future.user_requested]:
+            await asyncio.wait(user_requested)
+        for worker in self._workers:
+            worker.cancel()
+        self._workers.clear()
+        await self._flush_writes()
+        self._pages.clear()
+        self._page_queue.clear()
         self._page_doc_items.clear()
         self._item_futures.clear()
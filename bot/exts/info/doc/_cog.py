@@ -5,6 +5,7 @@ import sys
 import textwrap
 from collections import defaultdict
 from contextlib import suppress
+from pathlib import Path
 from types import SimpleNamespace
 from typing import Literal, NamedTuple
 
@@ -12,10 +13,11 @@ import aiohttp
 import discord
 from discord.ext import commands
 from pydis_core.site_api import ResponseCodeError
+from pydis_core.utils import scheduling
 from pydis_core.utils.scheduling import Scheduler
 
 from bot.bot import Bot
-from bot.constants import MODERATION_ROLES, RedirectOutput
+from bot.constants import Doc, MODERATION_ROLES, RedirectOutput
 from bot.converters import Inventory, PackageName, ValidURL
 from bot.log import get_logger
 from bot.pagination import LinePaginator
@@ -23,7 +25,8 @@ from bot.utils.lock import SharedEvent, lock
 from bot.utils.messages import send_denial, wait_for_deletion
 
 from . import NAMESPACE, PRIORITY_PACKAGES, _batch_parser, doc_cache
-from ._inventory_parser import InvalidHeaderError, InventoryDict, fetch_inventory
+from ._inventory_parser import FetchedInventory, InvalidHeaderError, InventoryDict, fetch_inventory_if_modified
+from ._snapshot import read_snapshot, write_snapshot
 
 log = get_logger(__name__)
 
@@ -58,6 +61,35 @@ class DocItem(NamedTuple):
         return self.base_url + self.relative_url_path
 
 
+class CachedInventory(NamedTuple):
+    """A package's inventory as it was last fetched, with the validators used to check whether it changed since."""
+
+    inventory_url: str
+    base_url: str  # The base URL set for the package, empty if it's derived from the inventory URL
+    etag: str | None
+    last_modified: str | None
+    inventory: InventoryDict
+
+
+def _load_snapshot(path: Path) -> tuple[dict[str, CachedInventory], dict[str, str], dict[str, DocItem], dict] | None:
+    """Read the snapshot at `path` and convert it back to the structures used by the cog."""
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return None
+
+    inventories = {}
+    for package_name, package in snapshot["inventories"].items():
+        inventory = defaultdict(list, {group: list(map(tuple, items)) for group, items in package["inventory"].items()})
+        inventories[package_name] = CachedInventory(
+            package["inventory_url"], package["base_url"], package["etag"], package["last_modified"], inventory
+        )
+    doc_symbols = {
+        symbol_name: DocItem(package, sys.intern(group), base_url, sys.intern(relative_url_path), symbol_id)
+        for symbol_name, (package, group, base_url, relative_url_path, symbol_id) in snapshot["doc_symbols"].items()
+    }
+    return inventories, snapshot["base_urls"], doc_symbols, snapshot["renamed_symbols"]
+
+
 class DocCog(commands.Cog):
     """A set of commands for querying & displaying documentation."""
 
@@ -70,6 +102,8 @@ class DocCog(commands.Cog):
         self.item_fetcher = _batch_parser.BatchParser()
         # Maps a conflicting symbol name to a list of the new, disambiguated names created from conflicts with the name.
         self.renamed_symbols = defaultdict(list)
+        # Maps package names to their inventories as they were last fetched, to only fetch them again if they changed.
+        self.inventories: dict[str, CachedInventory] = {}
 
         self.inventory_scheduler = Scheduler(self.__class__.__name__)
 
@@ -78,9 +112,45 @@ class DocCog(commands.Cog):
         self.symbol_get_event = SharedEvent()
 
     async def cog_load(self) -> None:
-        """Refresh documentation inventory on cog initialization."""
+        """
+        Refresh documentation inventory on cog initialization.
+
+        If there's a snapshot of the inventories, it's loaded first so that symbols can be looked up right away,
+        and the inventories are refreshed in the background.
+        """
         await self.bot.wait_until_guild_available()
-        await self.refresh_inventories()
+        if await self.load_snapshot():
+            scheduling.create_task(self.background_refresh(), name="Documentation inventory refresh")
+        else:
+            await self.refresh_inventories()
+
+    async def load_snapshot(self) -> bool:
+        """Load the inventories and symbols from the snapshot, and return whether there was one."""
+        loaded = await asyncio.get_running_loop().run_in_executor(None, _load_snapshot, Doc.snapshot_path)
+        if loaded is None:
+            return False
+
+        inventories, base_urls, doc_symbols, renamed_symbols = loaded
+        self.inventories = inventories
+        self.base_urls.update(base_urls)
+        self.doc_symbols.update(doc_symbols)
+        self.renamed_symbols.update(renamed_symbols)
+        for doc_item in dict.fromkeys(doc_symbols.values()):
+            self.item_fetcher.add_item(doc_item)
+        log.info(f"Loaded {len(doc_symbols)} documentation symbols from the snapshot.")
+        return True
+
+    async def save_snapshot(self) -> None:
+        """Save the inventories and the symbols created from them to the snapshot."""
+        snapshot = {
+            "inventories": {
+                package_name: cached._asdict() for package_name, cached in self.inventories.items()
+            },
+            "base_urls": dict(self.base_urls),
+            "doc_symbols": dict(self.doc_symbols),
+            "renamed_symbols": {name: list(new_names) for name, new_names in self.renamed_symbols.items()},
+        }
+        await asyncio.get_running_loop().run_in_executor(None, write_snapshot, Doc.snapshot_path, snapshot)
 
     def update_single(self, package_name: str, base_url: str, inventory: InventoryDict) -> None:
         """
@@ -119,6 +189,22 @@ class DocCog(commands.Cog):
 
         log.trace(f"Fetched inventory for {package_name}.")
 
+    async def fetch_package_inventory(self, package_name: str, inventory_url: str) -> FetchedInventory | None:
+        """
+        Fetch the inventory of the package, or return None if it couldn't be fetched.
+
+        If the package's inventory was fetched from the same URL before, it's only downloaded again if it changed.
+        Otherwise, the previous inventory object is returned.
+        """
+        cached = self.inventories.get(package_name)
+        if cached is None or cached.inventory_url != inventory_url:
+            return await fetch_inventory_if_modified(inventory_url)
+
+        fetched = await fetch_inventory_if_modified(inventory_url, cached.etag, cached.last_modified)
+        if fetched and fetched.inventory is None:
+            return fetched._replace(inventory=cached.inventory)
+        return fetched
+
     async def update_or_reschedule_inventory(
         self,
         api_package_name: str,
@@ -132,13 +218,30 @@ class DocCog(commands.Cog):
         in `FETCH_RESCHEDULE_DELAY.repeated` minutes.
         """
         try:
-            package = await fetch_inventory(inventory_url)
+            fetched = await self.fetch_package_inventory(api_package_name, inventory_url)
         except InvalidHeaderError as e:
+            fetched = e
+        if self.apply_fetched_inventory(api_package_name, base_url, inventory_url, fetched):
+            await self.save_snapshot()
+
+    def apply_fetched_inventory(
+        self,
+        api_package_name: str,
+        base_url: str,
+        inventory_url: str,
+        fetched: FetchedInventory | InvalidHeaderError | None,
+    ) -> bool:
+        """
+        Build the inventory of the package from the result of fetching it, and return whether it was built.
+
+        If the inventory couldn't be fetched, `update_or_reschedule_inventory` is scheduled to try again.
+        """
+        if isinstance(fetched, InvalidHeaderError):
             # Do not reschedule if the header is invalid, as the request went through but the contents are invalid.
-            log.warning(f"Invalid inventory header at {inventory_url}. Reason: {e}")
-            return
+            log.warning(f"Invalid inventory header at {inventory_url}. Reason: {fetched}")
+            return False
 
-        if not package:
+        if not fetched:
             if api_package_name in self.inventory_scheduler:
                 self.inventory_scheduler.cancel(api_package_name)
                 delay = FETCH_RESCHEDULE_DELAY.repeated
@@ -150,10 +253,15 @@ class DocCog(commands.Cog):
                 api_package_name,
                 self.update_or_reschedule_inventory(api_package_name, base_url, inventory_url),
             )
-        else:
-            if not base_url:
-                base_url = self.base_url_from_inventory_url(inventory_url)
-            self.update_single(api_package_name, base_url, package)
+            return False
+
+        self.inventories[api_package_name] = CachedInventory(
+            inventory_url, base_url, fetched.etag, fetched.last_modified, fetched.inventory
+        )
+        if not base_url:
+            base_url = self.base_url_from_inventory_url(inventory_url)
+        self.update_single(api_package_name, base_url, fetched.inventory)
+        return True
 
     def ensure_unique_symbol_name(self, package_name: str, group_name: str, symbol_name: str) -> str:
         """
@@ -204,25 +312,70 @@ class DocCog(commands.Cog):
         return rename(item.group, rename_extant=True)
 
     async def refresh_inventories(self) -> None:
-        """Refresh internal documentation inventories."""
+        """
+        Refresh internal documentation inventories.
+
+        Inventories are fetched before the symbols are cleared, and only downloaded if they changed since they were
+        last fetched. If none of them changed, the current symbols are kept. Otherwise, the symbols are rebuilt and
+        a new snapshot is saved.
+        """
+        log.debug("Refreshing documentation inventory...")
+        packages = await self.bot.api_client.get("bot/documentation-links")
+        results = await asyncio.gather(
+            *(self.fetch_package_inventory(package["package"], package["inventory_url"]) for package in packages),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, InvalidHeaderError):
+                raise result
+
+        if self._inventories_unchanged(packages, results):
+            log.debug("Documentation inventories didn't change since the last refresh.")
+            return
+
         self.refresh_event.clear()
         await self.symbol_get_event.wait()
-        log.debug("Refreshing documentation inventory...")
         self.inventory_scheduler.cancel_all()
 
         self.base_urls.clear()
         self.doc_symbols.clear()
         self.renamed_symbols.clear()
+        self.inventories.clear()
         await self.item_fetcher.clear()
 
-        coros = [
-            self.update_or_reschedule_inventory(
-                package["package"], package["base_url"], package["inventory_url"]
-            ) for package in await self.bot.api_client.get("bot/documentation-links")
-        ]
-        await asyncio.gather(*coros)
+        for package, fetched in zip(packages, results, strict=True):
+            self.apply_fetched_inventory(package["package"], package["base_url"], package["inventory_url"], fetched)
         log.debug("Finished inventory refresh.")
         self.refresh_event.set()
+        await self.save_snapshot()
+
+    @lock(NAMESPACE, COMMAND_LOCK_SINGLETON, wait=True)
+    async def background_refresh(self) -> None:
+        """Refresh the inventories, holding the same lock as the commands which modify them."""
+        await self.refresh_inventories()
+
+    def _inventories_unchanged(
+        self, packages: list[dict], results: list[FetchedInventory | InvalidHeaderError | None]
+    ) -> bool:
+        """Return whether the packages and their fetched inventories are the same as the ones currently loaded."""
+        if {package["package"] for package in packages} != self.inventories.keys():
+            return False
+
+        for package, fetched in zip(packages, results, strict=True):
+            cached = self.inventories[package["package"]]
+            if (
+                not isinstance(fetched, FetchedInventory)
+                or fetched.inventory is not cached.inventory
+                or (package["base_url"], package["inventory_url"]) != (cached.base_url, cached.inventory_url)
+            ):
+                return False
+
+        # Keep any new validators the server sent for the next refresh.
+        for package, fetched in zip(packages, results, strict=True):
+            self.inventories[package["package"]] = self.inventories[package["package"]]._replace(
+                etag=fetched.etag, last_modified=fetched.last_modified
+            )
+        return True
 
     def get_symbol_item(self, symbol_name: str) -> tuple[str, DocItem | None]:
         """
@@ -400,10 +553,12 @@ class DocCog(commands.Cog):
             + "\n".join(f"{key}: {value}" for key, value in body.items())
         )
 
+        self.inventories[package_name] = CachedInventory(inventory_url, base_url, None, None, inventory_dict)
         if not base_url:
             base_url = self.base_url_from_inventory_url(inventory_url)
         self.update_single(package_name, base_url, inventory_dict)
         await ctx.send(f"Added the package `{package_name}` to the database and updated the inventories.")
+        await self.save_snapshot()
 
     @docs_group.command(name="deletedoc", aliases=("removedoc", "rm", "d"))
     @commands.has_any_role(*MODERATION_ROLES)
@@ -2,6 +2,7 @@ import re
 import zlib
 from collections import defaultdict
 from collections.abc import AsyncIterator
+from typing import NamedTuple
 
 import aiohttp
 
@@ -20,6 +21,14 @@ class InvalidHeaderError(Exception):
     """Raised when an inventory file has an invalid header."""
 
 
+class FetchedInventory(NamedTuple):
+    """An inventory along with the validators sent for it, used to only fetch it again if it changed."""
+
+    inventory: InventoryDict | None  # None if the inventory wasn't modified since the validators were sent.
+    etag: str | None
+    last_modified: str | None
+
+
 class ZlibStreamReader:
     """Class used for decoding zlib data of a stream line by line."""
 
@@ -84,32 +93,52 @@ async def _load_v2(stream: aiohttp.StreamReader) -> InventoryDict:
     return invdata
 
 
-async def _fetch_inventory(url: str) -> InventoryDict:
-    """Fetch, parse and return an intersphinx inventory file from an url."""
-    timeout = aiohttp.ClientTimeout(sock_connect=5, sock_read=5)
-    async with bot.instance.http_session.get(url, timeout=timeout, raise_for_status=True) as response:
-        stream = response.content
-
-        inventory_header = (await stream.readline()).decode().rstrip()
-        try:
-            inventory_version = int(inventory_header[-1:])
-        except ValueError:
-            raise InvalidHeaderError("Unable to convert inventory version header.")
-
-        has_project_header = (await stream.readline()).startswith(b"# Project")
-        has_version_header = (await stream.readline()).startswith(b"# Version")
-        if not (has_project_header and has_version_header):
-            raise InvalidHeaderError("Inventory missing project or version header.")
-
-        if inventory_version == 1:
-            return await _load_v1(stream)
-
-        if inventory_version == 2:
-            if b"zlib" not in await stream.readline():
-                raise InvalidHeaderError("'zlib' not found in header of compressed inventory.")
-            return await _load_v2(stream)
+async def _fetch_inventory(url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedInventory:
+    """
+    Fetch, parse and return an intersphinx inventory file from an url.
 
-        raise InvalidHeaderError("Incompatible inventory version.")
+    If `etag` or `last_modified` are given, the inventory is only fetched if it changed since. Otherwise, the returned
+    inventory is None.
+    """
+    timeout = aiohttp.ClientTimeout(sock_connect=5, sock_read=5)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    async with bot.instance.http_session.get(
+        url, headers=headers, timeout=timeout, raise_for_status=True
+    ) as response:
+        # A not modified response isn't required to repeat the validators.
+        etag = response.headers.get("ETag", etag)
+        last_modified = response.headers.get("Last-Modified", last_modified)
+        if response.status == 304:
+            return FetchedInventory(None, etag, last_modified)
+        return FetchedInventory(await _parse_inventory(response.content), etag, last_modified)
+
+
+async def _parse_inventory(stream: aiohttp.StreamReader) -> InventoryDict:
+    """Parse an intersphinx inventory file from the stream."""
+    inventory_header = (await stream.readline()).decode().rstrip()
+    try:
+        inventory_version = int(inventory_header[-1:])
+    except ValueError:
+        raise InvalidHeaderError("Unable to convert inventory version header.")
+
+    has_project_header = (await stream.readline()).startswith(b"# Project")
+    has_version_header = (await stream.readline()).startswith(b"# Version")
+    if not (has_project_header and has_version_header):
+        raise InvalidHeaderError("Inventory missing project or version header.")
+
+    if inventory_version == 1:
+        return await _load_v1(stream)
+
+    if inventory_version == 2:
+        if b"zlib" not in await stream.readline():
+            raise InvalidHeaderError("'zlib' not found in header of compressed inventory.")
+        return await _load_v2(stream)
+
+    raise InvalidHeaderError("Incompatible inventory version.")
 
 
 async def fetch_inventory(url: str) -> InventoryDict | None:
@@ -119,9 +148,21 @@ async def fetch_inventory(url: str) -> InventoryDict | None:
     `url` should point at a valid sphinx objects.inv inventory file, which will be parsed into the
     inventory dict in the format of {"domain:role": [("symbol_name", "relative_url_to_symbol"), ...], ...}
     """
+    fetched = await fetch_inventory_if_modified(url)
+    return fetched and fetched.inventory
+
+
+async def fetch_inventory_if_modified(
+    url: str, etag: str | None = None, last_modified: str | None = None
+) -> FetchedInventory | None:
+    """
+    Like `fetch_inventory`, but skip downloading the inventory if it wasn't modified according to the validators.
+
+    The validators are the `ETag` and `Last-Modified` headers received the last time the inventory was fetched.
+    """
     for attempt in range(1, FAILED_REQUEST_ATTEMPTS+1):
         try:
-            inventory = await _fetch_inventory(url)
+            inventory = await _fetch_inventory(url, etag, last_modified)
         except aiohttp.ClientConnectorError:
             log.warning(
                 f"Failed to connect to inventory url at {url}; "
@@ -3,6 +3,7 @@ from __future__ import annotations
 import datetime
 import fnmatch
 import time
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 from async_rediscache.types.base import RedisObject
@@ -18,10 +19,9 @@ WEEK_SECONDS = int(datetime.timedelta(weeks=1).total_seconds())
 log = get_logger(__name__)
 
 
-def serialize_resource_id_from_doc_item(bound_args: dict) -> str:
-    """Return the redis_key of the DocItem `item` from the bound args of DocRedisCache.set."""
-    item: DocItem = bound_args["item"]
-    return f"doc:{item_key(item)}"
+def serialize_resource_id_from_redis_key(bound_args: dict) -> str:
+    """Return the `redis_key` from the bound args of DocRedisCache._set_page."""
+    return bound_args["redis_key"]
 
 
 class DocRedisCache(RedisObject):
@@ -31,14 +31,26 @@ class DocRedisCache(RedisObject):
         super().__init__(*args, **kwargs)
         self._set_expires = dict[str, float]()
 
-    @lock("DocRedisCache.set", serialize_resource_id_from_doc_item, wait=True)
     async def set(self, item: DocItem, value: str) -> None:
         """
         Set the Markdown `value` for the symbol `item`.
 
         All keys from a single page are stored together, expiring a week after the first set.
         """
-        redis_key = f"{self.namespace}:{item_key(item)}"
+        await self._set_page(f"{self.namespace}:{item_key(item)}", {item.symbol_id: value})
+
+    async def set_many(self, values: dict[DocItem, str]) -> None:
+        """Set the Markdown of multiple symbols, writing the symbols of each page with a single command."""
+        pages = defaultdict(dict)
+        for item, value in values.items():
+            pages[f"{self.namespace}:{item_key(item)}"][item.symbol_id] = value
+
+        for redis_key, page_values in pages.items():
+            await self._set_page(redis_key, page_values)
+
+    @lock("DocRedisCache.set", serialize_resource_id_from_redis_key, wait=True)
+    async def _set_page(self, redis_key: str, values: dict[str, str]) -> None:
+        """Set the Markdown `values` of symbols on the page under `redis_key`, mapped by their symbol ids."""
         needs_expire = False
 
         set_expire = self._set_expires.get(redis_key)
@@ -60,7 +72,7 @@ class DocRedisCache(RedisObject):
             needs_expire = True
             log.debug(f"Key `{redis_key}` expired in internal key cache.")
 
-        await self.redis_session.client.hset(redis_key, item.symbol_id, value)
+        await self.redis_session.client.hset(redis_key, mapping=values)
         if needs_expire:
             self._set_expires[redis_key] = time.monotonic() + WEEK_SECONDS
             await self.redis_session.client.expire(redis_key, WEEK_SECONDS)
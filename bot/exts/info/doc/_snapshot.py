@@ -0,0 +1,48 @@
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+# Bump when the structure of the snapshot changes, so that snapshots in an older format are ignored.
+SNAPSHOT_VERSION = 1
+
+
+def read_snapshot(path: Path) -> dict[str, Any] | None:
+    """Return the snapshot stored at `path`, or None if there's no usable snapshot there."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        log.debug(f"No documentation inventory snapshot found at {path}.")
+        return None
+    except (OSError, ValueError):
+        log.warning(f"Failed to read the documentation inventory snapshot at {path}.", exc_info=True)
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        log.info(f"Ignoring documentation inventory snapshot with version {snapshot.get('version')}.")
+        return None
+    return snapshot
+
+
+def write_snapshot(path: Path, snapshot: dict[str, Any]) -> None:
+    """
+    Store the snapshot at `path`.
+
+    The snapshot is first written to a temporary file which then replaces the old one,
+    so that a partially written snapshot is never read.
+    """
+    snapshot = {"version": SNAPSHOT_VERSION, **snapshot}
+    temp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError:
+        log.warning(f"Failed to write the documentation inventory snapshot to {path}.", exc_info=True)
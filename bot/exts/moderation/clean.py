@@ -1,25 +1,38 @@
+import asyncio
 import contextlib
+import heapq
 import itertools
 import re
 import time
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Callable
 from contextlib import suppress
-from datetime import datetime
-from itertools import takewhile
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Literal, TYPE_CHECKING
 
-from discord import Colour, Message, NotFound, TextChannel, Thread, User, errors
+from discord import (
+    Colour,
+    Message,
+    NotFound,
+    RawBulkMessageDeleteEvent,
+    RawMessageDeleteEvent,
+    TextChannel,
+    Thread,
+    User,
+    errors,
+)
 from discord.ext.commands import Cog, Context, Converter, Greedy, command, group, has_any_role
 from discord.ext.commands.converter import TextChannelConverter
 from discord.ext.commands.errors import BadArgument
 
 from bot.bot import Bot
-from bot.constants import Channels, CleanMessages, Colours, Emojis, Event, Icons, MODERATION_ROLES
+from bot.constants import Bot as BotConfig, Channels, CleanMessages, Colours, Emojis, Event, Icons, MODERATION_ROLES
 from bot.converters import Age, ISODateTime
 from bot.exts.moderation.modlog import ModLog
 from bot.log import get_logger
 from bot.utils.channel import is_mod_channel
+from bot.utils.message_cache import MessageIndex
 from bot.utils.messages import upload_log
 from bot.utils.modlog import send_log_message
 
@@ -27,6 +40,8 @@ log = get_logger(__name__)
 
 # Number of seconds before command invocations and responses are deleted in non-moderation channels.
 MESSAGE_DELETE_DELAY = 5
+# Number of seconds between reports of the progress of cleaning channel histories.
+PROGRESS_INTERVAL = 10
 
 # Type alias for checks for whether a message should be deleted.
 Predicate = Callable[[Message], bool]
@@ -34,6 +49,17 @@ Predicate = Callable[[Message], bool]
 CleanLimit = Message | Age | ISODateTime
 
 
+@dataclass(slots=True)
+class _CleanProgress:
+    """The progress of cleaning the histories of channels."""
+
+    channels: int
+    scanned: int = 0
+    deleted: int = 0
+    # The message reporting the progress, once it's sent.
+    message: Message | None = None
+
+
 class CleanChannels(Converter):
     """A converter to turn the string into a list of channels to clean, or the literal `*` for all public channels."""
 
@@ -79,6 +105,28 @@ class Clean(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.cleaning = False
+        # The index holds as many messages as the bot's message cache, so it doesn't refer to uncached messages.
+        self.message_index = MessageIndex(BotConfig.max_messages, since=datetime.now(UTC))
+
+    async def cog_load(self) -> None:
+        """Index the messages which the bot cached before the cog was loaded."""
+        self.message_index.seed(self.bot.cached_messages)
+
+    @Cog.listener()
+    async def on_message(self, message: Message) -> None:
+        """Index the received message."""
+        self.message_index.add(message)
+
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+        """Remove the deleted message from the index."""
+        self.message_index.remove(payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: RawBulkMessageDeleteEvent) -> None:
+        """Remove the deleted messages from the index."""
+        for message_id in payload.message_ids:
+            self.message_index.remove(message_id)
 
     @property
     def mod_log(self) -> ModLog:
@@ -217,20 +265,41 @@ class Clean(Cog):
                 # Invocation message has already been deleted
                 log.info("Tried to delete invocation message, but it was already deleted.")
 
-    def _use_cache(self, limit: datetime) -> bool:
-        """Tell whether all messages to be cleaned can be found in the cache."""
-        return self.bot.cached_messages[0].created_at <= limit
+    def _use_cache(self, channel: TextChannel, limit: datetime) -> bool:
+        """Tell whether all messages to be cleaned in the channel can be found in the cache."""
+        return self.message_index.covers(channel.id, limit)
 
     def _get_messages_from_cache(
         self,
         channels: set[TextChannel],
         to_delete: Predicate,
-        lower_limit: datetime
+        lower_limit: datetime,
+        users: list[User] | None = None,
     ) -> tuple[defaultdict[TextChannel, list], list[int]]:
-        """Helper function for getting messages from the cache."""
+        """
+        Helper function for getting messages from the cache.
+
+        Only the cached messages of the given users are looked at if there are any, otherwise those of the channels.
+        """
         message_mappings = defaultdict(list)
         message_ids = []
-        for message in takewhile(lambda m: m.created_at > lower_limit, reversed(self.bot.cached_messages)):
+        if not channels:
+            return message_mappings, message_ids
+
+        if users:
+            candidates = heapq.merge(
+                *(self.message_index.author_history(user.id, lower_limit) for user in users),
+                key=lambda message: message.created_at,
+                reverse=True,
+            )
+        else:
+            candidates = heapq.merge(
+                *(self.message_index.channel_history(channel.id, lower_limit) for channel in channels),
+                key=lambda message: message.created_at,
+                reverse=True,
+            )
+
+        for message in candidates:
             if not self.cleaning:
                 # Cleaning was canceled
                 return message_mappings, message_ids
@@ -241,33 +310,105 @@ class Clean(Cog):
 
         return message_mappings, message_ids
 
-    async def _get_messages_from_channels(
+    async def _get_messages_from_channel(
         self,
-        channels: Iterable[TextChannel],
+        channel: TextChannel,
         to_delete: Predicate,
         after: datetime,
         before: datetime | None = None
-    ) -> tuple[defaultdict[TextChannel, list], list]:
+    ) -> list[Message] | None:
         """
-        Collect the messages for deletion by iterating over the histories of the appropriate channels.
+        Collect the messages for deletion by iterating over the history of the channel, newest first.
 
         The clean cog enforces an upper limit on message age through `_validate_input`.
+        Return None if cleaning was cancelled.
         """
-        message_mappings = defaultdict(list)
-        message_ids = []
+        messages = []
+        async for message in channel.history(limit=CleanMessages.message_limit, before=before, after=after):
+            if not self.cleaning:
+                # Cleaning was canceled
+                return None
+
+            if to_delete(message):
+                messages.append(message)
+
+        return messages
+
+    async def _clean_channels(
+        self,
+        ctx: Context,
+        channels: set[TextChannel],
+        to_delete: Predicate,
+        after: datetime,
+        before: datetime | None = None
+    ) -> list[Message]:
+        """
+        Scan the histories of the channels concurrently, deleting the messages found in each as soon as it's scanned.
 
-        for channel in channels:
-            async for message in channel.history(limit=CleanMessages.message_limit, before=before, after=after):
+        Up to `CleanMessages.scan_concurrency` channels are scanned at once. Each channel's history is a separate
+        rate limit bucket, so scanning them concurrently doesn't slow down the requests of any single channel.
+        The progress is reported to the context channel while the channels are being cleaned.
+        Return the deleted messages, which are only those deleted up to the cancellation if cleaning was cancelled.
+        """
+        progress = _CleanProgress(len(channels))
+        scanned: asyncio.Queue[tuple[TextChannel, list[Message]] | None] = asyncio.Queue()
+        semaphore = asyncio.Semaphore(CleanMessages.scan_concurrency)
+        deleted = []
 
+        async def scan(channel: TextChannel) -> None:
+            async with semaphore:
+                if not self.cleaning:
+                    return
+                messages = await self._get_messages_from_channel(
+                    channel, lambda message: message != progress.message and to_delete(message), after, before
+                )
+            progress.scanned += 1
+            if messages:
+                await scanned.put((channel, messages))
+
+        async def delete() -> None:
+            while (item := await scanned.get()) is not None:
+                channel, messages = item
                 if not self.cleaning:
-                    # Cleaning was canceled, return empty containers.
-                    return defaultdict(list), []
+                    continue
+                self.mod_log.ignore(Event.message_delete, *(message.id for message in messages))
+                channel_deleted = await self._delete_found({channel: messages})
+                deleted.extend(channel_deleted)
+                progress.deleted += len(channel_deleted)
+
+        deleter = asyncio.create_task(delete())
+        reporter = asyncio.create_task(self._report_progress(ctx, progress))
+        scans = [asyncio.create_task(scan(channel)) for channel in channels]
+        try:
+            await asyncio.gather(*scans)
+            await scanned.put(None)
+            await deleter
+        finally:
+            for task in (*scans, deleter, reporter):
+                task.cancel()
+            if progress.message is not None:
+                self.mod_log.ignore(Event.message_delete, progress.message.id)
+                with suppress(NotFound):
+                    await progress.message.delete()
 
-                if to_delete(message):
-                    message_mappings[message.channel].append(message)
-                    message_ids.append(message.id)
+        return deleted
 
-        return message_mappings, message_ids
+    async def _report_progress(self, ctx: Context, progress: "_CleanProgress") -> None:
+        """Periodically send the progress of cleaning the channels to the context channel, editing the same message."""
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            content = (
+                f":hourglass_flowing_sand: Cleaning: scanned {progress.scanned}/{progress.channels} channels, "
+                f"deleted {progress.deleted} messages so far."
+            )
+            try:
+                if progress.message is None:
+                    progress.message = await ctx.send(content)
+                else:
+                    await progress.message.edit(content=content)
+            except NotFound:
+                # The progress message was deleted.
+                return
 
     @staticmethod
     def is_older_than_14d(message: Message) -> bool:
@@ -420,20 +561,14 @@ class Clean(Cog):
             # Delete the invocation first
             await self._delete_invocation(ctx)
 
-        if self._use_cache(first_limit):
-            log.trace(f"Messages for cleaning by {ctx.author.id} will be searched in the cache.")
-            message_mappings, message_ids = self._get_messages_from_cache(
-                channels=deletion_channels, to_delete=predicate, lower_limit=first_limit
-            )
-        else:
-            log.trace(f"Messages for cleaning by {ctx.author.id} will be searched in channel histories.")
-            message_mappings, message_ids = await self._get_messages_from_channels(
-                channels=deletion_channels,
-                to_delete=predicate,
-                after=first_limit,  # Remember first is the earlier datetime (the "older" time).
-                before=second_limit
-            )
-
+        cached_channels = {channel for channel in deletion_channels if self._use_cache(channel, first_limit)}
+        log.trace(
+            f"Messages for cleaning by {ctx.author.id} will be searched in the cache for {len(cached_channels)} "
+            f"channels, and in channel histories for {len(deletion_channels) - len(cached_channels)} channels."
+        )
+        message_mappings, message_ids = self._get_messages_from_cache(
+            channels=cached_channels, to_delete=predicate, lower_limit=first_limit, users=users
+        )
         if not self.cleaning:
             # Means that the cleaning was canceled
             return None
@@ -441,6 +576,18 @@ class Clean(Cog):
         # Now let's delete the actual messages with purge.
         self.mod_log.ignore(Event.message_delete, *message_ids)
         deleted_messages = await self._delete_found(message_mappings)
+
+        if uncached_channels := deletion_channels - cached_channels:
+            deleted_messages += await self._clean_channels(
+                ctx,
+                channels=uncached_channels,
+                to_delete=predicate,
+                after=first_limit,  # Remember first is the earlier datetime (the "older" time).
+                before=second_limit
+            )
+        if not self.cleaning and not deleted_messages:
+            # Means that the cleaning was canceled before anything was deleted
+            return None
         self.cleaning = False
 
         if not channels:
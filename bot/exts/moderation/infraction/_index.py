@@ -0,0 +1,107 @@
+from collections.abc import Awaitable, Iterable
+
+from bot.exts.moderation.infraction._utils import Infraction
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+IndexKey = tuple[int, str]
+
+
+def _key(infraction: Infraction) -> IndexKey:
+    """Return the key of `infraction` in the index."""
+    return infraction["user"], infraction["type"]
+
+
+class ActiveInfractionIndex:
+    """
+    In-memory index of the active infractions of some types, keyed by the user id and infraction type.
+
+    The index only answers lookups once it's warm, which is after both its temporary and its permanent infractions
+    were populated from the site; until then, `covers` is False and lookups should be made through the API instead.
+    A user can only have a single active infraction of each type.
+    """
+
+    def __init__(self, types: Iterable[str]):
+        self.types = frozenset(types)
+        self.warm = False
+        self._infractions: dict[IndexKey, Infraction] = {}
+        # Whether the permanent and the temporary infractions were reconciled, keyed by `permanent`.
+        self._reconciled: set[bool] = set()
+        # The keys changed locally while the index is being reconciled, None when it's not.
+        self._changed: set[IndexKey] | None = None
+
+    def __len__(self):
+        return len(self._infractions)
+
+    def covers(self, infr_type: str) -> bool:
+        """Return whether lookups of active infractions of `infr_type` can be answered by the index."""
+        return self.warm and infr_type in self.types
+
+    def get(self, user_id: int, infr_type: str) -> Infraction | None:
+        """Return the active infraction of `infr_type` of the user, if they have one."""
+        return self._infractions.get((user_id, infr_type))
+
+    def values(self) -> Iterable[Infraction]:
+        """Return the indexed infractions."""
+        return self._infractions.values()
+
+    def add(self, infraction: Infraction) -> None:
+        """
+        Index `infraction` if it's active, replacing the user's previous infraction of the same type.
+
+        An inactive infraction is removed from the index instead.
+        """
+        if infraction["type"] not in self.types:
+            return
+        if not infraction["active"]:
+            self.remove(infraction)
+            return
+        key = _key(infraction)
+        self._infractions[key] = infraction
+        if self._changed is not None:
+            self._changed.add(key)
+
+    def remove(self, infraction: Infraction) -> None:
+        """Remove `infraction` from the index, if it's indexed."""
+        key = _key(infraction)
+        if (indexed := self._infractions.get(key)) is not None and indexed["id"] == infraction["id"]:
+            del self._infractions[key]
+            if self._changed is not None:
+                self._changed.add(key)
+
+    async def reconcile(self, fetch: Awaitable[list[Infraction]], *, permanent: bool) -> None:
+        """
+        Replace the indexed permanent or temporary infractions with the active infractions returned by `fetch`.
+
+        `fetch` should return either only permanent or only temporary infractions, as given by `permanent`.
+        Indexed infractions of the other kind are kept, and the index becomes warm once both were reconciled.
+        Infractions that were added or removed while the fetch was in progress are kept as they are locally,
+        as the fetched infractions may not include those changes.
+        """
+        self._changed = set()
+        try:
+            infractions = await fetch
+        finally:
+            changed, self._changed = self._changed, None
+
+        kept = {
+            key: infraction for key, infraction in self._infractions.items()
+            if (infraction["expires_at"] is None) != permanent
+        }
+        fetched = {_key(infraction): infraction for infraction in infractions if infraction["type"] in self.types}
+        indexed = kept | fetched
+        for key in changed:
+            if key in self._infractions:
+                indexed[key] = self._infractions[key]
+            else:
+                indexed.pop(key, None)
+
+        if permanent in self._reconciled and len(fetched) != len(self._infractions) - len(kept):
+            log.info(
+                f"Reconciled active {'permanent' if permanent else 'temporary'} infractions: "
+                f"{len(self._infractions) - len(kept)} indexed, {len(fetched)} on the site."
+            )
+        self._infractions = indexed
+        self._reconciled.add(permanent)
+        self.warm = len(self._reconciled) == 2
@@ -1,7 +1,9 @@
+import asyncio
 import textwrap
 import typing as t
 from abc import abstractmethod
 from collections.abc import Awaitable, Callable
+from datetime import timedelta
 from gettext import ngettext
 
 import arrow
@@ -16,6 +18,7 @@ from bot.bot import Bot
 from bot.constants import Colours, Roles
 from bot.converters import MemberOrUser
 from bot.exts.moderation.infraction import _utils
+from bot.exts.moderation.infraction._index import ActiveInfractionIndex
 from bot.exts.moderation.modlog import ModLog
 from bot.log import get_logger
 from bot.utils import messages, time
@@ -24,6 +27,12 @@ from bot.utils.modlog import send_log_message
 
 log = get_logger(__name__)
 
+# How often the index of active temporary infractions is compared with the active infractions on the site.
+RECONCILE_INTERVAL = timedelta(hours=1)
+# How often the same is done for permanent infractions, which are many more and rarely change outside the bot.
+PERMANENT_RECONCILE_INTERVAL = timedelta(days=1)
+
+
 def mark_branch(branch_id) -> None:
     with open("branch_count.log", "a") as log_file:
         log_file.write(f"branch {branch_id} executed\n")
@@ -35,11 +44,15 @@ class InfractionScheduler:
 
     def __init__(self, bot: Bot, supported_infractions: t.Container[str]):
         self.bot = bot
-        self.scheduler = scheduling.Scheduler(self.__class__.__name__)
+        self.scheduler = bot.timers.scheduler(self.__class__.__name__)
         self.supported_infractions = supported_infractions
+        self.active_infractions = ActiveInfractionIndex(supported_infractions)
+        self._reconcile_tasks: list[asyncio.Task] = []
 
     async def cog_unload(self) -> None:
         """Cancel scheduled tasks."""
+        for task in self._reconcile_tasks:
+            task.cancel()
         self.scheduler.cancel_all()
 
     @property
@@ -48,41 +61,62 @@ class InfractionScheduler:
         return self.bot.get_cog("ModLog")
 
     async def cog_load(self) -> None:
-        """Schedule expiration for previous infractions."""
+        """Index the active infractions and schedule the expiration of previous infractions."""
         await self.bot.wait_until_guild_available()
-        supported_infractions = self.supported_infractions
+        await self.reconcile_active_infractions(permanent=False)
+        await self.reconcile_active_infractions(permanent=True)
+        self._reconcile_tasks = [
+            scheduling.create_task(
+                self._reconcile_periodically(interval, permanent=permanent),
+                name=f"{self.__class__.__name__} {kind} infraction reconciliation",
+            )
+            for interval, permanent, kind in (
+                (RECONCILE_INTERVAL, False, "temporary"),
+                (PERMANENT_RECONCILE_INTERVAL, True, "permanent"),
+            )
+        ]
 
-        log.trace(f"Rescheduling infractions for {self.__class__.__name__}.")
+    async def reconcile_active_infractions(self, *, permanent: bool) -> None:
+        """
+        Update the index of active infractions from the site and schedule the expiration of unscheduled infractions.
 
-        infractions = await self.bot.api_client.get(
+        Only the permanent or the temporary infractions are reconciled, as given by `permanent`.
+        This also picks up infractions that were changed on the site without going through the bot.
+        """
+        kind = "permanent" if permanent else "temporary"
+        log.trace(f"Reconciling active {kind} infractions for {self.__class__.__name__}.")
+
+        await self.active_infractions.reconcile(self.bot.api_client.get(
             "bot/infractions",
             params={
                 "active": "true",
                 "ordering": "expires_at",
-                "permanent": "false",
-                "types": ",".join(supported_infractions),
+                "permanent": str(permanent).lower(),
+                "types": ",".join(self.supported_infractions),
             },
-        )
-
-        to_schedule = [i for i in infractions if i["id"] not in self.scheduler]
+        ), permanent=permanent)
+        if permanent:
+            return
 
+        to_schedule = [
+            infraction for infraction in self.active_infractions.values()
+            if infraction["expires_at"] is not None and infraction["id"] not in self.scheduler
+        ]
         for infraction in to_schedule:
             log.trace("Scheduling %r", infraction)
             self.schedule_expiration(infraction)
 
-        # Call ourselves again when the last infraction would expire. This will be the "oldest" infraction we've seen
-        # from the database so far, and new ones are scheduled as part of application.
-        # We make sure to fire this
-        if to_schedule:
-            next_reschedule_point = max(
-                dateutil.parser.isoparse(infr["expires_at"]) for infr in to_schedule
-            )
-            log.trace("Will reschedule remaining infractions at %s", next_reschedule_point)
-
-            self.scheduler.schedule_at(next_reschedule_point, -1, self.cog_load())
-
         log.trace("Done rescheduling")
 
+    async def _reconcile_periodically(self, interval: timedelta, *, permanent: bool) -> None:
+        """Reconcile the active permanent or temporary infractions with the site every `interval`."""
+        while True:
+            await asyncio.sleep(interval.total_seconds())
+            try:
+                await self.reconcile_active_infractions(permanent=permanent)
+            except Exception:
+                log.exception(f"Failed to reconcile the active infractions of {self.__class__.__name__}.")
+
     async def reapply_infraction(
         self,
         infraction: _utils.Infraction,
@@ -301,6 +335,9 @@ class InfractionScheduler:
             footer=f"ID: {id_}"
         )
 
+        if not failed:
+            self.active_infractions.add(infraction)
+
         log.info(f"{'Failed to apply' if failed else 'Applied'} {purge}{infr_type} infraction #{id_} to {user}.")
         return not failed
 
@@ -518,6 +555,7 @@ class InfractionScheduler:
                 f"bot/infractions/{id_}",
                 json=data
             )
+            self.active_infractions.remove(infraction)
         except ResponseCodeError as e:#complexity +1: 10
             mark_branch(12)
             log.exception(f"Failed to deactivate infraction #{id_} ({type_})")
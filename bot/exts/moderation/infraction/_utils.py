@@ -1,5 +1,6 @@
 
 import datetime
+import typing as t
 
 import arrow
 import discord
@@ -18,6 +19,9 @@ from bot.utils import time
 from bot.utils.channel import is_in_category, is_mod_channel
 from bot.utils.time import unpack_duration
 
+if t.TYPE_CHECKING:
+    from bot.exts.moderation.infraction._index import ActiveInfractionIndex
+
 log = get_logger(__name__)
 
 # apply icon, pardon icon
@@ -162,31 +166,40 @@ async def get_active_infraction(
         ctx: Context,
         user: MemberOrUser,
         infr_type: str,
-        send_msg: bool = True
+        send_msg: bool = True,
+        *,
+        index: "ActiveInfractionIndex | None" = None,
 ) -> dict | None:
     """
     Retrieves an active infraction of the given type for the user.
 
+    If `index` is given and covers `infr_type`, the infraction is looked up in the index instead of the API.
+
     If `send_msg` is True and the user has an active infraction matching the `infr_type` parameter,
     then a message for the moderator will be sent to the context channel letting them know.
     Otherwise, no message will be sent.
     """
     log.trace(f"Checking if {user} has active infractions of type {infr_type}.")
 
-    active_infractions = await ctx.bot.api_client.get(
-        "bot/infractions",
-        params={
-            "active": "true",
-            "type": infr_type,
-            "user__id": str(user.id)
-        }
-    )
-    if active_infractions:
+    if index is not None and index.covers(infr_type):
+        active_infraction = index.get(user.id, infr_type)
+    else:
+        active_infractions = await ctx.bot.api_client.get(
+            "bot/infractions",
+            params={
+                "active": "true",
+                "type": infr_type,
+                "user__id": str(user.id)
+            }
+        )
+        active_infraction = active_infractions[0] if active_infractions else None
+
+    if active_infraction:
         # Checks to see if the moderator should be told there is an active infraction
         if send_msg:
             log.trace(f"{user} has active infractions of type {infr_type}.")
-            await send_active_infraction_message(ctx, active_infractions[0])
-        return active_infractions[0]
+            await send_active_infraction_message(ctx, active_infraction)
+        return active_infraction
     log.trace(f"{user} does not have active infractions of type {infr_type}.")
     return None
 
@@ -388,7 +388,9 @@ class Infractions(InfractionScheduler, commands.Cog):
             await ctx.send(":x: I can't timeout users above or equal to me in the role hierarchy.")
             return
 
-        if active := await _utils.get_active_infraction(ctx, user, "timeout", send_msg=False):
+        if active := await _utils.get_active_infraction(
+            ctx, user, "timeout", send_msg=False, index=self.active_infractions
+        ):
             if active["actor"] != self.bot.user.id:
                 await _utils.send_active_infraction_message(ctx, active)
                 return
@@ -464,7 +466,9 @@ class Infractions(InfractionScheduler, commands.Cog):
 
         # In the case of a permanent ban, we don't need get_active_infractions to tell us if one is active
         is_temporary = kwargs.get("duration_or_expiry") is not None
-        active_infraction = await _utils.get_active_infraction(ctx, user, "ban", is_temporary)
+        active_infraction = await _utils.get_active_infraction(
+            ctx, user, "ban", is_temporary, index=self.active_infractions
+        )
 
         if active_infraction:
             if is_temporary:
@@ -511,7 +515,7 @@ class Infractions(InfractionScheduler, commands.Cog):
     @respect_role_hierarchy(member_arg=2)
     async def apply_voice_mute(self, ctx: Context, user: MemberOrUser, reason: str | None, **kwargs) -> None:
         """Apply a voice mute infraction with kwargs passed to `post_infraction`."""
-        if await _utils.get_active_infraction(ctx, user, "voice_mute"):
+        if await _utils.get_active_infraction(ctx, user, "voice_mute", index=self.active_infractions):
             return
 
         infraction = await _utils.post_infraction(ctx, user, "voice_mute", reason, active=True, **kwargs)
@@ -656,13 +660,16 @@ class Infractions(InfractionScheduler, commands.Cog):
 
         This is needed for users who might have had their infraction edited in our database but not in Discord itself.
         """
-        active_timeouts = await self.bot.api_client.get(
-            endpoint="bot/infractions",
-            params={"active": "true", "type": "timeout", "user__id": member.id}
-        )
+        if self.active_infractions.covers("timeout"):
+            timeout_infraction = self.active_infractions.get(member.id, "timeout")
+        else:
+            active_timeouts = await self.bot.api_client.get(
+                endpoint="bot/infractions",
+                params={"active": "true", "type": "timeout", "user__id": member.id}
+            )
+            timeout_infraction = active_timeouts[0] if active_timeouts else None
 
-        if active_timeouts:
-            timeout_infraction = active_timeouts[0]
+        if timeout_infraction:
             expiry = arrow.get(timeout_infraction["expires_at"], tzinfo=UTC).datetime.replace(second=0, microsecond=0)
 
             if member.is_timed_out() and expiry == member.timed_out_until.replace(second=0, microsecond=0):
@@ -16,6 +16,7 @@ from bot.converters import DurationOrExpiry, Infraction, MemberOrUser, Snowflake
 from bot.decorators import ensure_future_timestamp
 from bot.errors import InvalidInfractionError
 from bot.exts.moderation.infraction import _utils
+from bot.exts.moderation.infraction._scheduler import InfractionScheduler
 from bot.exts.moderation.infraction.infractions import Infractions
 from bot.log import get_logger
 from bot.pagination import LinePaginator
@@ -63,6 +64,13 @@ class ModManagement(commands.Cog):
         """Get currently loaded Infractions cog instance."""
         return self.bot.get_cog("Infractions")
 
+    def _get_scheduler(self, infr_type: str) -> InfractionScheduler | None:
+        """Get the loaded cog which handles infractions of `infr_type`, if there is one."""
+        for cog in self.bot.cogs.values():
+            if isinstance(cog, InfractionScheduler) and infr_type in cog.supported_infractions:
+                return cog
+        return None
+
     @commands.group(name="infraction", aliases=("infr", "infractions", "inf", "i"), invoke_without_command=True)
     async def infraction_group(self, ctx: Context, infraction: Infraction = None) -> None:
         """
@@ -219,6 +227,9 @@ class ModManagement(commands.Cog):
             json=request_data,
         )
 
+        if scheduler := self._get_scheduler(new_infraction["type"]):
+            scheduler.active_infractions.add(new_infraction)
+
         # Get information about the infraction's user
         user_id = new_infraction["user"]
         user = await get_or_fetch_member(ctx.guild, user_id)
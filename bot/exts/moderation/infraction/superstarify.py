@@ -84,18 +84,20 @@ class Superstarify(InfractionScheduler, Cog):
     @Cog.listener()
     async def on_member_join(self, member: Member) -> None:
         """Reapply active superstar infractions for returning members."""
-        active_superstarifies = await self.bot.api_client.get(
-            "bot/infractions",
-            params={
-                "active": "true",
-                "type": "superstar",
-                "user__id": member.id
-            }
-        )
-
-        if active_superstarifies:
-            infraction = active_superstarifies[0]
+        if self.active_infractions.covers("superstar"):
+            infraction = self.active_infractions.get(member.id, "superstar")
+        else:
+            active_superstarifies = await self.bot.api_client.get(
+                "bot/infractions",
+                params={
+                    "active": "true",
+                    "type": "superstar",
+                    "user__id": member.id
+                }
+            )
+            infraction = active_superstarifies[0] if active_superstarifies else None
 
+        if infraction:
             async def action() -> None:
                 await member.edit(
                     nick=self.get_nick(infraction["id"], member.id),
@@ -135,7 +137,7 @@ class Superstarify(InfractionScheduler, Cog):
             await ctx.send(":x: I can't starify users above or equal to me in the role hierarchy.")
             return
 
-        if await _utils.get_active_infraction(ctx, member, "superstar"):
+        if await _utils.get_active_infraction(ctx, member, "superstar", index=self.active_infractions):
             return
 
         # Set to default duration if none was provided.
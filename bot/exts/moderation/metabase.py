@@ -1,15 +1,26 @@
+import codecs
 import csv
 import json
+import textwrap
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
 from datetime import timedelta
-from io import StringIO
-from typing import Literal
+from tempfile import SpooledTemporaryFile
+from typing import Any, Literal
 
 import arrow
+from aiohttp import StreamReader
 from aiohttp.client_exceptions import ClientResponseError
 from arrow import Arrow
 from async_rediscache import RedisCache
 from discord.ext.commands import Cog, Context, group, has_any_role
-from pydis_core.utils.paste_service import PasteFile, PasteTooLongError, PasteUploadError, send_to_paste_service
+from pydis_core.utils.paste_service import (
+    MAX_PASTE_SIZE,
+    PasteFile,
+    PasteTooLongError,
+    PasteUploadError,
+    send_to_paste_service,
+)
 from pydis_core.utils.scheduling import Scheduler
 
 from bot.bot import Bot
@@ -23,6 +34,182 @@ BASE_HEADERS = {
     "Content-Type": "application/json"
 }
 
+# How much of an export is read from metabase at a time.
+CHUNK_SIZE = 64 * 1024
+# How much of the paste is kept in memory before it's spooled to disk.
+PASTE_SPOOL_SIZE = 1024 * 1024
+
+
+class MetabaseExport:
+    """
+    The rows of a question's export, stored column by column to save memory.
+
+    Rows can be iterated over and indexed as dicts, and the values of a single column can be retrieved with `column`.
+    """
+
+    __slots__ = ("_length", "_values", "columns", "truncated")
+
+    def __init__(self, columns: Sequence[str] = ()):
+        self.columns: list[str] = list(columns)
+        self._values: list[list] = [[] for _ in self.columns]
+        self._length = 0
+        # Whether the export exceeds `Metabase.max_export_rows` or `Metabase.max_export_bytes`, so rows weren't read.
+        self.truncated = False
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        return {column: values[index] for column, values in zip(self.columns, self._values, strict=True)}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(self._length):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"<MetabaseExport rows={self._length} columns={self.columns} truncated={self.truncated}>"
+
+    def column(self, name: str) -> list:
+        """Return the values of the column."""
+        return self._values[self.columns.index(name)]
+
+    def append(self, values: Sequence) -> None:
+        """Add a row of values in the order of the columns, filling in any missing values with None."""
+        for index, column_values in enumerate(self._values):
+            column_values.append(values[index] if index < len(values) else None)
+        self._length += 1
+
+    def append_mapping(self, row: Mapping[str, Any]) -> None:
+        """Add a row which maps columns to values, adding any new columns."""
+        for column in row:
+            if column not in self.columns:
+                self.columns.append(column)
+                self._values.append([None] * self._length)
+        self.append([row.get(column) for column in self.columns])
+
+
+class _ExportCache(OrderedDict[int, MetabaseExport]):
+    """Map question IDs to their latest exports, evicting the least recently used export beyond `max_size`."""
+
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def __getitem__(self, question_id: int) -> MetabaseExport:
+        export = super().__getitem__(question_id)
+        self.move_to_end(question_id)
+        return export
+
+    def __setitem__(self, question_id: int, export: MetabaseExport) -> None:
+        super().__setitem__(question_id, export)
+        self.move_to_end(question_id)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+class _PasteBuffer:
+    """
+    Text for the paste service, spooled to a temporary file once it's large.
+
+    Rows are no longer added once they'd push the text over the paste service's size limit.
+    """
+
+    def __init__(self, reserved: int = 0):
+        self.file = SpooledTemporaryFile(max_size=PASTE_SPOOL_SIZE, mode="w+", encoding="utf-8")  # noqa: SIM115
+        self.rows = 0
+        self.full = False
+        self._size = 0
+        # Room left for text written after the rows.
+        self._budget = MAX_PASTE_SIZE - reserved
+
+    def write(self, text: str, *, row: bool = True) -> None:
+        """Write the text, unless it doesn't fit."""
+        if self.full:
+            return
+        size = len(text.encode())
+        if self._size + size > self._budget:
+            self.full = True
+            return
+
+        self.file.write(text)
+        self._size += size
+        self.rows += row
+
+    def read(self) -> str:
+        """Return all the text which was written, and close the file."""
+        with self.file:
+            self.file.seek(0)
+            return self.file.read()
+
+
+async def _iter_text(stream: StreamReader) -> AsyncIterator[str]:
+    """Decode the UTF-8 text of the stream as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in stream.iter_chunked(CHUNK_SIZE):
+        if text := decoder.decode(chunk):
+            yield text
+    if text := decoder.decode(b"", final=True):
+        yield text
+
+
+async def iter_csv_records(stream: StreamReader) -> AsyncIterator[str]:
+    """Yield the text of each CSV record in the stream, which may span several lines if it has quoted newlines."""
+    record = ""
+    quotes = 0
+    async for text in _iter_text(stream):
+        start = 0
+        while end := text.find("\n", start) + 1:
+            line = text[start:end]
+            start = end
+            record += line
+            quotes += line.count('"')
+            # An odd amount of quotes means the record continues in a quoted field on the next line
+            if not quotes % 2:
+                yield record
+                record = ""
+                quotes = 0
+
+        # The rest of the line arrives in the next chunk
+        record += text[start:]
+        quotes += text.count('"', start)
+    if record:
+        yield record
+
+
+async def iter_json_rows(stream: StreamReader) -> AsyncIterator[tuple[Any, int]]:
+    """Yield the items of the JSON array in the stream and the size of their text in bytes, as soon as they arrive."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    opened = False
+    async for text in _iter_text(stream):
+        buffer += text
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                break
+
+            if not opened:
+                if buffer[position] != "[":
+                    raise ValueError("Expected the export to be a JSON array.")
+                opened = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+
+            try:
+                row, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The row hasn't fully arrived yet
+                break
+            yield row, len(buffer[position:end].encode())
+            position = end
+        buffer = buffer[position:]
+
+    raise ValueError(f"The JSON export ended unexpectedly: {buffer[:100]!r}")
+
 
 class Metabase(Cog):
     """Commands for admins to interact with metabase."""
@@ -37,7 +224,8 @@ class Metabase(Cog):
         self.session_expiry: float | None = None  # session_info["session_expiry"]: UtcPosixTimestamp
         self.headers = BASE_HEADERS
 
-        self.exports: dict[int, list[dict]] = {}  # Saves the output of each question, so internal eval can access it
+        # Saves the output of the latest questions, so internal eval can access it
+        self.exports = _ExportCache(MetabaseConfig.max_cached_exports)
 
     async def cog_command_error(self, ctx: Context, error: Exception) -> None:
         """Handle ClientResponseError errors locally to invalidate token if needed."""
@@ -130,17 +318,13 @@ class Metabase(Cog):
         async with self.bot.http_session.post(url, headers=self.headers, raise_for_status=True) as resp:
             if extension == "csv":
                 extension = "text"  # paste site doesn't support csv as a lexer
-                out = await resp.text(encoding="utf-8")
-                # Save the output for use with int e
-                self.exports[question_id] = list(csv.DictReader(StringIO(out)))
-
+                export, paste = await self._read_csv_export(resp.content)
             elif extension == "json":
-                out = await resp.json(encoding="utf-8")
-                # Save the output for use with int e
-                self.exports[question_id] = out
+                export, paste = await self._read_json_export(resp.content)
 
-                # Format it nicely for human eyes
-                out = json.dumps(out, indent=4, sort_keys=True)
+        # Save the output for use with int e
+        self.exports[question_id] = export
+        out = paste.read()
 
         file = PasteFile(content=out, lexer=extension)
         try:
@@ -156,11 +340,61 @@ class Metabase(Cog):
         else:
             message = f":+1: {ctx.author.mention} Here's your link: {resp.link}"
 
+        if export.truncated:
+            message += f"\n:warning: The export was cut off after the first {len(export):,} rows, to fit the limits."
+        if paste.rows < len(export):
+            message += f"\n:warning: The paste only has the first {paste.rows:,} rows, to fit the paste size limit."
+
         await ctx.send(
             f"{message}\nYou can also access this data within internal eval by doing: "
             f"`bot.get_cog('Metabase').exports[{question_id}]`"
         )
 
+    @staticmethod
+    async def _read_csv_export(stream: StreamReader) -> tuple[MetabaseExport, _PasteBuffer]:
+        """Read the rows of a CSV export into an export and a paste, as they arrive."""
+        export = None
+        paste = _PasteBuffer()
+        size = 0
+        async for record in iter_csv_records(stream):
+            values = next(csv.reader([record]), [])
+            if not values:
+                continue
+            if export is None:
+                export = MetabaseExport(values)
+                paste.write(record, row=False)
+                continue
+            size += len(record.encode())
+            if len(export) >= MetabaseConfig.max_export_rows or size > MetabaseConfig.max_export_bytes:
+                export.truncated = True
+                break
+
+            export.append(values)
+            paste.write(record)
+
+        return export or MetabaseExport(), paste
+
+    @staticmethod
+    async def _read_json_export(stream: StreamReader) -> tuple[MetabaseExport, _PasteBuffer]:
+        """Read the rows of a JSON export into an export and a paste, formatted for human eyes, as they arrive."""
+        export = MetabaseExport()
+        paste = _PasteBuffer(reserved=len("\n]"))
+        paste.write("[", row=False)
+        size = 0
+        async for row, row_size in iter_json_rows(stream):
+            size += row_size
+            if len(export) >= MetabaseConfig.max_export_rows or size > MetabaseConfig.max_export_bytes:
+                export.truncated = True
+                break
+
+            export.append_mapping(row)
+            separator = "\n" if paste.rows == 0 else ",\n"
+            paste.write(separator + textwrap.indent(json.dumps(row, indent=4, sort_keys=True), "    "))
+
+        # Write the end directly, since room was reserved for it
+        paste.file.write("\n]" if paste.rows else "]")
+        return export, paste
+
     @metabase_group.command(name="publish", aliases=("share",))
     async def metabase_publish(self, ctx: Context, question_id: int) -> None:
         """Publically shares the given question and posts the link."""
@@ -1,4 +1,3 @@
-import asyncio
 import difflib
 import itertools
 from datetime import UTC, datetime
@@ -41,8 +40,6 @@ class ModLog(Cog, name="ModLog"):
         self.bot = bot
         self._ignored = {event: [] for event in Event}
 
-        self._cached_edits = []
-
     def ignore(self, event: Event, *items: int) -> None:
         """Add event to ignored events to suppress log emission."""
         for item in items:
@@ -630,8 +627,6 @@ class ModLog(Cog, name="ModLog"):
         if self.is_message_blacklisted(msg_before):
             return
 
-        self._cached_edits.append(msg_before.id)
-
         if msg_before.content == msg_after.content:
             return
 
@@ -707,21 +702,31 @@ class ModLog(Cog, name="ModLog"):
         if event.guild_id is None:
             return  # ignore DM edits
 
+        if event.cached_message is not None:
+            # The message is cached, so the normal event is fired for it and logs the edit.
+            self.bot.stats.incr("mod_log.edit_fetches_avoided")
+            return
+
         await self.bot.wait_until_guild_available()
         try:
-            channel = await get_or_fetch_channel(self.bot, int(event.data["channel_id"]))
-            message = await channel.fetch_message(event.message_id)
-        except discord.NotFound:  # Channel/message was deleted before we got the event
+            channel = await get_or_fetch_channel(self.bot, event.channel_id)
+        except discord.NotFound:  # Channel was deleted before we got the event
             return
-
-        if self.is_message_blacklisted(message):
+        if self.is_channel_ignored(channel):
+            self.bot.stats.incr("mod_log.edit_fetches_avoided")
             return
 
-        await asyncio.sleep(1)  # Wait here in case the normal event was fired
+        if "content" in event.data and "author" in event.data:
+            # The payload holds the whole message, which discord.py already parsed, so there's no need to fetch it.
+            message = event.message
+            self.bot.stats.incr("mod_log.edit_fetches_avoided")
+        else:
+            try:
+                message = await channel.fetch_message(event.message_id)
+            except discord.NotFound:  # Message was deleted before we got the event
+                return
 
-        if event.message_id in self._cached_edits:
-            # It was in the cache and the normal event was fired, so we can just ignore it
-            self._cached_edits.remove(event.message_id)
+        if self.is_message_blacklisted(message):
             return
 
         channel = message.channel
@@ -4,6 +4,7 @@ import textwrap
 from abc import abstractmethod
 from collections import defaultdict, deque
 from dataclasses import dataclass
+from io import BytesIO
 from typing import Any
 
 import discord
@@ -28,6 +29,11 @@ log = get_logger(__name__)
 
 URL_RE = re.compile(r"(https?://[^\s]+)")
 
+# Discord's limits on the content, embeds and files of a single message.
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_FILES = 10
+
 
 @dataclass
 class MessageHistory:
@@ -171,6 +177,21 @@ class WatchChannel(metaclass=CogABCMeta):
 
             self.log.trace(f"Received message: {msg.content} ({len(msg.attachments)} attachments)")
             self.message_queue[msg.author.id][msg.channel.id].append(msg)
+            self._record_queue_depth()
+
+    @property
+    def _stats_prefix(self) -> str:
+        return f"watchchannels.{self.__class__.__name__.lower()}"
+
+    def _record_queue_depth(self) -> None:
+        """Report how many messages are waiting to be relayed."""
+        depth = sum(
+            len(channel_queue)
+            for queues in (self.message_queue, self.consumption_queue)
+            for channel_queues in queues.values()
+            for channel_queue in channel_queues.values()
+        )
+        self.bot.stats.gauge(f"{self._stats_prefix}.queue_depth", depth)
 
     async def consume_messages(self, delay_consumption: bool = True) -> None:
         """Consumes the message queues to log watched users' messages."""
@@ -188,13 +209,14 @@ class WatchChannel(metaclass=CogABCMeta):
         for user_id, channel_queues in self.consumption_queue.items():
             for channel_queue in channel_queues.values():
                 while channel_queue:
-                    msg = channel_queue.popleft()
+                    batch = self._take_batch(channel_queue)
 
                     if watch_info := self.watched_users.get(user_id, None):
-                        self.log.trace(f"Consuming message {msg.id} ({len(msg.attachments)} attachments)")
-                        await self.relay_message(msg, watch_info)
+                        self.log.trace(f"Consuming {len(batch)} messages, starting from {batch[0].id}")
+                        await self.relay_messages(batch, watch_info)
                     else:
-                        self.log.trace(f"Not consuming message {msg.id} as user {user_id} is no longer watched.")
+                        self.log.trace(f"Not consuming {len(batch)} messages as user {user_id} is no longer watched.")
+                    self._record_queue_depth()
 
         self.consumption_queue.clear()
 
@@ -204,72 +226,180 @@ class WatchChannel(metaclass=CogABCMeta):
         else:
             self.log.trace("Done consuming messages.")
 
+    @staticmethod
+    def _take_batch(channel_queue: deque[Message]) -> list[Message]:
+        """
+        Take the next messages to relay together from a queue of messages of the same author and channel.
+
+        A batch ends with the first message which has attachments, or after as many messages as are shown under
+        a single header, so that a failed relay loses no more than that.
+        """
+        batch = []
+        while channel_queue and len(batch) < BigBrotherConfig.header_message_limit:
+            msg = channel_queue.popleft()
+            batch.append(msg)
+            if msg.attachments:
+                break
+        return batch
+
     async def webhook_send(
         self,
         content: str | None = None,
         username: str | None = None,
         avatar_url: str | None = None,
         embed: Embed | None = None,
+        *,
+        embeds: list[Embed] | None = None,
+        files: list[discord.File] | None = None,
     ) -> None:
-        """Sends a message to the webhook with the specified kwargs."""
+        """
+        Sends a message to the webhook with the specified kwargs.
+
+        Sends are made one at a time by the consumption task, and discord.py waits out the webhook's rate limit
+        bucket before each of them, so a burst of messages is paced rather than rejected.
+        """
         username = messages.sub_clyde(username)
+        kwargs = {}
+        if embed is not None:
+            kwargs["embed"] = embed
+        if embeds:
+            kwargs["embeds"] = embeds
+        if files:
+            kwargs["files"] = files
         try:
-            await self.webhook.send(content=content, username=username, avatar_url=avatar_url, embed=embed)
+            await self.webhook.send(content=content, username=username, avatar_url=avatar_url, **kwargs)
         except discord.HTTPException as exc:
             self.log.exception(
                 "Failed to send a message to the webhook",
                 exc_info=exc
             )
 
-    async def relay_message(self, msg: Message, watch_info: dict) -> None:
-        """Relays the message to the relevant watch channel."""
-        limit = BigBrotherConfig.header_message_limit
-
-        if (
-            msg.author.id != self.message_history.last_author
-            or msg.channel.id != self.message_history.last_channel
-            or self.message_history.message_count >= limit
-        ):
-            self.message_history = MessageHistory(last_author=msg.author.id, last_channel=msg.channel.id)
+    async def relay_messages(self, batch: list[Message], watch_info: dict) -> None:
+        """
+        Relays the messages of a single author and channel to the relevant watch channel.
 
-            await self.send_header(msg, watch_info)
+        The contents of consecutive messages are packed into as few webhook messages as the content limit allows,
+        and their attachments are relayed right after the message they belong to.
+        """
+        limit = BigBrotherConfig.header_message_limit
+        author = batch[0].author
+        pending: list[Message] = []
+        pending_content: list[str] = []
 
+        async def flush() -> None:
+            if pending_content:
+                await self.webhook_send(
+                    "\n".join(pending_content),
+                    username=author.display_name,
+                    avatar_url=author.display_avatar.url
+                )
+            self._record_relay_lag(pending)
+            pending.clear()
+            pending_content.clear()
+
+        for msg in batch:
+            if (
+                msg.author.id != self.message_history.last_author
+                or msg.channel.id != self.message_history.last_channel
+                or self.message_history.message_count >= limit
+            ):
+                await flush()
+                self.message_history = MessageHistory(last_author=msg.author.id, last_channel=msg.channel.id)
+
+                await self.send_header(msg, watch_info)
+
+            if cleaned_content := self.clean_content(msg):
+                if len("\n".join([*pending_content, cleaned_content])) > MAX_CONTENT_LENGTH:
+                    await flush()
+                pending_content.append(cleaned_content)
+            pending.append(msg)
+
+            if msg.attachments:
+                await flush()
+                await self.relay_attachments(msg)
+
+            self.message_history.message_count += 1
+
+        await flush()
+
+    @staticmethod
+    def clean_content(msg: Message) -> str:
+        """Return the content of the message to relay, with tokens censored and non-media URLs not embedded."""
         if DiscordTokenFilter.find_token_in_message(msg.content) or WEBHOOK_URL_RE.search(msg.content):
-            cleaned_content = "Content is censored because it contains a bot or webhook token."
-        elif cleaned_content := msg.clean_content:
+            return "Content is censored because it contains a bot or webhook token."
+
+        cleaned_content = msg.clean_content
+        if cleaned_content:
             # Put all non-media URLs in a code block to prevent embeds
             media_urls = {embed.url for embed in msg.embeds if embed.type in ("image", "video")}
             for url in URL_RE.findall(cleaned_content):
                 if url not in media_urls:
                     cleaned_content = cleaned_content.replace(url, f"`{url}`")
+        return cleaned_content
 
-        if cleaned_content:
+    async def relay_attachments(self, msg: Message) -> None:
+        """
+        Re-upload the attachments of the message to the webhook.
+
+        The attachments are downloaded concurrently, and packed into as few messages as the upload limit allows.
+        Attachments which are too large to upload are linked instead.
+        """
+        size_limit = self.webhook.guild.filesize_limit - 512
+        uploadable = [attachment for attachment in msg.attachments if attachment.size <= size_limit]
+        large = [attachment for attachment in msg.attachments if attachment.size > size_limit]
+
+        downloads = await asyncio.gather(*(attachment.read() for attachment in uploadable), return_exceptions=True)
+
+        uploads: list[list[discord.File]] = []
+        upload_size = 0
+        unavailable = False
+        for attachment, download in zip(uploadable, downloads, strict=True):
+            if isinstance(download, errors.Forbidden | errors.NotFound):
+                unavailable = True
+                continue
+            if isinstance(download, discord.HTTPException):
+                self.log.exception("Failed to download an attachment to relay", exc_info=download)
+                continue
+            if isinstance(download, BaseException):
+                raise download
+
+            if not uploads or len(uploads[-1]) >= MAX_FILES or upload_size + len(download) > size_limit:
+                uploads.append([])
+                upload_size = 0
+            uploads[-1].append(discord.File(BytesIO(download), filename=attachment.filename))
+            upload_size += len(download)
+
+        embeds = []
+        if large:
+            embed = Embed(description="\n".join(f"[{attachment.filename}]({attachment.url})" for attachment in large))
+            embed.set_footer(text="Attachments exceed upload size limit.")
+            embeds.append(embed)
+        if unavailable:
+            embeds.append(Embed(
+                description=":x: **This message contained an attachment, but it could not be retrieved**",
+                color=Color.red()
+            ))
+
+        for index, files in enumerate(uploads):
+            is_last = index == len(uploads) - 1
             await self.webhook_send(
-                cleaned_content,
                 username=msg.author.display_name,
-                avatar_url=msg.author.display_avatar.url
+                avatar_url=msg.author.display_avatar.url,
+                embeds=embeds[:MAX_EMBEDS] if is_last else None,
+                files=files,
+            )
+        if embeds and not uploads:
+            await self.webhook_send(
+                username=msg.author.display_name,
+                avatar_url=msg.author.display_avatar.url,
+                embeds=embeds,
             )
 
-        if msg.attachments:
-            try:
-                await messages.send_attachments(msg, self.webhook)
-            except (errors.Forbidden, errors.NotFound):
-                e = Embed(
-                    description=":x: **This message contained an attachment, but it could not be retrieved**",
-                    color=Color.red()
-                )
-                await self.webhook_send(
-                    embed=e,
-                    username=msg.author.display_name,
-                    avatar_url=msg.author.display_avatar.url
-                )
-            except discord.HTTPException as exc:
-                self.log.exception(
-                    "Failed to send an attachment to the webhook",
-                    exc_info=exc
-                )
-
-        self.message_history.message_count += 1
+    def _record_relay_lag(self, relayed: list[Message]) -> None:
+        """Report how long after they were sent the messages were relayed."""
+        now = discord.utils.utcnow()
+        for msg in relayed:
+            self.bot.stats.timing(f"{self._stats_prefix}.relay_lag", (now - msg.created_at).total_seconds() * 1000)
 
     async def send_header(self, msg: Message, watch_info: dict) -> None:
         """Sends a header embed with information about the relayed messages to the watch channel."""
@@ -5,7 +5,16 @@ from io import StringIO
 
 import discord
 from async_rediscache import RedisCache
-from discord import Color, Embed, Member, PartialMessage, RawReactionActionEvent, User, app_commands
+from discord import (
+    Color,
+    Embed,
+    Member,
+    PartialMessage,
+    RawMessageDeleteEvent,
+    RawReactionActionEvent,
+    User,
+    app_commands,
+)
 from discord.ext import commands, tasks
 from discord.ext.commands import BadArgument, Cog, Context, group, has_any_role
 from pydis_core.site_api import ResponseCodeError
@@ -839,11 +848,15 @@ class TalentPool(Cog, name="Talentpool"):
         """
         Watch for reactions in the #nomination-voting channel to automate it.
 
-        Adding an incident reaction will archive the message.
+        Adding an incident reaction will archive the message, and a ticket reaction will mark the review as ticketed.
         """
         if payload.channel_id != Channels.nomination_voting:
             return
 
+        if str(payload.emoji) == "\N{TICKET}":
+            await self.reviewer.mark_review_ticketed(payload.message_id)
+            return
+
         if payload.user_id == self.bot.user.id:
             return
 
@@ -854,6 +867,24 @@ class TalentPool(Cog, name="Talentpool"):
             log.info(f"Archiving nomination {message.id}")
             await self.reviewer.archive_vote(message, emoji == Emojis.incident_actioned)
 
+    @Cog.listener()
+    async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
+        """Mark reviews in the #nomination-voting channel as not ticketed when a ticket reaction is removed."""
+        if payload.channel_id != Channels.nomination_voting:
+            return
+
+        if str(payload.emoji) == "\N{TICKET}":
+            message = self.bot.get_channel(payload.channel_id).get_partial_message(payload.message_id)
+            await self.reviewer.unmark_review_ticketed(message)
+
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+        """Stop tracking reviews which are deleted from the #nomination-voting channel."""
+        if payload.channel_id != Channels.nomination_voting:
+            return
+
+        await self.reviewer.forget_review(payload.message_id)
+
     async def end_nomination(self, user_id: int, reason: str) -> bool:
         """End the active nomination of a user with the given reason and return True on success."""
         active_nominations = await self.api.get_nominations(user_id, active=True)
@@ -39,6 +39,8 @@ MIN_REVIEW_INTERVAL = timedelta(days=1)
 MIN_NOMINATION_TIME = timedelta(days=7)
 # Number of days ago that the user must have activity since
 RECENT_ACTIVITY_DAYS = 7
+# Time between checks of the tracked reviews against the history of the voting channel
+RECONCILE_INTERVAL = timedelta(days=1)
 
 # A constant for weighting number of nomination entries against nomination age when selecting a user to review.
 # The higher this is, the lower the effect of review age. At 1, age and number of entries are weighted equally.
@@ -56,9 +58,14 @@ class Reviewer:
 
     # RedisCache[
     #    "last_vote_date": float   | POSIX UTC timestamp.
+    #    "last_reconcile_date": float   | POSIX UTC timestamp.
     # ]
     status_cache = RedisCache()
 
+    # RedisCache[message_id: int, is_ticketed: bool]
+    # Contains the ID of each review in the voting channel, and whether it has a ticket reaction.
+    review_cache = RedisCache()
+
     def __init__(self, bot: Bot, nomination_api: NominationAPI):
         self.bot = bot
         self.api = nomination_api
@@ -86,9 +93,10 @@ class Reviewer:
         The criteria for this are:
          - The current number of reviews is lower than `MAX_ONGOING_REVIEWS`.
          - The most recent review was sent less than `MIN_REVIEW_INTERVAL` ago.
-        """
-        voting_channel = self.bot.get_channel(Channels.nomination_voting)
 
+        The reviews are counted from `review_cache`, which is only checked against the voting channel
+        once every `RECONCILE_INTERVAL`.
+        """
         last_vote_timestamp = await self.status_cache.get("last_vote_date")
         if last_vote_timestamp:
             last_vote_date = datetime.fromtimestamp(last_vote_timestamp, tz=UTC)
@@ -100,9 +108,36 @@ class Reviewer:
         else:
             log.info("Date of last vote not found in cache, a vote may be sent early")
 
-        ongoing_count = 0
-        total_count = 0
+        last_reconcile_timestamp = await self.status_cache.get("last_reconcile_date")
+        if (
+            not last_reconcile_timestamp
+            or datetime.now(UTC) - datetime.fromtimestamp(last_reconcile_timestamp, tz=UTC) >= RECONCILE_INTERVAL
+        ):
+            await self.reconcile_reviews()
+
+        reviews = await self.review_cache.to_dict()
+        total_count = len(reviews)
+        ongoing_count = sum(not is_ticketed for is_ticketed in reviews.values())
+
+        if ongoing_count >= MAX_ONGOING_REVIEWS or total_count >= MAX_TOTAL_REVIEWS:
+            log.debug(
+                "There are %s ongoing and %s total reviews, above thresholds of %s and %s",
+                ongoing_count, total_count,
+                MAX_ONGOING_REVIEWS, MAX_TOTAL_REVIEWS
+            )
+            return False
+
+        return True
+
+    async def reconcile_reviews(self) -> None:
+        """
+        Replace the tracked reviews with the reviews found in the history of the voting channel.
 
+        This corrects the tracked reviews for any reaction or deletion events which were missed.
+        """
+        voting_channel = self.bot.get_channel(Channels.nomination_voting)
+
+        reviews = {}
         async for msg in voting_channel.history():
             # Try and filter out any non-review messages. We also only want to count
             # one message from reviews split over multiple messages. We use fixed text
@@ -110,25 +145,31 @@ class Reviewer:
             if not msg.author.bot or "for Helper!" not in msg.content:
                 continue
 
-            total_count += 1
+            reviews[msg.id] = any(reaction.emoji == "\N{TICKET}" for reaction in msg.reactions)
 
-            is_ticketed = False
-            for reaction in msg.reactions:
-                if reaction.emoji == "\N{TICKET}":
-                    is_ticketed = True
+        log.debug(f"Reconciled the tracked reviews with {len(reviews)} reviews in the voting channel")
+        await self.review_cache.clear()
+        if reviews:
+            await self.review_cache.update(reviews)
+        await self.status_cache.set("last_reconcile_date", datetime.now(UTC).timestamp())
 
-            if not is_ticketed:
-                ongoing_count += 1
+    async def mark_review_ticketed(self, message_id: int) -> None:
+        """Mark the review with the given message ID as ticketed, if it's a tracked review."""
+        if await self.review_cache.contains(message_id):
+            await self.review_cache.set(message_id, True)
 
-            if ongoing_count >= MAX_ONGOING_REVIEWS or total_count >= MAX_TOTAL_REVIEWS:
-                log.debug(
-                    "There are %s ongoing and %s total reviews, above thresholds of %s and %s",
-                    ongoing_count, total_count,
-                    MAX_ONGOING_REVIEWS, MAX_TOTAL_REVIEWS
-                )
-                return False
+    async def unmark_review_ticketed(self, message: PartialMessage) -> None:
+        """Mark the review in the message as not ticketed, if it's a tracked review without ticket reactions left."""
+        if not await self.review_cache.contains(message.id):
+            return
 
-        return True
+        message = await message.fetch()
+        if not any(reaction.emoji == "\N{TICKET}" for reaction in message.reactions):
+            await self.review_cache.set(message.id, False)
+
+    async def forget_review(self, message_id: int) -> None:
+        """Stop tracking the review with the given message ID, if it's a tracked review."""
+        await self.review_cache.delete(message_id)
 
     @staticmethod
     def is_nomination_old_enough(nomination: Nomination, now: datetime) -> bool:
@@ -237,6 +278,7 @@ class Reviewer:
 
         log.info(f"Posting the review of {nominee} ({nominee.id})")
         vote_message = await channel.send(review)
+        await self.review_cache.set(vote_message.id, False)
 
         if reviewed_emoji:
             for reaction in (reviewed_emoji, "\N{THUMBS UP SIGN}", "\N{THUMBS DOWN SIGN}"):
@@ -379,6 +421,7 @@ class Reviewer:
         ))
 
         await message.delete()
+        await self.forget_review(message.id)
 
         if nomination_thread:
             with contextlib.suppress(NotFound):
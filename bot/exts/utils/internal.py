@@ -261,6 +261,23 @@ async def func():  # (None,) -> Any
 
         await ctx.send(embed=stats_embed)
 
+    @internal_group.command(name="timers", aliases=("scheduled",))
+    @has_any_role(Roles.admins, Roles.owners, Roles.core_developers)
+    async def timers(self, ctx: Context) -> None:
+        """Show how many coroutines are waiting to be run in each namespace of the timer service."""
+        counts = self.bot.timers.pending_counts()
+
+        embed = discord.Embed(
+            title="Scheduled timers",
+            description=f"{counts.total():,} waiting, {self.bot.timers.running:,} running.",
+            color=discord.Color.og_blurple()
+        )
+
+        for namespace, count in counts.most_common(25):
+            embed.add_field(name=namespace, value=f"{count:,}", inline=True)
+
+        await ctx.send(embed=embed)
+
 
 async def setup(bot: Bot) -> None:
     """Load the Internal cog."""
@@ -1,6 +1,8 @@
+import asyncio
 import random
 import textwrap
 import typing as t
+from collections.abc import Mapping
 from datetime import UTC, datetime
 from operator import itemgetter
 
@@ -11,7 +13,6 @@ from discord.ext.commands import Cog, Context, Greedy, group
 from pydis_core.site_api import ResponseCodeError
 from pydis_core.utils import scheduling
 from pydis_core.utils.members import get_or_fetch_member
-from pydis_core.utils.scheduling import Scheduler
 
 from bot.bot import Bot
 from bot.constants import (
@@ -20,6 +21,7 @@ from bot.constants import (
     Icons,
     MODERATION_ROLES,
     NEGATIVE_REPLIES,
+    OverdueReminders,
     POSITIVE_REPLIES,
     Roles,
     STAFF_PARTNERS_COMMUNITY_ROLES,
@@ -38,6 +40,8 @@ log = get_logger(__name__)
 LOCK_NAMESPACE = "reminder"
 WHITELISTED_CHANNELS = Guild.reminder_whitelist
 MAXIMUM_REMINDERS = 5
+# The most members which are requested from the gateway at once.
+MEMBER_QUERY_LIMIT = 100
 REMINDER_EDIT_CONFIRMATION_TIMEOUT = 60
 
 Mentionable = discord.Member | discord.Role
@@ -80,11 +84,18 @@ class Reminders(Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
-        self.scheduler = Scheduler(self.__class__.__name__)
+        self.scheduler = bot.timers.scheduler(self.__class__.__name__)
+        # Reminders which became due while the bot was down and weren't sent yet, ordered by their expiration.
+        self._overdue: dict[int, dict] = {}
+        # Overdue reminders which were sent, and are waiting to be deleted from the site.
+        self._claimed: set[int] = set()
+        self._catch_up_task: asyncio.Task | None = None
 
     async def cog_unload(self) -> None:
         """Cancel scheduled tasks."""
         self.scheduler.cancel_all()
+        if self._catch_up_task is not None:
+            self._catch_up_task.cancel()
 
     async def cog_load(self) -> None:
         """Get all current reminders from the API and reschedule them."""
@@ -96,19 +107,97 @@ class Reminders(Cog):
 
         now = datetime.now(UTC)
 
-        for reminder in response:
+        for reminder in sorted(response, key=itemgetter("expiration")):
             is_valid, *_ = self.ensure_valid_reminder(reminder)
             if not is_valid:
                 continue
 
-            remind_at = isoparse(reminder["expiration"])
-
-            # If the reminder is already overdue ...
-            if remind_at < now:
-                await self.send_reminder(reminder, remind_at)
+            # If the reminder is already overdue, it's sent in the background so the cog can finish loading.
+            if isoparse(reminder["expiration"]) < now:
+                self._overdue[reminder["id"]] = reminder
             else:
                 self.schedule_reminder(reminder)
 
+        if self._overdue:
+            self._catch_up_task = scheduling.create_task(
+                self._send_overdue_reminders(), name="Overdue reminders catch-up"
+            )
+
+    async def _send_overdue_reminders(self) -> None:
+        """
+        Send the overdue reminders, oldest first, with up to `OverdueReminders.concurrency` of them sent at once.
+
+        The mentions of all the reminders are resolved up front, and the sent reminders are deleted in batches.
+        """
+        log.info(f"Sending {len(self._overdue)} overdue reminders.")
+        self.bot.stats.gauge("reminders.overdue", len(self._overdue))
+        mentionables = await self._resolve_mentionables(
+            {mention_id for reminder in self._overdue.values() for mention_id in reminder["mentions"]}
+        )
+        sent = []
+
+        async def worker() -> None:
+            while self._overdue:
+                reminder = self._overdue.pop(next(iter(self._overdue)))
+                try:
+                    if not await self.send_reminder(
+                        reminder, isoparse(reminder["expiration"]), mentionables=mentionables, delete=False
+                    ):
+                        continue
+                except LockedResourceError:
+                    # The reminder is being edited or deleted, which takes care of it.
+                    continue
+                except Exception:
+                    log.exception(f"Failed to send overdue reminder #{reminder['id']}.")
+                    continue
+
+                self._claimed.add(reminder["id"])
+                sent.append(reminder["id"])
+                if len(sent) >= OverdueReminders.delete_batch_size:
+                    batch = sent.copy()
+                    sent.clear()
+                    await self._delete_reminders(batch)
+
+        await asyncio.gather(*(worker() for _ in range(min(OverdueReminders.concurrency, len(self._overdue)))))
+        await self._delete_reminders(sent)
+        log.info("Done sending overdue reminders.")
+
+    async def _resolve_mentionables(self, mention_ids: set[int]) -> dict[int, Mentionable]:
+        """Resolve the Role and Member ids, requesting the members which aren't cached in bulk."""
+        guild = self.bot.get_guild(Guild.id)
+        mentionables = {}
+        missing = []
+        for mention_id in mention_ids:
+            if mentionable := (guild.get_member(mention_id) or guild.get_role(mention_id)):
+                mentionables[mention_id] = mentionable
+            else:
+                missing.append(mention_id)
+
+        for start in range(0, len(missing), MEMBER_QUERY_LIMIT):
+            chunk = missing[start:start + MEMBER_QUERY_LIMIT]
+            try:
+                members = await guild.query_members(user_ids=chunk, limit=len(chunk))
+            except TimeoutError:
+                log.warning(f"Timed out requesting {len(chunk)} mentioned members, their mentions will be skipped.")
+                continue
+            mentionables.update((member.id, member) for member in members)
+
+        return mentionables
+
+    async def _delete_reminders(self, reminder_ids: list[int]) -> None:
+        """Delete the sent reminders from the site, sending the requests of the whole batch at once."""
+        if not reminder_ids:
+            return
+        log.debug(f"Deleting {len(reminder_ids)} reminders (the users have been reminded).")
+        results = await asyncio.gather(
+            *(self.bot.api_client.delete(f"bot/reminders/{reminder_id}") for reminder_id in reminder_ids),
+            return_exceptions=True
+        )
+        for reminder_id, result in zip(reminder_ids, results, strict=True):
+            if isinstance(result, Exception):
+                log.error(f"Failed to delete reminder #{reminder_id}: {result!r}")
+        self._claimed.difference_update(reminder_ids)
+
     def ensure_valid_reminder(self, reminder: dict) -> tuple[bool, discord.TextChannel]:
         """Ensure reminder channel can be fetched otherwise delete the reminder."""
         channel = self.bot.get_channel(reminder["channel_id"])
@@ -202,18 +291,31 @@ class Reminders(Cog):
     async def _reschedule_reminder(self, reminder: dict) -> None:
         """Reschedule a reminder object."""
         log.trace(f"Cancelling old task #{reminder['id']}")
-        self.scheduler.cancel(reminder["id"])
+        if self._overdue.pop(reminder["id"], None) is None:
+            self.scheduler.cancel(reminder["id"])
 
         log.trace(f"Scheduling new task #{reminder['id']}")
         self.schedule_reminder(reminder)
 
     @lock_arg(LOCK_NAMESPACE, "reminder", itemgetter("id"), raise_error=True)
-    async def send_reminder(self, reminder: dict, expected_time: time.Timestamp | None = None) -> None:
-        """Send the reminder."""
+    async def send_reminder(
+        self,
+        reminder: dict,
+        expected_time: time.Timestamp | None = None,
+        *,
+        mentionables: Mapping[int, Mentionable] | None = None,
+        delete: bool = True,
+    ) -> bool:
+        """
+        Send the reminder, and delete it from the site if `delete` is True.
+
+        If `mentionables` is given, the mentions are looked up in it instead of being fetched.
+        Return whether the reminder was sent.
+        """
         is_valid, channel = self.ensure_valid_reminder(reminder)
         if not is_valid:
             # No need to cancel the task too; it'll simply be done once this coroutine returns.
-            return
+            return False
         embed = discord.Embed()
         if expected_time:
             embed.colour = discord.Colour.red()
@@ -232,9 +334,14 @@ class Reminders(Cog):
         embed.description = f"Here's your reminder: {reminder['content']}"
 
         # Here the jump URL is in the format of base_url/guild_id/channel_id/message_id
-        additional_mentions = " ".join([
-            mentionable.mention async for mentionable in self.get_mentionables(reminder["mentions"])
-        ])
+        if mentionables is None:
+            additional_mentions = " ".join([
+                mentionable.mention async for mentionable in self.get_mentionables(reminder["mentions"])
+            ])
+        else:
+            additional_mentions = " ".join(
+                mentionables[mention_id].mention for mention_id in reminder["mentions"] if mention_id in mentionables
+            )
 
         jump_url = reminder.get("jump_url")
         embed.description += f"\n[Jump back to when you created the reminder]({jump_url})"
@@ -248,8 +355,10 @@ class Reminders(Cog):
             )
             await channel.send(content=f"<@{reminder['author']}> {additional_mentions}", embed=embed)
 
-        log.debug(f"Deleting reminder #{reminder['id']} (the user has been reminded).")
-        await self.bot.api_client.delete(f"bot/reminders/{reminder['id']}")
+        if delete:
+            log.debug(f"Deleting reminder #{reminder['id']} (the user has been reminded).")
+            await self.bot.api_client.delete(f"bot/reminders/{reminder['id']}")
+        return True
 
     @staticmethod
     async def try_get_content_from_reply(ctx: Context) -> str:
@@ -486,6 +595,9 @@ class Reminders(Cog):
     @lock_arg(LOCK_NAMESPACE, "id_", raise_error=True)
     async def edit_reminder(self, ctx: Context, id_: int, payload: dict, message: str = "") -> None:
         """Edits a reminder with the given payload, then sends a confirmation message."""
+        if id_ in self._claimed:
+            await send_denial(ctx, "That reminder has already been sent.")
+            return
         if not await self._can_modify(ctx, id_):
             return
         reminder = await self._edit_reminder(id_, payload)
@@ -501,11 +613,13 @@ class Reminders(Cog):
     @lock_arg(LOCK_NAMESPACE, "id_", raise_error=True)
     async def _delete_reminder(self, ctx: Context, id_: int) -> bool:
         """Acquires a lock on `id_` and returns `True` if reminder is deleted, otherwise `False`."""
-        if not await self._can_modify(ctx, id_, send_on_denial=False):
+        # A sent reminder is deleted along with the other sent overdue reminders.
+        if id_ in self._claimed or not await self._can_modify(ctx, id_, send_on_denial=False):
             return False
 
         await self.bot.api_client.delete(f"bot/reminders/{id_}")
-        self.scheduler.cancel(id_)
+        if self._overdue.pop(id_, None) is None:
+            self.scheduler.cancel(id_)
         return True
 
     @remind_group.command("delete", aliases=("remove", "cancel"))
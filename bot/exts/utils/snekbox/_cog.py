@@ -19,6 +19,7 @@ from bot.constants import BaseURLs, Channels, Emojis, MODERATION_ROLES, Roles, U
 from bot.decorators import redirect_output
 from bot.exts.filtering._filter_lists.extension import TXT_LIKE_FILES
 from bot.exts.help_channels._channel import is_help_forum_post
+from bot.exts.utils.snekbox._dispatch import JobDispatcher
 from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
 from bot.exts.utils.snekbox._io import FileAttachment
 from bot.log import get_logger
@@ -172,6 +173,7 @@ class Snekbox(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.jobs = {}
+        self.dispatcher = JobDispatcher(bot, self._request_eval)
 
     def build_python_version_switcher_view(
         self,
@@ -193,7 +195,15 @@ class Snekbox(Cog):
 
         return view
 
-    async def post_job(self, job: EvalJob) -> EvalResult:
+    async def post_job(self, job: EvalJob, *, user_id: int | None = None) -> EvalResult:
+        """
+        Evaluate the job through the job dispatcher and return the results.
+
+        `user_id` is who the job is run for, so that the dispatcher can take turns between users when snekbox is busy.
+        """
+        return await self.dispatcher.submit(job, user_id)
+
+    async def _request_eval(self, job: EvalJob) -> EvalResult:
         """Send a POST request to the Snekbox API to evaluate code and return the results."""
         data = job.to_dict()
 
@@ -383,7 +393,7 @@ class Snekbox(Cog):
         Return the bot response.
         """
         async with ctx.typing():
-            result = await self.post_job(job)
+            result = await self.post_job(job, user_id=ctx.author.id)
             # Collect stats of job fails + successes
             if result.returncode != 0:
                 self.bot.stats.incr("snekbox.python.fail")
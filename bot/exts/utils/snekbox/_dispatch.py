@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING
+
+from bot.constants import SnekboxJobs
+from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
+from bot.log import get_logger
+from bot.utils.caching import AsyncTTLCache
+
+if TYPE_CHECKING:
+    from bot.bot import Bot
+
+log = get_logger(__name__)
+
+
+def job_key(job: EvalJob) -> str:
+    """Return a key identifying the job by everything that's sent to snekbox: its code, version and args."""
+    payload = json.dumps(job.to_dict(), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def is_reusable(result: EvalResult) -> bool:
+    """
+    Return whether the result can be reused for identical jobs.
+
+    Only results of processes which exited by themselves are reused. Results of processes killed by a signal,
+    for example for exceeding the time or memory limit, and of failed evaluations may not be reproducible.
+    Results with files are too large to keep around.
+    """
+    return result.returncode is not None and 0 <= result.returncode < 128 and not result.has_files
+
+
+@dataclass(slots=True)
+class _VersionQueue:
+    """The jobs running and waiting to run on a single Python version."""
+
+    running: int = 0
+    # Maps a user to their waiting jobs. Users are served in turns, in the order of the dict.
+    waiting: dict[Hashable, deque[asyncio.Future[None]]] = field(default_factory=dict)
+
+
+class JobDispatcher:
+    """
+    Run eval jobs through `execute`, with at most `SnekboxJobs.concurrency` jobs running per Python version.
+
+    Once a version is at capacity, jobs wait in a queue where users take turns, so that a user submitting
+    many jobs doesn't hold up everyone else. Identical jobs submitted while one is running share its result,
+    and reusable results are cached for `SnekboxJobs.result_ttl` seconds.
+
+    The time jobs spend waiting and executing are sent as the `snekbox.queue_wait` and `snekbox.exec_time` stats,
+    and reused results are counted by `snekbox.results.reused`.
+    """
+
+    def __init__(self, bot: Bot, execute: Callable[[EvalJob], Awaitable[EvalResult]]):
+        self.bot = bot
+        self._execute = execute
+        self._queues: defaultdict[str, _VersionQueue] = defaultdict(_VersionQueue)
+        self._results: AsyncTTLCache[str, EvalResult] = AsyncTTLCache(
+            SnekboxJobs.result_cache_size,
+            SnekboxJobs.result_ttl,
+        )
+
+    def waiting(self, version: str) -> int:
+        """Return how many jobs are waiting for a free slot on the version."""
+        return sum(len(waiters) for waiters in self._queues[version].waiting.values())
+
+    def running(self, version: str) -> int:
+        """Return how many jobs are running on the version."""
+        return self._queues[version].running
+
+    async def submit(self, job: EvalJob, user_id: Hashable = None) -> EvalResult:
+        """Run the job for the user once it's their turn, or reuse the result of an identical job."""
+        key = job_key(job)
+        if key in self._results:
+            self.bot.stats.incr("snekbox.results.reused")
+        result = await self._results.get_or_fetch(key, partial(self._run, job, user_id))
+        if not is_reusable(result):
+            self._results.pop(key)
+        return result
+
+    async def _run(self, job: EvalJob, user_id: Hashable) -> EvalResult:
+        """Wait for a free slot on the job's version, and execute the job."""
+        submitted = time.perf_counter()
+        await self._acquire(job.version, user_id)
+        started = time.perf_counter()
+        self.bot.stats.timing("snekbox.queue_wait", (started - submitted) * 1000)
+        try:
+            return await self._execute(job)
+        finally:
+            self.bot.stats.timing("snekbox.exec_time", (time.perf_counter() - started) * 1000)
+            self._release(job.version)
+
+    async def _acquire(self, version: str, user_id: Hashable) -> None:
+        """Take a slot on the version, waiting for the user's turn if the version is at capacity."""
+        queue = self._queues[version]
+        if queue.running < SnekboxJobs.concurrency and not queue.waiting:
+            queue.running += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        queue.waiting.setdefault(user_id, deque()).append(future)
+        log.trace(f"Queued a {version} job for {user_id}, {self.waiting(version)} waiting.")
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over right before the job was cancelled.
+                self._release(version)
+            else:
+                waiters = queue.waiting.get(user_id)
+                if waiters is not None and future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del queue.waiting[user_id]
+            raise
+
+    def _release(self, version: str) -> None:
+        """Hand the slot over to the next user's oldest waiting job, or free it if nothing is waiting."""
+        queue = self._queues[version]
+        while queue.waiting:
+            user_id = next(iter(queue.waiting))
+            waiters = queue.waiting.pop(user_id)
+            future = waiters.popleft()
+            if waiters:
+                # Send the user to the back of the line.
+                queue.waiting[user_id] = waiters
+            if not future.done():
+                future.set_result(None)
+                return
+        queue.running -= 1
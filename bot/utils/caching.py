@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+import bot
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    A size-bounded cache whose entries expire a set number of seconds after they were stored.
+
+    Once the cache is full, the least recently used entry is evicted to make room for a new one.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        # Maps a key to the monotonic time at which it expires, and its value.
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        """Return the value of the key if it's cached and hasn't expired, otherwise return `default`."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store the value under the key, expiring after `ttl` seconds, or the cache's default TTL if not given."""
+        ttl = self.ttl if ttl is None else ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: Any = None) -> V | Any:
+        """Remove the key from the cache and return its value, or `default` if it's not cached."""
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self._entries.clear()
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AsyncTTLCache(TTLCache[K, V]):
+    """
+    A TTL cache for the results of coroutines, which coalesces concurrent lookups of the same key.
+
+    While a key is being fetched, any other lookup of that key waits for the same fetch instead of starting its own.
+    Exceptions raised by the fetch are propagated to every waiter, and are not cached.
+
+    If a `stats_prefix` is given, every lookup is counted as a `hit`, `miss` or `coalesced` under that prefix.
+    """
+
+    def __init__(self, max_size: int, ttl: float, *, stats_prefix: str | None = None):
+        super().__init__(max_size, ttl)
+        self.stats_prefix = stats_prefix
+        self._in_flight: dict[K, asyncio.Task] = {}
+
+    async def get_or_fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        """Return the cached value of the key, or await `fetch` to get it and cache the result."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self._record("hit")
+            return value
+
+        if task := self._in_flight.get(key):
+            self._record("coalesced")
+        else:
+            self._record("miss")
+            task = asyncio.ensure_future(fetch())
+            task.add_done_callback(lambda done_task: self._store_result(key, done_task))
+            self._in_flight[key] = task
+
+        # Shielded so that a cancelled waiter doesn't cancel the fetch for every other waiter.
+        return await asyncio.shield(task)
+
+    def _store_result(self, key: K, task: asyncio.Task) -> None:
+        """Cache the result of a finished fetch, unless it failed."""
+        self._in_flight.pop(key, None)
+        if task.cancelled():
+            return
+        if exception := task.exception():
+            log.trace(f"Not caching the result for {key!r} since the fetch failed: {exception!r}")
+            return
+        self.set(key, task.result())
+
+    def _record(self, outcome: str) -> None:
+        """Increment the stat for the outcome of a lookup."""
+        if self.stats_prefix:
+            bot.instance.stats.incr(f"{self.stats_prefix}.{outcome}")
@@ -1,4 +1,7 @@
 import typing as t
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
 from math import ceil
 
 from discord import Message
@@ -206,3 +209,98 @@ class MessageCache:
     def _is_full(self) -> bool:
         """Return True if every cell in the cache already contains a message."""
         return self._messages[self._end] is not None
+
+
+class MessageIndex:
+    """
+    An index of received messages by channel and by author, each kept in the order the messages were received.
+
+    The index holds up to `maxlen` messages, evicting the oldest message once it's full. Deleted messages are only
+    marked as such, and are dropped once they're evicted.
+
+    For each channel, the index also tracks the time since which it holds all of the channel's messages. That is
+    `since` until one of the channel's messages is evicted, and the creation time of the evicted message afterwards.
+    """
+
+    def __init__(self, maxlen: int, *, since: datetime):
+        if maxlen <= 0:
+            raise ValueError("maxlen must be positive")
+        self.maxlen = maxlen
+        self.since = since
+
+        self._messages: deque[Message] = deque()
+        self._by_channel: dict[int, deque[Message]] = {}
+        self._by_author: dict[int, deque[Message]] = {}
+        self._coverage: dict[int, datetime] = {}
+        self._ids: set[int] = set()
+        self._deleted: set[int] = set()
+
+    def __len__(self):
+        return len(self._messages) - len(self._deleted)
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._ids and message_id not in self._deleted
+
+    def seed(self, messages: Iterable[Message]) -> None:
+        """
+        Index `messages`, oldest first, which hold all messages received since the first of them.
+
+        This is meant for populating the index from the bot's message cache, so it should be done before any `add`.
+        """
+        for message in messages:
+            if not self._messages:
+                self.since = min(self.since, message.created_at)
+            self.add(message)
+
+    def add(self, message: Message) -> None:
+        """Index the received message, evicting the oldest message if the index is full."""
+        if message.id in self._ids:
+            return
+        if len(self._messages) == self.maxlen:
+            self._evict()
+
+        self._messages.append(message)
+        self._by_channel.setdefault(message.channel.id, deque()).append(message)
+        self._by_author.setdefault(message.author.id, deque()).append(message)
+        self._ids.add(message.id)
+
+    def remove(self, message_id: int) -> None:
+        """Mark the message with the given ID as deleted, if it's indexed."""
+        if message_id in self._ids:
+            self._deleted.add(message_id)
+
+    def covers(self, channel_id: int, since: datetime) -> bool:
+        """Return whether the index holds all of the channel's messages which were created after `since`."""
+        return self._coverage.get(channel_id, self.since) <= since
+
+    def channel_history(self, channel_id: int, after: datetime) -> t.Iterator[Message]:
+        """Iterate over the channel's indexed messages which were created after `after`, newest first."""
+        return self._history(self._by_channel.get(channel_id, ()), after)
+
+    def author_history(self, author_id: int, after: datetime) -> t.Iterator[Message]:
+        """Iterate over the author's indexed messages which were created after `after`, newest first."""
+        return self._history(self._by_author.get(author_id, ()), after)
+
+    def _history(self, messages: Iterable[Message], after: datetime) -> t.Iterator[Message]:
+        """Iterate over the `messages` which weren't deleted and were created after `after`, newest first."""
+        for message in reversed(messages):
+            if message.created_at <= after:
+                return
+            if message.id not in self._deleted:
+                yield message
+
+    def _evict(self) -> None:
+        """Drop the oldest message from the index, and move the coverage of its channel past it."""
+        message = self._messages.popleft()
+        self._ids.remove(message.id)
+        self._deleted.discard(message.id)
+
+        # Messages are received in the same order for the whole index, so the evicted message is the oldest
+        # in its channel and author as well.
+        for key, index in ((message.channel.id, self._by_channel), (message.author.id, self._by_author)):
+            index[key].popleft()
+            if not index[key]:
+                del index[key]
+
+        coverage = self._coverage.get(message.channel.id, self.since)
+        self._coverage[message.channel.id] = max(coverage, message.created_at)
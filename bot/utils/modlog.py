@@ -1,10 +1,158 @@
+import asyncio
+import contextlib
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 
 import discord
+from pydis_core.utils import scheduling
 
 from bot.bot import Bot
 from bot.constants import Channels, Roles
 
+# How long a log entry waits for more entries to be sent in the same message, unless the message fills up first.
+FLUSH_DELAY = 0.5
+# Discord's limits on the embeds of a single message.
+MAX_EMBEDS = 10
+MAX_EMBEDS_LENGTH = 6000
+
+
+@dataclass(slots=True)
+class _LogEntry:
+    """An embed waiting to be sent to a log channel, along with the content and files of its message."""
+
+    embed: discord.Embed
+    queued_at: float
+    future: asyncio.Future[discord.Message]
+    content: str | None = None
+    files: list[discord.File] | None = None
+    length: int = field(init=False)
+
+    def __post_init__(self):
+        self.length = len(self.embed)
+
+    @property
+    def standalone(self) -> bool:
+        """Whether the entry has to start a new message, because of its content or files."""
+        return bool(self.content or self.files)
+
+
+class LogDispatcher:
+    """
+    Send the log entries of a channel in order, packing consecutive entries into as few messages as possible.
+
+    An entry waits for up to `FLUSH_DELAY` seconds for more entries to be logged, unless there are enough to fill
+    a message. While the channel is rate limited, entries keep queueing up and are sent in fuller messages once
+    it isn't, and the loggers waiting for their messages are held back until then.
+    """
+
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        self._queue: deque[_LogEntry] = deque()
+        self._task: asyncio.Task | None = None
+        self._full: asyncio.Event | None = None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def send(
+        self,
+        embed: discord.Embed,
+        *,
+        content: str | None = None,
+        files: list[discord.File] | None = None,
+    ) -> asyncio.Future[discord.Message]:
+        """Queue `embed` to be sent, and return a future of the message it's sent in."""
+        loop = asyncio.get_running_loop()
+        entry = _LogEntry(embed, loop.time(), loop.create_future(), content, files)
+        self._queue.append(entry)
+
+        if self._task is None or self._task.done():
+            self._task = scheduling.create_task(self._run(), name=f"Log dispatcher for {self.channel}")
+        elif self._full is not None and self._fills_message():
+            self._full.set()
+        return entry.future
+
+    def _fills_message(self) -> bool:
+        """Return whether the queued entries fill a message."""
+        return len(self._queue) >= MAX_EMBEDS or sum(entry.length for entry in self._queue) >= MAX_EMBEDS_LENGTH
+
+    async def _run(self) -> None:
+        """Send messages of the queued entries until the queue is empty."""
+        loop = asyncio.get_running_loop()
+        self._full = asyncio.Event()
+        try:
+            while self._queue:
+                delay = self._queue[0].queued_at + FLUSH_DELAY - loop.time()
+                if delay > 0 and not self._fills_message():
+                    self._full.clear()
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._full.wait(), delay)
+                await self._send_message(self._take_message())
+        finally:
+            self._full = None
+
+    def _take_message(self) -> list[_LogEntry]:
+        """Take the entries of the next message from the front of the queue."""
+        entries = [self._queue.popleft()]
+        length = entries[0].length
+        while (
+            self._queue
+            and len(entries) < MAX_EMBEDS
+            and not self._queue[0].standalone
+            and length + self._queue[0].length <= MAX_EMBEDS_LENGTH
+        ):
+            entry = self._queue.popleft()
+            entries.append(entry)
+            length += entry.length
+        return entries
+
+    async def _send_message(self, entries: list[_LogEntry]) -> None:
+        """
+        Send the entries in a single message, and resolve their futures with it.
+
+        If Discord rejects a message of several entries, they're sent again one at a time,
+        so only the entries which are rejected again fail.
+        """
+        try:
+            message = await self.channel.send(
+                content=entries[0].content,
+                embeds=[entry.embed for entry in entries],
+                files=entries[0].files or discord.utils.MISSING,
+            )
+        except discord.HTTPException as e:
+            if len(entries) == 1:
+                self._set_exception(entries, e)
+                return
+            # The files are closed once they're sent, so an entry with files can't be sent again.
+            self._set_exception([entry for entry in entries if entry.files], e)
+            for entry in entries:
+                if not entry.files:
+                    await self._send_message([entry])
+        except Exception as e:
+            self._set_exception(entries, e)
+        else:
+            for entry in entries:
+                if not entry.future.done():
+                    entry.future.set_result(message)
+
+    @staticmethod
+    def _set_exception(entries: list[_LogEntry], exception: Exception) -> None:
+        """Fail the futures of the entries with `exception`."""
+        for entry in entries:
+            if not entry.future.done():
+                entry.future.set_exception(exception)
+
+
+_dispatchers: dict[int, LogDispatcher] = {}
+
+
+def get_dispatcher(channel: discord.abc.Messageable) -> LogDispatcher:
+    """Return the log dispatcher of the channel."""
+    if (dispatcher := _dispatchers.get(channel.id)) is None:
+        dispatcher = _dispatchers[channel.id] = LogDispatcher(channel)
+    return dispatcher
+
 
 async def send_log_message(
     bot: Bot,
@@ -22,7 +170,12 @@ async def send_log_message(
     timestamp_override: datetime | None = None,
     footer: str | None = None,
 ) -> discord.Message:
-    """Generate log embed and send to logging channel."""
+    """
+    Generate log embed and send to logging channel.
+
+    The embed is sent through the channel's `LogDispatcher`, so it may share its message with other log entries.
+    Return the message with the log embed, once it's sent.
+    """
     await bot.wait_until_guild_available()
     # Truncate string directly here to avoid removing newlines
     embed = discord.Embed(
@@ -55,15 +208,9 @@ async def send_log_message(
     if content and len(content) > 2000:
         content = content[:2000 - 3] + "..."
 
-    channel = bot.get_channel(channel_id)
-    log_message = await channel.send(
-        content=content,
-        embed=embed,
-        files=files
+    dispatcher = get_dispatcher(bot.get_channel(channel_id))
+    log_message, *_ = await asyncio.gather(
+        dispatcher.send(embed, content=content, files=files),
+        *(dispatcher.send(additional_embed) for additional_embed in additional_embeds or ()),
     )
-
-    if additional_embeds:
-        for additional_embed in additional_embeds:
-            await channel.send(embed=additional_embed)
-
     return log_message
@@ -0,0 +1,201 @@
+import asyncio
+import contextlib
+import heapq
+import inspect
+from collections import Counter
+from collections.abc import Coroutine, Hashable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+
+from pydis_core.utils import scheduling
+
+from bot.constants import Timers
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass(slots=True, eq=False)
+class _Timer:
+    """A coroutine waiting in the heap of the timer service."""
+
+    scheduler: "Scheduler"
+    task_id: Hashable
+    coroutine: Coroutine
+    cancelled: bool = False
+
+
+class TimerService:
+    """
+    Run the coroutines scheduled through its schedulers from a single heap, driven by a single task.
+
+    Instead of a sleeping task per scheduled coroutine, a coroutine is only wrapped in a task once it's due.
+    At most `Timers.max_concurrency` of the due coroutines run at once, so that a backlog of overdue coroutines,
+    for example after a restart, is caught up on gradually instead of all at once.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, _Timer]] = []
+        self._counter = 0
+        self._cancelled = 0
+        self._running = 0
+        self._wakeup = asyncio.Event()
+        self._driver: asyncio.Task | None = None
+        self._schedulers: dict[str, Scheduler] = {}
+
+    def scheduler(self, name: str) -> "Scheduler":
+        """Return a new scheduler for the `name` namespace, replacing the namespace's previous scheduler."""
+        self._schedulers[name] = Scheduler(name, self)
+        return self._schedulers[name]
+
+    def pending_counts(self) -> Counter[str]:
+        """Return the amount of coroutines which are waiting to be run in each namespace."""
+        return Counter({name: len(scheduler._timers) for name, scheduler in self._schedulers.items()})
+
+    @property
+    def running(self) -> int:
+        """The amount of scheduled coroutines which are currently running."""
+        return self._running
+
+    def _push(self, timer: _Timer, delay: float) -> None:
+        """Add `timer` to the heap to be run after `delay` seconds, and wake the driver if it's the earliest."""
+        when = asyncio.get_running_loop().time() + max(delay, 0)
+        if not self._heap or when < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, (when, self._counter, timer))
+        self._counter += 1
+
+        if self._driver is None or self._driver.done():
+            self._driver = scheduling.create_task(self._drive(), name="Timer service driver")
+
+    def _discard(self, timer: _Timer) -> None:
+        """Mark `timer` as cancelled, and drop cancelled timers from the heap once they make up most of it."""
+        timer.cancelled = True
+        timer.coroutine.close()
+        self._cancelled += 1
+        if self._cancelled > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    async def _drive(self) -> None:
+        """Start the due coroutines, and sleep until the next one is due or a concurrency slot is freed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            self._start_due(loop.time())
+
+            if self._heap and self._running < Timers.max_concurrency:
+                timeout = self._heap[0][0] - loop.time()
+            else:
+                timeout = None
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    def _start_due(self, now: float) -> None:
+        """Start the due coroutines, as long as there are free concurrency slots."""
+        while self._heap:
+            when, _, timer = self._heap[0]
+            if timer.cancelled:
+                heapq.heappop(self._heap)
+                self._cancelled -= 1
+                continue
+            if when > now or self._running >= Timers.max_concurrency:
+                return
+
+            heapq.heappop(self._heap)
+            self._running += 1
+            timer.scheduler._start(timer)
+
+    def _task_done(self, _task: asyncio.Task) -> None:
+        """Free the concurrency slot of a finished coroutine."""
+        self._running -= 1
+        self._wakeup.set()
+
+
+class Scheduler:
+    """
+    Schedule the execution of coroutines through a `TimerService`, and keep track of them.
+
+    This matches the interface of `pydis_core.utils.scheduling.Scheduler`, and schedulers should be created
+    through `TimerService.scheduler` with the name of the class or module owning them, which is their namespace.
+    Any scheduled coroutine can be cancelled prematurely using `cancel` with the same ID used to schedule it.
+    Coroutines which are already running are not cancelled, so that a coroutine can cancel its own ID.
+
+    The `in` operator is supported for checking if a coroutine with a given ID is waiting or running.
+    """
+
+    def __init__(self, name: str, service: TimerService):
+        self.name = name
+        self._service = service
+        self._log = get_logger(f"{__name__}.{name}")
+        self._timers: dict[Hashable, _Timer] = {}
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, task_id: Hashable) -> bool:
+        return task_id in self._timers or task_id in self._tasks
+
+    def __len__(self):
+        return len(self._timers) + len(self._tasks)
+
+    def schedule(self, task_id: Hashable, coroutine: Coroutine) -> None:
+        """Schedule the execution of `coroutine` as soon as there's a free concurrency slot."""
+        self.schedule_later(0, task_id, coroutine)
+
+    def schedule_at(self, time: datetime, task_id: Hashable, coroutine: Coroutine) -> None:
+        """
+        Schedule `coroutine` to be executed at the given `time`.
+
+        If `time` is naïve, it's assumed to be in UTC. If it's in the past, `coroutine` is scheduled immediately.
+        """
+        now = datetime.now(time.tzinfo) if time.tzinfo else datetime.now(tz=UTC)
+        self.schedule_later((time - now).total_seconds(), task_id, coroutine)
+
+    def schedule_later(self, delay: float, task_id: Hashable, coroutine: Coroutine) -> None:
+        """
+        Schedule `coroutine` to be executed after `delay` seconds.
+
+        If a coroutine with `task_id` is already scheduled, close `coroutine` instead of scheduling it.
+        """
+        if inspect.getcoroutinestate(coroutine) != "CORO_CREATED":
+            raise ValueError(f"Cannot schedule an already started coroutine for #{task_id}")
+
+        if task_id in self:
+            self._log.debug(f"Did not schedule task #{task_id}; task was already scheduled.")
+            coroutine.close()
+            return
+
+        timer = _Timer(self, task_id, coroutine)
+        self._timers[task_id] = timer
+        self._service._push(timer, delay)
+        self._log.trace(f"Scheduled task #{task_id} to run in {delay} seconds.")
+
+    def cancel(self, task_id: Hashable) -> None:
+        """Unschedule the coroutine identified by `task_id`. Log a warning if it isn't scheduled."""
+        if (timer := self._timers.pop(task_id, None)) is not None:
+            self._service._discard(timer)
+            self._log.debug(f"Unscheduled task #{task_id}.")
+        elif self._tasks.pop(task_id, None) is not None:
+            self._log.debug(f"Stopped tracking task #{task_id}; it's already running.")
+        else:
+            self._log.warning(f"Failed to unschedule {task_id} (no task found).")
+
+    def cancel_all(self) -> None:
+        """Unschedule all known coroutines."""
+        self._log.debug("Unscheduling all tasks")
+        for task_id in [*self._timers, *self._tasks]:
+            self.cancel(task_id)
+
+    def _start(self, timer: _Timer) -> None:
+        """Wrap the coroutine of the due `timer` in a task."""
+        del self._timers[timer.task_id]
+        task = scheduling.create_task(timer.coroutine, name=f"{self.name}_{timer.task_id}")
+        task.add_done_callback(self._service._task_done)
+        task.add_done_callback(partial(self._task_done, timer.task_id))
+        self._tasks[timer.task_id] = task
+
+    def _task_done(self, task_id: Hashable, done_task: asyncio.Task) -> None:
+        """Stop tracking the finished task, unless the ID was rescheduled in the meantime."""
+        if self._tasks.get(task_id) is done_task:
+            del self._tasks[task_id]
@@ -0,0 +1,116 @@
+"""
+Time the whole filter list dispatch for a message, with and without sharing the normalized content between lists.
+
+Run from the project root with `python -m scripts.benchmark_resolve_action`.
+"""
+
+import asyncio
+import os
+import random
+import string
+import time
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("BOT_TOKEN", "benchmark")
+
+from bot.exts.filtering._filter_context import Event, FilterContext
+from bot.exts.filtering._filter_lists.filter_list import ListType
+from bot.exts.filtering._utils import NormalizedContent
+from bot.exts.filtering.filtering import Filtering
+
+TOKEN_FILTERS = 500
+DOMAIN_FILTERS = 500
+CORPUS_SIZE = 2_000
+REPEATS = 3
+
+rng = random.Random(25)
+
+
+def random_word(min_length: int = 2, max_length: int = 10) -> str:
+    """Return a random lowercase word."""
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(min_length, max_length)))
+
+
+def make_list(list_id: int, name: str, contents: list[str]) -> dict:
+    """Create the API representation of a deny list with the given filter contents."""
+    return {
+        "id": list_id,
+        "name": name,
+        "list_type": ListType.DENY.value,
+        "created_at": 0,
+        "updated_at": 0,
+        "settings": {},
+        "filters": [
+            {
+                "id": list_id * 10_000 + filter_id,
+                "content": content,
+                "description": None,
+                "settings": {},
+                "additional_settings": {},
+                "created_at": 0,
+                "updated_at": 0,
+            }
+            for filter_id, content in enumerate(contents)
+        ],
+    }
+
+
+def make_message() -> str:
+    """Create a chat-like message, occasionally with links, spoilers, escapes, zalgo or several lines."""
+    lines = []
+    for _ in range(rng.choices((1, 3, 15), weights=(80, 15, 5))[0]):
+        words = [random_word() for _ in range(rng.randint(1, 20))]
+        if rng.random() < 0.15:
+            words.append(f"https://{random_word(4, 8)}.com/{random_word()}")
+        if rng.random() < 0.05:
+            words.append(f"||{random_word()}||")
+        if rng.random() < 0.05:
+            words.append(f"{random_word()}\\_{random_word()}%20{random_word()}")
+        if rng.random() < 0.02:
+            words.append("ź̂̃āl̅ğo")
+        lines.append(" ".join(words))
+    return "\n".join(lines)
+
+
+def make_cog() -> Filtering:
+    """Create a filtering cog with token and domain deny lists loaded."""
+    cog = Filtering(MagicMock())
+    cog._load_raw_filter_list(make_list(1, "token", [random_word(6, 12) for _ in range(TOKEN_FILTERS)]))
+    cog._load_raw_filter_list(make_list(2, "domain", [f"{random_word(4, 10)}.com" for _ in range(DOMAIN_FILTERS)]))
+    return cog
+
+
+async def run(cog: Filtering, contexts: list[FilterContext]) -> float:
+    """Return the average time in microseconds it takes to resolve the actions for each context."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for ctx in contexts:
+            await cog._resolve_action(ctx.replace())
+        best = min(best, time.perf_counter() - start)
+    return best / len(contexts) * 1e6
+
+
+async def main() -> None:
+    """Run the benchmark with the shared normalized content, and with each access normalizing anew."""
+    cog = make_cog()
+    channel = MagicMock(guild=MagicMock())
+    contexts = [
+        FilterContext(Event.MESSAGE, MagicMock(), channel, make_message(), MagicMock())
+        for _ in range(CORPUS_SIZE)
+    ]
+
+    # Reproduces every list normalizing the content separately.
+    unshared = property(lambda ctx: NormalizedContent(ctx.content))
+    with patch.object(FilterContext, "normalized", new=unshared):
+        before = await run(cog, contexts)
+    after = await run(cog, contexts)
+
+    print(f"{'':>10} {'µs/msg':>8}")
+    print(f"{'unshared':>10} {before:>8.1f}")
+    print(f"{'shared':>10} {after:>8.1f}")
+    print(f"{'speedup':>10} {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Compare posting eval jobs straight to snekbox against running them through the job dispatcher.
+
+The workload has a user spamming jobs alongside a few users running a job each, with some repeated snippets.
+Jobs are sent to the stand-in snekbox server, which runs any number of jobs at once in the same time, so the
+numbers reflect the load taken off snekbox, not how long users would wait on a real, saturated sandbox.
+
+Run from the project root with `python -m scripts.benchmark_snekbox_dispatch`.
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import aiohttp
+
+os.environ.setdefault("BOT_TOKEN", "benchmark")
+
+from bot.exts.utils.snekbox._dispatch import JobDispatcher
+from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
+from scripts.snekbox_stub import SnekboxStub
+
+JOB_DELAY = 0.05
+SPAMMED_JOBS = 40
+OTHER_USERS = 8
+# How many different snippets the spammer cycles through.
+SPAMMED_SNIPPETS = 10
+
+
+def make_workload() -> list[tuple[int, EvalJob]]:
+    """Return the user and job of each submission, in the order they're submitted."""
+    spam = [(0, EvalJob.from_code(f"print({i % SPAMMED_SNIPPETS})")) for i in range(SPAMMED_JOBS)]
+    others = [(user, EvalJob.from_code(f"print('user {user}')")) for user in range(1, OTHER_USERS + 1)]
+    return spam + others
+
+
+async def run(submit: Callable[[EvalJob, int], Awaitable], workload: list[tuple[int, EvalJob]]) -> dict[int, float]:
+    """Submit the whole workload at once, and return the longest time each user waited for a result."""
+    waits = {}
+
+    async def timed(user: int, job: EvalJob) -> None:
+        start = time.perf_counter()
+        await submit(job, user)
+        waits[user] = max(waits.get(user, 0), time.perf_counter() - start)
+
+    await asyncio.gather(*(timed(user, job) for user, job in workload))
+    return waits
+
+
+async def main() -> None:
+    """Run the workload both ways against a fresh stub, and print the load and the users' waits."""
+    workload = make_workload()
+    print(f"{'':>10} {'executions':>10} {'peak load':>10} {'others (ms)':>12} {'spammer (ms)':>13}")
+
+    async with aiohttp.ClientSession() as session:
+        for name in ("direct", "dispatcher"):
+            stub = SnekboxStub(JOB_DELAY)
+            url = await stub.start()
+
+            async def post(job: EvalJob, url: str = url) -> EvalResult:
+                async with session.post(url, json=job.to_dict(), raise_for_status=True) as resp:
+                    return EvalResult.from_dict(await resp.json())
+
+            if name == "direct":
+                waits = await run(lambda job, _user: post(job), workload)
+            else:
+                dispatcher = JobDispatcher(SimpleNamespace(stats=Mock()), post)
+                waits = await run(dispatcher.submit, workload)
+            await stub.stop()
+
+            others = statistics.median(wait for user, wait in waits.items() if user) * 1000
+            peak = max(stub.most_running.values())
+            print(f"{name:>10} {len(stub.jobs):>10} {peak:>10} {others:>12.0f} {waits[0] * 1000:>13.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Compare the combined token matcher against searching every token filter separately.
+
+Run from the project root with `python -m scripts.benchmark_token_matcher`.
+"""
+
+import os
+import random
+import re
+import string
+import timeit
+from functools import partial
+
+os.environ.setdefault("BOT_TOKEN", "benchmark")
+
+from bot.exts.filtering._filter_lists.token import TokenMatcher
+from bot.exts.filtering._filters.token import TokenFilter
+
+FILTER_COUNTS = (100, 1_000, 5_000)
+CORPUS_SIZE = 100
+# The fraction of messages in the corpus which contain a filtered token.
+DIRTY_RATIO = 0.02
+REPEATS = 3
+
+rng = random.Random(25)
+
+
+def random_word(min_length: int = 4, max_length: int = 10) -> str:
+    """Return a random lowercase word."""
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(min_length, max_length)))
+
+
+def random_pattern() -> str:
+    """Return a pattern resembling the ones in the token list: mostly literals, some with simple obfuscation."""
+    word = random_word(5, 10)
+    kind = rng.random()
+    if kind < 0.6:
+        return word
+    if kind < 0.8:
+        return r"\s*".join(word)
+    if kind < 0.9:
+        return word.replace("i", "[i1!]").replace("o", "[o0]").replace("e", "[e3]")
+    return rf"\b{word}\b"
+
+
+def make_filters(count: int) -> list[TokenFilter]:
+    """Create `count` token filters with random patterns."""
+    return [
+        TokenFilter({
+            "id": id_,
+            "content": random_pattern(),
+            "description": None,
+            "settings": {},
+            "additional_settings": {},
+            "created_at": 0,
+            "updated_at": 0,
+        })
+        for id_ in range(count)
+    ]
+
+
+def make_corpus(filters: list[TokenFilter]) -> list[str]:
+    """Create chat-like messages, a small portion of which contain a literal token from the filters."""
+    literals = [filter_.content for filter_ in filters if filter_.content.isalpha()]
+    corpus = []
+    for _ in range(CORPUS_SIZE):
+        words = [random_word(2, 8) for _ in range(rng.randint(3, 40))]
+        if rng.random() < DIRTY_RATIO:
+            words.insert(rng.randrange(len(words)), rng.choice(literals))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def per_filter_loop(filters: list[TokenFilter], corpus: list[str]) -> set[tuple[int, int]]:
+    """The original approach: run `re.search` for each filter on each message."""
+    return {
+        (index, filter_.id)
+        for index, content in enumerate(corpus)
+        for filter_ in filters
+        if re.search(filter_.content, content, flags=re.IGNORECASE)
+    }
+
+
+def combined_matcher(matcher: TokenMatcher, corpus: list[str]) -> set[tuple[int, int]]:
+    """Screen each message with the combined matcher, then confirm the candidates."""
+    return {
+        (index, filter_.id)
+        for index, content in enumerate(corpus)
+        for filter_ in matcher.candidates(content)
+        if filter_.pattern.search(content)
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each filter count and print the time per message."""
+    print(f"{'filters':>8} {'per-filter (µs/msg)':>20} {'combined (µs/msg)':>18} {'speedup':>8}")
+    for count in FILTER_COUNTS:
+        filters = make_filters(count)
+        corpus = make_corpus(filters)
+        matcher = TokenMatcher(filters)
+
+        if per_filter_loop(filters, corpus) != combined_matcher(matcher, corpus):
+            raise RuntimeError(f"The combined matcher found different matches with {count} filters.")
+
+        loop_time = min(timeit.repeat(partial(per_filter_loop, filters, corpus), number=1, repeat=REPEATS))
+        combined_time = min(timeit.repeat(partial(combined_matcher, matcher, corpus), number=1, repeat=REPEATS))
+
+        loop_us = loop_time / CORPUS_SIZE * 1e6
+        combined_us = combined_time / CORPUS_SIZE * 1e6
+        print(f"{count:>8} {loop_us:>20.1f} {combined_us:>18.1f} {loop_us / combined_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
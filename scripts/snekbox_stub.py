@@ -0,0 +1,88 @@
+"""
+A stand-in for the snekbox eval API, for tests and benchmarks which shouldn't depend on a real sandbox.
+
+It doesn't run any code. Every job takes `delay` seconds, and its output is the arguments and main file
+it was sent, so that responses can be told apart.
+
+Run from the project root with `python -m scripts.snekbox_stub`, and point `URLS_SNEKBOX_EVAL_API` at
+`http://localhost:8060/eval` to try the bot's eval commands against it.
+"""
+
+import argparse
+import asyncio
+from base64 import b64decode
+from collections import Counter
+
+from aiohttp import web
+
+
+class SnekboxStub:
+    """An eval endpoint which records the jobs it's sent, and how many ran at once for each executable."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.jobs: list[dict] = []
+        self.running: Counter[str] = Counter()
+        self.most_running: Counter[str] = Counter()
+
+        self.app = web.Application()
+        self.app.router.add_post("/eval", self.eval)
+        self._runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    async def eval(self, request: web.Request) -> web.Response:
+        """Pretend to evaluate the job, taking `delay` seconds."""
+        job = await request.json()
+        self.jobs.append(job)
+        executable = job.get("executable_path", "")
+
+        self.running[executable] += 1
+        self.most_running[executable] = max(self.most_running[executable], self.running[executable])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running[executable] -= 1
+
+        files = job.get("files") or [{"content": ""}]
+        code = b64decode(files[0]["content"]).decode(errors="replace")
+        return web.json_response({
+            "stdout": f"{' '.join(job['args'])}\n{code}",
+            "returncode": 0,
+            "files": [],
+        })
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving on the address, by default on a free port, and return the URL of the eval endpoint."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}/eval"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def main() -> None:
+    """Serve the stub until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8060)
+    parser.add_argument("--delay", type=float, default=0.05, help="How long every job takes, in seconds.")
+    args = parser.parse_args()
+
+    stub = SnekboxStub(args.delay)
+    print(f"Serving on {await stub.start(args.host, args.port)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import patch
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.errors import BrandingMisconfigurationError
+from bot.exts.backend.branding import _repository
+from bot.exts.backend.branding._repository import BrandingRepository
+from tests.helpers import MockBot
+
+META = b"---\nstart_date: July 10\nend_date: July 20\n---\nA summer event."
+
+
+def make_tree(events: dict[str, str]) -> list[dict]:
+    """Make the tree of a repository with an event directory of each SHA, containing a banner and an icon."""
+    tree = [{"path": "events", "type": "tree", "sha": "events"}]
+    for name, sha in events.items():
+        tree += [
+            {"path": f"events/{name}", "type": "tree", "sha": sha},
+            {"path": f"events/{name}/meta.md", "type": "blob", "sha": f"{sha}-meta"},
+            {"path": f"events/{name}/banners", "type": "tree", "sha": f"{sha}-banners"},
+            {"path": f"events/{name}/banners/banner.png", "type": "blob", "sha": f"{sha}-banner"},
+            {"path": f"events/{name}/server_icons", "type": "tree", "sha": f"{sha}-icons"},
+            {"path": f"events/{name}/server_icons/icon.png", "type": "blob", "sha": f"{sha}-icon"},
+        ]
+    return tree
+
+
+class BrandingStub:
+    """A stand-in for the GitHub API and the raw file host of the branding repository."""
+
+    def __init__(self):
+        self.tree = make_tree({"summer": "a1", "winter": "b1"})
+        self.version = 1
+        self.requests: list[str] = []
+
+        self.app = web.Application()
+        self.app.router.add_get("/repo/git/trees/main", self.get_tree)
+        self.app.router.add_get("/raw/main/{path:.+}", self.get_file)
+
+    def update_tree(self, tree: list[dict]) -> None:
+        self.tree = tree
+        self.version += 1
+
+    async def get_tree(self, request: web.Request) -> web.Response:
+        etag = f'"{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.requests.append("tree 304")
+            return web.Response(status=304)
+        self.requests.append("tree")
+        return web.json_response({"tree": self.tree, "truncated": False}, headers={"ETag": etag})
+
+    async def get_file(self, request: web.Request) -> web.Response:
+        path = request.match_info["path"]
+        self.requests.append(path)
+        return web.Response(body=META if path.endswith("meta.md") else path.encode())
+
+
+class BrandingRepositoryTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for discovering events from the tree of the branding repository."""
+
+    async def asyncSetUp(self):
+        self.stub = BrandingStub()
+        server = TestServer(self.stub.app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+
+        base_url = str(server.make_url("")).rstrip("/")
+        for patcher in (
+            patch.object(_repository, "BRANDING_URL", f"{base_url}/repo"),
+            patch.object(_repository, "BRANDING_RAW_URL", f"{base_url}/raw"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.bot = MockBot()
+        self.bot.http_session = aiohttp.ClientSession()
+        self.addAsyncCleanup(self.bot.http_session.close)
+        self.repository = BrandingRepository(self.bot)
+
+    async def test_events_discovered_from_tree(self):
+        """Events should be constructed from a single tree request, and a request for each meta file."""
+        events = await self.repository.get_events()
+
+        self.assertCountEqual(
+            self.stub.requests,
+            ["tree", "events/summer/meta.md", "events/winter/meta.md"],
+        )
+        self.assertEqual([event.path for event in events], ["events/summer", "events/winter"])
+        summer = events[0]
+        self.assertEqual(summer.meta.description, "A summer event.")
+        self.assertEqual([banner.name for banner in summer.banners], ["banner.png"])
+        self.assertTrue(summer.icons[0].download_url.endswith("/raw/main/events/summer/server_icons/icon.png"))
+
+    async def test_unchanged_repository_costs_one_request(self):
+        """When the tree hasn't changed, the events should be reused after a single conditional request."""
+        first = await self.repository.get_events()
+        self.stub.requests.clear()
+
+        second = await self.repository.get_events()
+
+        self.assertEqual(self.stub.requests, ["tree 304"])
+        self.assertEqual(first, second)
+
+    async def test_only_changed_events_constructed(self):
+        """Only events whose directory changed should be constructed again."""
+        await self.repository.get_events()
+        self.stub.update_tree(make_tree({"summer": "a1", "winter": "b2"}))
+        self.stub.requests.clear()
+
+        events = await self.repository.get_events()
+
+        self.assertEqual(self.stub.requests, ["tree", "events/winter/meta.md"])
+        self.assertEqual(events[1].icons[0].sha, "b2-icon")
+
+    async def test_assets_cached_by_sha(self):
+        """An asset should only be downloaded again once its SHA changes."""
+        events = await self.repository.get_events()
+        download_url = events[0].banners[0].download_url
+        self.stub.requests.clear()
+
+        first = await self.repository.fetch_asset(download_url)
+        second = await self.repository.fetch_asset(download_url)
+        self.stub.update_tree(make_tree({"summer": "a2", "winter": "b1"}))
+        await self.repository.get_events()
+        await self.repository.fetch_asset(download_url)
+
+        self.assertEqual(first, b"events/summer/banners/banner.png")
+        self.assertEqual(first, second)
+        self.assertEqual(self.stub.requests.count("events/summer/banners/banner.png"), 2)
+
+    async def test_event_missing_assets(self):
+        """An event directory without banners should be a misconfiguration."""
+        self.stub.tree = [entry for entry in self.stub.tree if "summer/banners" not in entry["path"]]
+
+        with self.assertRaises(BrandingMisconfigurationError):
+            await self.repository.get_events()
@@ -3,7 +3,8 @@ from unittest import mock
 
 from pydis_core.site_api import ResponseCodeError
 
-from bot.exts.backend.sync._syncers import Syncer
+from bot.exts.backend.sync import _syncers
+from bot.exts.backend.sync._syncers import Syncer, _Diff
 from tests import helpers
 
 
@@ -64,3 +65,26 @@ class SyncerSyncTests(unittest.IsolatedAsyncioTestCase):
 
                 if ctx is not None:
                     ctx.send.assert_called_once()
+
+    async def test_sync_diff_parts(self):
+        """Each part of the diff should be synced as it's found, reporting the progress and summed results."""
+        diffs = [_Diff([1], [2, 3], None), _Diff([], [4], None)]
+
+        async def get_diffs(_guild):
+            for diff in diffs:
+                yield diff
+
+        ctx = helpers.MockContext()
+        message = ctx.send.return_value = helpers.MockMessage()
+        with (
+            mock.patch.object(TestSyncer, "_get_diffs", get_diffs),
+            mock.patch.object(_syncers, "PROGRESS_INTERVAL", -1),
+        ):
+            await TestSyncer.sync(self.guild, ctx)
+
+        self.assertEqual(TestSyncer._sync.await_args_list, [mock.call(diff) for diff in diffs])
+        self.assertEqual(message.edit.call_count, 3)
+        self.assertEqual(
+            message.edit.call_args.kwargs["content"],
+            ":ok_hand: Synchronisation of tests complete: created `1`, updated `3`",
+        )
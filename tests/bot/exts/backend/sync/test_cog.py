@@ -4,12 +4,12 @@ import unittest.mock
 from unittest import mock
 
 import discord
-from pydis_core.site_api import ResponseCodeError
 
 from bot import constants
 from bot.exts.backend import sync
 from bot.exts.backend.sync._cog import Sync
 from bot.exts.backend.sync._syncers import Syncer
+from bot.exts.backend.sync._user_queue import UserUpdateQueue
 from tests import helpers
 from tests.base import CommandTestCase
 
@@ -50,14 +50,6 @@ class SyncCogTestCase(unittest.IsolatedAsyncioTestCase):
 
         self.cog = Sync(self.bot)
 
-    @staticmethod
-    def response_error(status: int) -> ResponseCodeError:
-        """Fixture to return a ResponseCodeError with the given status code."""
-        response = mock.MagicMock()
-        response.status = status
-
-        return ResponseCodeError(response)
-
 
 class SyncCogTests(SyncCogTestCase):
     """Tests for the Sync cog."""
@@ -111,37 +103,13 @@ class SyncCogTests(SyncCogTestCase):
         self.RoleSyncer.sync.assert_called_once()
         self.UserSyncer.sync.assert_called_once()
 
-    async def patch_user_helper(self, side_effect: BaseException) -> None:
-        """Helper to set a side effect for bot.api_client.patch and then assert it is called."""
-        self.bot.api_client.patch.reset_mock(side_effect=True)
-        self.bot.api_client.patch.side_effect = side_effect
-
-        user_id, updated_information = 5, {"key": 123}
-        await self.cog.patch_user(user_id, updated_information)
-
-        self.bot.api_client.patch.assert_called_once_with(
-            f"bot/users/{user_id}",
-            json=updated_information,
-        )
-
-    async def test_sync_cog_patch_user(self):
-        """A PATCH request should be sent and 404 errors ignored."""
-        for side_effect in (None, self.response_error(404)):
-            with self.subTest(side_effect=side_effect):
-                await self.patch_user_helper(side_effect)
-
-    async def test_sync_cog_patch_user_non_404(self):
-        """A PATCH request should be sent and the error raised if it's not a 404."""
-        with self.assertRaises(ResponseCodeError):
-            await self.patch_user_helper(self.response_error(500))
-
 
 class SyncCogListenerTests(SyncCogTestCase):
     """Tests for the listeners of the Sync cog."""
 
     def setUp(self):
         super().setUp()
-        self.cog.patch_user = mock.AsyncMock(spec_set=self.cog.patch_user)
+        self.cog.user_queue = mock.MagicMock(spec_set=UserUpdateQueue)
 
         self.guild_id_patcher = mock.patch("bot.exts.backend.sync._cog.constants.Guild.id", 5)
         self.guild_id = self.guild_id_patcher.start()
@@ -233,25 +201,22 @@ class SyncCogListenerTests(SyncCogTestCase):
         self.bot.api_client.put.assert_not_awaited()
 
     async def test_sync_cog_on_member_remove(self):
-        """Member should be patched to set in_guild as False."""
+        """An update setting in_guild as False should be queued for the member."""
         self.assertTrue(self.cog.on_member_remove.__cog_listener__)
 
         member = helpers.MockMember(guild=self.guild)
         await self.cog.on_member_remove(member)
 
-        self.cog.patch_user.assert_called_once_with(
-            member.id,
-            json={"in_guild": False}
-        )
+        self.cog.user_queue.update.assert_called_once_with(member.id, {"in_guild": False})
 
     async def test_sync_cog_on_member_remove_ignores_guilds(self):
         """Events from other guilds should be ignored."""
         member = helpers.MockMember(guild=self.other_guild)
         await self.cog.on_member_remove(member)
-        self.cog.patch_user.assert_not_awaited()
+        self.cog.user_queue.update.assert_not_called()
 
     async def test_sync_cog_on_member_update_roles(self):
-        """Members should be patched if their roles have changed."""
+        """An update should be queued for members whose roles have changed."""
         self.assertTrue(self.cog.on_member_update.__cog_listener__)
 
         # Roles are intentionally unsorted.
@@ -262,10 +227,10 @@ class SyncCogListenerTests(SyncCogTestCase):
         await self.cog.on_member_update(before_member, after_member)
 
         data = {"roles": sorted(role.id for role in after_member.roles)}
-        self.cog.patch_user.assert_called_once_with(after_member.id, json=data)
+        self.cog.user_queue.update.assert_called_once_with(after_member.id, data)
 
     async def test_sync_cog_on_member_update_other(self):
-        """Members should not be patched if other attributes have changed."""
+        """No update should be queued for members if other attributes have changed."""
         self.assertTrue(self.cog.on_member_update.__cog_listener__)
 
         subtests = (
@@ -276,23 +241,23 @@ class SyncCogListenerTests(SyncCogTestCase):
 
         for attribute, old_value, new_value in subtests:
             with self.subTest(attribute=attribute):
-                self.cog.patch_user.reset_mock()
+                self.cog.user_queue.reset_mock()
 
                 before_member = helpers.MockMember(**{attribute: old_value}, guild=self.guild)
                 after_member = helpers.MockMember(**{attribute: new_value}, guild=self.guild)
 
                 await self.cog.on_member_update(before_member, after_member)
 
-                self.cog.patch_user.assert_not_called()
+                self.cog.user_queue.update.assert_not_called()
 
     async def test_sync_cog_on_member_update_ignores_guilds(self):
         """Events from other guilds should be ignored."""
         member = helpers.MockMember(guild=self.other_guild)
         await self.cog.on_member_update(member, member)
-        self.cog.patch_user.assert_not_awaited()
+        self.cog.user_queue.update.assert_not_called()
 
     async def test_sync_cog_on_user_update(self):
-        """A user should be patched only if the name, discriminator, or avatar changes."""
+        """An update should be queued for a user only if the name or discriminator changes."""
         self.assertTrue(self.cog.on_user_update.__cog_listener__)
 
         before_data = {
@@ -309,7 +274,7 @@ class SyncCogListenerTests(SyncCogTestCase):
 
         for should_patch, attribute, api_field, value, api_value in subtests:
             with self.subTest(attribute=attribute):
-                self.cog.patch_user.reset_mock()
+                self.cog.user_queue.reset_mock()
 
                 after_data = before_data.copy()
                 after_data[attribute] = value
@@ -319,33 +284,26 @@ class SyncCogListenerTests(SyncCogTestCase):
                 await self.cog.on_user_update(before_user, after_user)
 
                 if should_patch:
-                    self.cog.patch_user.assert_called_once()
+                    self.cog.user_queue.update.assert_called_once()
 
                     # Don't care if *all* keys are present; only the changed one is required
-                    call_args = self.cog.patch_user.call_args
-                    self.assertEqual(call_args.args[0], after_user.id)
-                    self.assertIn("json", call_args.kwargs)
-
-                    self.assertIn("ignore_404", call_args.kwargs)
-                    self.assertTrue(call_args.kwargs["ignore_404"])
-
-                    json = call_args.kwargs["json"]
+                    user_id, json = self.cog.user_queue.update.call_args.args
+                    self.assertEqual(user_id, after_user.id)
                     self.assertIn(api_field, json)
                     self.assertEqual(json[api_field], api_value)
                 else:
-                    self.cog.patch_user.assert_not_called()
+                    self.cog.user_queue.update.assert_not_called()
 
-    async def on_member_join_helper(self, side_effect: Exception) -> dict:
-        """
-        Helper to set `side_effect` for on_member_join and assert a PUT request was sent.
+    async def test_sync_cog_on_member_join(self):
+        """The member's data should be queued to be created or updated."""
+        self.assertTrue(self.cog.on_member_join.__cog_listener__)
 
-        The request data for the mock member is returned. All exceptions will be re-raised.
-        """
         member = helpers.MockMember(
             discriminator="1234",
             roles=[helpers.MockRole(id=22), helpers.MockRole(id=12)],
             guild=self.guild,
         )
+        await self.cog.on_member_join(member)
 
         data = {
             "discriminator": int(member.discriminator),
@@ -354,47 +312,13 @@ class SyncCogListenerTests(SyncCogTestCase):
             "name": member.name,
             "roles": sorted(role.id for role in member.roles)
         }
-
-        self.bot.api_client.put.reset_mock(side_effect=True)
-        self.bot.api_client.put.side_effect = side_effect
-
-        try:
-            await self.cog.on_member_join(member)
-        except Exception:
-            raise
-        finally:
-            self.bot.api_client.put.assert_called_once_with(
-                f"bot/users/{member.id}",
-                json=data
-            )
-
-        return data
-
-    async def test_sync_cog_on_member_join(self):
-        """Should PUT user's data or POST it if the user doesn't exist."""
-        for side_effect in (None, self.response_error(404)):
-            with self.subTest(side_effect=side_effect):
-                self.bot.api_client.post.reset_mock()
-                data = await self.on_member_join_helper(side_effect)
-
-                if side_effect:
-                    self.bot.api_client.post.assert_called_once_with("bot/users", json=data)
-                else:
-                    self.bot.api_client.post.assert_not_called()
-
-    async def test_sync_cog_on_member_join_non_404(self):
-        """ResponseCodeError should be re-raised if status code isn't a 404."""
-        with self.assertRaises(ResponseCodeError):
-            await self.on_member_join_helper(self.response_error(500))
-
-        self.bot.api_client.post.assert_not_called()
+        self.cog.user_queue.create.assert_called_once_with(member.id, data)
 
     async def test_sync_cog_on_member_join_ignores_guilds(self):
         """Events from other guilds should be ignored."""
         member = helpers.MockMember(guild=self.other_guild)
         await self.cog.on_member_join(member)
-        self.bot.api_client.post.assert_not_awaited()
-        self.bot.api_client.put.assert_not_awaited()
+        self.cog.user_queue.create.assert_not_called()
 
 
 class SyncCogCommandTests(SyncCogTestCase, CommandTestCase):
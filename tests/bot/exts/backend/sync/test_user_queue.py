@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+from pydis_core.site_api import ResponseCodeError
+
+from bot.exts.backend.sync import _user_queue
+from bot.exts.backend.sync._user_queue import UserUpdateQueue
+from tests import helpers
+
+
+def response_error(status: int, response_json: dict | None = None) -> ResponseCodeError:
+    response = mock.MagicMock()
+    response.status = status
+    return ResponseCodeError(response, response_json)
+
+
+class UserUpdateQueueTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for merging changes to users and sending them in batches."""
+
+    def setUp(self):
+        self.bot = helpers.MockBot()
+        self.queue = UserUpdateQueue(self.bot)
+
+        create_task_patcher = mock.patch.object(_user_queue.scheduling, "create_task")
+        self.create_task = create_task_patcher.start()
+        self.create_task.side_effect = lambda coro, **_: coro.close()
+        self.addCleanup(create_task_patcher.stop)
+
+    async def test_changes_merged_per_user(self):
+        """A join followed by updates of the same user should be sent as a single record."""
+        self.queue.create(1, {"id": 1, "name": "old", "roles": [], "in_guild": True})
+        self.queue.update(1, {"roles": [5]})
+        self.queue.update(2, {"in_guild": False})
+        self.queue.update(1, {"name": "new"})
+        self.assertEqual(len(self.queue), 2)
+
+        await self.queue.flush()
+
+        self.bot.api_client.post.assert_awaited_once_with(
+            "bot/users", json=[{"id": 1, "name": "new", "roles": [5], "in_guild": True}]
+        )
+        self.bot.api_client.patch.assert_awaited_once_with("bot/users/bulk_patch", json=[
+            {"id": 1, "name": "new", "roles": [5], "in_guild": True},
+            {"in_guild": False, "id": 2},
+        ])
+        self.assertEqual(len(self.queue), 0)
+
+    async def test_flush_scheduled(self):
+        """The first change should schedule a flush, and a full batch should be flushed right away."""
+        with mock.patch.object(_user_queue.UserSync, "batch_size", 2):
+            self.queue.update(1, {"in_guild": False})
+            self.assertEqual(self.create_task.call_args.kwargs["name"], "User sync flush timer")
+
+            self.queue.update(2, {"in_guild": False})
+            self.assertEqual(self.create_task.call_args.kwargs["name"], "User sync flush")
+
+    async def test_flush_in_batches(self):
+        """The pending changes should be sent in batches of the configured size."""
+        for user_id in range(5):
+            self.queue.update(user_id, {"in_guild": False})
+
+        with mock.patch.object(_user_queue.UserSync, "batch_size", 2):
+            await self.queue.flush()
+
+        batches = [call.kwargs["json"] for call in self.bot.api_client.patch.await_args_list]
+        self.assertEqual([[user["id"] for user in batch] for batch in batches], [[0, 1], [2, 3], [4]])
+        self.bot.stats.gauge.assert_any_call("sync.users.batch_size", 1)
+
+    async def test_rejected_batch_sent_separately(self):
+        """If the site rejects a batch, each user should be sent separately, ignoring users that don't exist."""
+        self.queue.create(1, {"id": 1, "in_guild": True})
+        self.queue.update(2, {"name": "name"})
+        self.bot.api_client.patch.side_effect = [response_error(404), None]
+        self.bot.api_client.put.side_effect = response_error(404)
+
+        await self.queue.flush()
+
+        self.bot.api_client.put.assert_awaited_once_with("bot/users/1", json={"id": 1, "in_guild": True})
+        self.bot.api_client.post.assert_awaited_with("bot/users", json={"id": 1, "in_guild": True})
+        self.bot.api_client.patch.assert_awaited_with("bot/users/2", json={"name": "name"})
+
+    async def test_unknown_user_left_out_of_batch(self):
+        """A user missing from the database should be left out of the retried batch and of later batches."""
+        for user_id in (1, 2, 3):
+            self.queue.update(user_id, {"in_guild": False})
+        self.bot.api_client.patch.side_effect = [
+            response_error(404, {"detail": "User with id 2 not found."}),
+            None,
+        ]
+
+        await self.queue.flush()
+
+        self.assertEqual(self.bot.api_client.patch.await_count, 2)
+        self.bot.api_client.patch.assert_awaited_with("bot/users/bulk_patch", json=[
+            {"in_guild": False, "id": 1},
+            {"in_guild": False, "id": 3},
+        ])
+
+        self.bot.api_client.patch.reset_mock(side_effect=True)
+        self.queue.update(2, {"in_guild": True})
+        self.queue.update(4, {"in_guild": True})
+        await self.queue.flush()
+        self.bot.api_client.patch.assert_awaited_once_with("bot/users/bulk_patch", json=[{"in_guild": True, "id": 4}])
+
+        self.bot.api_client.patch.reset_mock()
+        self.queue.create(2, {"id": 2, "in_guild": True})
+        await self.queue.flush()
+        self.bot.api_client.post.assert_awaited_once_with("bot/users", json=[{"id": 2, "in_guild": True}])
+        self.bot.api_client.patch.assert_awaited_once_with("bot/users/bulk_patch", json=[{"id": 2, "in_guild": True}])
+
+    async def test_server_error_not_retried(self):
+        """A batch failing with a server error should be dropped instead of being sent separately."""
+        self.queue.update(1, {"in_guild": False})
+        self.bot.api_client.patch.side_effect = response_error(500)
+
+        await self.queue.flush()
+
+        self.bot.api_client.patch.assert_awaited_once()
+        self.assertEqual(len(self.queue), 0)
+
+    async def test_close_flushes(self):
+        """Closing the queue should cancel the scheduled flush and send the pending changes."""
+        timer = mock.MagicMock()
+        self.create_task.side_effect = lambda coro, **_: coro.close() or timer
+        self.queue.update(1, {"in_guild": False})
+
+        await self.queue.close()
+
+        timer.cancel.assert_called_once()
+        self.bot.api_client.patch.assert_awaited_once_with("bot/users/bulk_patch", json=[{"in_guild": False, "id": 1}])
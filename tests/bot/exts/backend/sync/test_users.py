@@ -1,8 +1,10 @@
+import asyncio
 import unittest
 from unittest import mock
 
 from discord.errors import NotFound
 
+from bot.exts.backend.sync import _syncers
 from bot.exts.backend.sync._syncers import UserSyncer, _Diff
 from tests import helpers
 
@@ -137,7 +139,7 @@ class UserSyncerDiffTests(unittest.IsolatedAsyncioTestCase):
             self.get_mock_member(fake_user()),
             None
         ]
-        guild.fetch_member.side_effect = NotFound(mock.Mock(status=404), "Not found")
+        guild.query_members.return_value = []
 
         actual_diff = await UserSyncer._get_diff(guild)
         expected_diff = ([], [{"id": 63, "in_guild": False}], None)
@@ -162,7 +164,7 @@ class UserSyncerDiffTests(unittest.IsolatedAsyncioTestCase):
             self.get_mock_member(updated_user),
             None
         ]
-        guild.fetch_member.side_effect = NotFound(mock.Mock(status=404), "Not found")
+        guild.query_members.return_value = []
 
         actual_diff = await UserSyncer._get_diff(guild)
         expected_diff = ([new_user], [{"id": 55, "name": "updated"}, {"id": 63, "in_guild": False}], None)
@@ -182,7 +184,7 @@ class UserSyncerDiffTests(unittest.IsolatedAsyncioTestCase):
             self.get_mock_member(fake_user()),
             None
         ]
-        guild.fetch_member.side_effect = NotFound(mock.Mock(status=404), "Not found")
+        guild.query_members.return_value = []
 
         actual_diff = await UserSyncer._get_diff(guild)
         expected_diff = ([], [], None)
@@ -190,6 +192,112 @@ class UserSyncerDiffTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(actual_diff, expected_diff)
 
 
+class UserSyncerStreamingTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for fetching the database users and yielding the diff in parts."""
+
+    def setUp(self):
+        patcher = mock.patch("bot.instance", new=helpers.MockBot())
+        self.bot = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def set_pages(self, pages: list[list[dict]], count: int | None = None):
+        """Make the API return `pages` of users, with the count of users in the pages unless `count` is given."""
+        if count is None:
+            count = sum(map(len, pages))
+
+        async def get(_endpoint, params):
+            page_no = params["page"]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0)
+            self.in_flight -= 1
+            return {
+                "count": count,
+                "next_page_no": page_no + 1 if page_no < len(pages) else None,
+                "previous_page_no": page_no - 1 or None,
+                "results": pages[page_no - 1],
+            }
+
+        self.bot.api_client.get.side_effect = get
+
+    async def test_pages_fetched_concurrently_in_order(self):
+        """Pages after the first should be fetched ahead with bounded concurrency, and yielded in order."""
+        pages = [[fake_user(id=page_no * 10 + i) for i in range(2)] for page_no in range(10)]
+        self.set_pages(pages)
+
+        with mock.patch.object(_syncers, "MAX_CONCURRENT_PAGES", 3):
+            fetched = [page async for page in UserSyncer._get_user_pages()]
+
+        self.assertEqual(fetched, pages)
+        self.assertEqual(self.max_in_flight, 3)
+
+    async def test_pages_followed_past_count(self):
+        """Pages added after the amount of pages was known should still be fetched."""
+        pages = [[fake_user(id=i)] for i in range(5)]
+        self.set_pages(pages, count=3)
+
+        fetched = [page async for page in UserSyncer._get_user_pages()]
+
+        self.assertEqual(fetched, pages)
+
+    async def test_missing_members_requested_in_chunks(self):
+        """Members missing from the cache should be requested through the gateway, in chunks."""
+        self.set_pages([[fake_user(id=i, roles=[666]) for i in range(5)]])
+        guild = helpers.MockGuild(members=[])
+        guild.get_member.return_value = None
+        guild.query_members.side_effect = lambda user_ids, limit: [
+            self.get_member(fake_user(id=user_id, roles=[666])) for user_id in user_ids if user_id != 3
+        ]
+
+        with mock.patch.object(_syncers, "MEMBER_QUERY_LIMIT", 2):
+            diff = await UserSyncer._get_diff(guild)
+
+        self.assertEqual(
+            [call.kwargs["user_ids"] for call in guild.query_members.await_args_list], [[0, 1], [2, 3], [4]]
+        )
+        self.assertEqual(diff, ([], [{"id": 3, "in_guild": False}], None))
+
+    async def test_member_request_timeout_falls_back_to_fetch(self):
+        """If a member request times out, the members should be fetched one by one."""
+        self.set_pages([[fake_user(id=1), fake_user(id=2)]])
+        guild = helpers.MockGuild(members=[])
+        guild.get_member.return_value = None
+        guild.query_members.side_effect = TimeoutError
+        guild.fetch_member.side_effect = [
+            self.get_member(fake_user(id=1, roles=[666])),
+            NotFound(mock.Mock(status=404), "Not found"),
+        ]
+
+        members = await UserSyncer._fetch_members(guild, [1, 2])
+
+        self.assertEqual(list(members), [1])
+
+    async def test_diffs_yielded_per_page(self):
+        """The updated users of each page should be yielded as they're found, and the created users last."""
+        new_user = fake_user(id=99)
+        self.set_pages([[fake_user(id=1, in_guild=False)], [fake_user(id=2)], [fake_user(id=3)]])
+        guild = helpers.MockGuild(members=[self.get_member(new_user)])
+        guild.get_member.return_value = None
+        guild.query_members.return_value = []
+
+        diffs = [diff async for diff in UserSyncer._get_diffs(guild)]
+
+        self.assertEqual(diffs, [
+            ([], [{"id": 2, "in_guild": False}], None),
+            ([], [{"id": 3, "in_guild": False}], None),
+            ([new_user], [], None),
+        ])
+
+    @staticmethod
+    def get_member(user: dict):
+        member = helpers.MockMember(**{key: value for key, value in user.items() if key not in ("in_guild", "roles")})
+        member.roles = [helpers.MockRole(id=role_id) for role_id in user["roles"]]
+        return member
+
+
 class UserSyncerSyncTests(unittest.IsolatedAsyncioTestCase):
     """Tests for the API requests that sync users."""
 
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+
+import arrow
+
+from bot.exts.filtering._filter_context import Event, FilterContext
+from bot.exts.filtering._filter_lists.domain import DomainsList
+from bot.exts.filtering._filter_lists.filter_list import ListType
+from tests.helpers import MockMember, MockMessage, MockTextChannel
+
+
+def make_filter_data(id_: int, domain: str, *, only_subdomains: bool = False) -> dict:
+    now = arrow.utcnow().timestamp()
+    return {
+        "id": id_,
+        "content": domain,
+        "description": None,
+        "settings": {},
+        "additional_settings": {"only_subdomains": only_subdomains},
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+class DomainsListTests(unittest.IsolatedAsyncioTestCase):
+    """Test the indexed lookup of domain filters."""
+
+    def setUp(self):
+        self.filter_list = DomainsList(MagicMock())
+        now = arrow.utcnow().timestamp()
+        self.filter_list.add_list({
+            "id": 1,
+            "name": "domain",
+            "list_type": ListType.DENY.value,
+            "created_at": now,
+            "updated_at": now,
+            "settings": {},
+            "filters": [
+                make_filter_data(1, "example.com"),
+                make_filter_data(2, "sub.example.com"),
+                make_filter_data(3, "evil.org", only_subdomains=True),
+                make_filter_data(4, "Spam.NET"),
+            ],
+        })
+
+        member = MockMember(id=123)
+        channel = MockTextChannel(id=345)
+        message = MockMessage(author=member, channel=channel)
+        self.ctx = FilterContext(Event.MESSAGE, member, channel, "", message)
+
+    async def test_triggers(self):
+        """The list should trigger on the same filters as evaluating every filter separately."""
+        test_cases = (
+            ("nothing here", []),
+            ("https://example.com", [1]),
+            ("https://www.sub.example.com/page", [1, 2]),
+            ("https://notexample.com", []),
+            ("https://evil.org", []),
+            ("https://evil.org/path", [3]),
+            ("https://a.evil.org", [3]),
+            ("https://spam.net https://example.com", [1, 4]),
+        )
+
+        for content, expected_ids in test_cases:
+            with self.subTest(content=content):
+                ctx = self.ctx.replace(content=content, matches=[], notification_domain="")
+                _, _, triggers = await self.filter_list.actions_for(ctx)
+
+                self.assertEqual([filter_.id for filter_ in triggers[ListType.DENY]], expected_ids)
+                self.assertEqual(len(ctx.matches), len(expected_ids))
+                if expected_ids:
+                    last_filter = self.filter_list[ListType.DENY].filters[expected_ids[-1]]
+                    self.assertEqual(ctx.notification_domain, last_filter.content)
+
+    async def test_index_updated_with_filters(self):
+        """Added and removed filters should be reflected in the index."""
+        ctx = self.ctx.replace(content="https://ham.io")
+        _, _, triggers = await self.filter_list.actions_for(ctx)
+        self.assertEqual(triggers[ListType.DENY], [])
+
+        self.filter_list.add_filter(ListType.DENY, make_filter_data(5, "ham.io"))
+        _, _, triggers = await self.filter_list.actions_for(ctx)
+        self.assertEqual([filter_.id for filter_ in triggers[ListType.DENY]], [5])
+
+        self.filter_list.remove_filter(ListType.DENY, 5)
+        _, _, triggers = await self.filter_list.actions_for(ctx)
+        self.assertEqual(triggers[ListType.DENY], [])
@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import arrow
+
+from bot.exts.filtering._filter_context import Event, FilterContext
+from bot.exts.filtering._filter_lists.filter_list import ListType
+from bot.exts.filtering._filter_lists.token import TokensList
+from bot.exts.filtering._settings import ValidationSettings
+from tests.helpers import MockDMChannel, MockMember, MockTextChannel
+
+
+def make_filter_data(id_: int, settings: dict) -> dict:
+    now = arrow.utcnow().timestamp()
+    return {
+        "id": id_,
+        "content": "spam",
+        "description": None,
+        "settings": settings,
+        "additional_settings": {},
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+class AtomicListResultTests(unittest.IsolatedAsyncioTestCase):
+    """Test evaluating the validations of the filters in a list."""
+
+    def setUp(self):
+        self.filter_list = TokensList(MagicMock())
+        now = arrow.utcnow().timestamp()
+        self.atomic_list = self.filter_list.add_list({
+            "id": 1,
+            "name": "token",
+            "list_type": ListType.DENY.value,
+            "created_at": now,
+            "updated_at": now,
+            "settings": {"enabled": True, "filter_dm": False},
+            "filters": [
+                make_filter_data(1, {}),
+                make_filter_data(2, {"enabled": False}),
+                make_filter_data(3, {"enabled": True, "filter_dm": True}),
+                make_filter_data(4, {"enabled": False}),
+                make_filter_data(5, {"enabled": True, "filter_dm": True}),
+            ],
+        })
+        self.member = MockMember(id=123)
+
+    def make_ctx(self, channel: MockTextChannel | MockDMChannel) -> FilterContext:
+        return FilterContext(Event.MESSAGE, self.member, channel, "spam", None)
+
+    def test_identical_overrides_interned(self):
+        """Filters with identical validation overrides should share the same validation settings."""
+        filters = self.atomic_list.filters
+        self.assertIs(filters[2].validations, filters[4].validations)
+        self.assertIs(filters[3].validations, filters[5].validations)
+        self.assertIsNot(filters[2].validations, filters[3].validations)
+
+    def test_filters_partitioned(self):
+        """Filters should be split into default scoped ones and groups of identical overrides, keeping positions."""
+        self.assertEqual([filter_.id for _, filter_ in self.atomic_list.default_scoped], [1])
+        self.assertEqual(
+            [[(position, filter_.id) for position, filter_ in group] for _, group in self.atomic_list.override_groups],
+            [[(1, 2), (3, 4)], [(2, 3), (4, 5)]]
+        )
+
+    async def test_relevant_filters(self):
+        """The relevant filters should be the same whether evaluated by groups or one by one, and keep list order."""
+        test_cases = (
+            (MockTextChannel(), [1, 3, 5]),
+            (MockDMChannel(), [3, 5]),
+        )
+
+        for channel, expected_ids in test_cases:
+            with self.subTest(channel=channel):
+                ctx = self.make_ctx(channel)
+                grouped = await self.atomic_list.filter_list_result(ctx)
+                separate = await self.atomic_list._create_filter_list_result(
+                    ctx, self.atomic_list.defaults, self.atomic_list.filters.values()
+                )
+
+                self.assertEqual([filter_.id for filter_ in grouped], expected_ids)
+                self.assertEqual(grouped, separate)
+
+    async def test_each_override_set_evaluated_once(self):
+        """Each distinct set of overrides should only be evaluated once per context."""
+        ctx = self.make_ctx(MockTextChannel())
+
+        with patch.object(ValidationSettings, "evaluate", autospec=True, side_effect=ValidationSettings.evaluate) as ev:
+            await self.atomic_list.filter_list_result(ctx)
+            self.assertEqual(ev.call_count, 3)
+
+            ev.reset_mock()
+            await self.atomic_list._create_filter_list_result(
+                ctx, self.atomic_list.defaults, self.atomic_list.filters.values()
+            )
+            self.assertEqual(ev.call_count, 3)
+
+    def test_partitions_updated_with_filters(self):
+        """Added and removed filters should be reflected in the partitions."""
+        self.filter_list.add_filter(ListType.DENY, make_filter_data(6, {}))
+        self.filter_list.remove_filter(ListType.DENY, 1)
+
+        self.assertEqual([filter_.id for _, filter_ in self.atomic_list.default_scoped], [6])
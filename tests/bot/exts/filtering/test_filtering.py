@@ -0,0 +1,160 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.filtering import filtering
+from bot.exts.filtering._filter_context import Event, FilterContext
+from bot.exts.filtering.filtering import Filtering
+from tests.helpers import MockBot, MockMember, MockMessage, MockTextChannel
+
+
+def make_filter_list(name: str, result: tuple, delay: float = 0) -> MagicMock:
+    """Create a mock filter list which returns `result` after `delay` seconds."""
+    filter_list = MagicMock()
+    filter_list.name = name
+    filter_list.__getitem__.side_effect = lambda list_type: f"{name}_{list_type}"
+
+    async def actions_for(_ctx):
+        await asyncio.sleep(delay)
+        return result
+
+    filter_list.actions_for.side_effect = actions_for
+    return filter_list
+
+
+class ResolveActionTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for dispatching a filtering context to the subscribed filter lists."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = Filtering(self.bot)
+        member = MockMember(id=123)
+        channel = MockTextChannel(id=345)
+        self.ctx = FilterContext(Event.MESSAGE, member, channel, "", MockMessage(author=member, channel=channel))
+
+    @patch("bot.exts.filtering.filtering.ActionSettings.union")
+    async def test_results_merged_in_subscription_order(self, union):
+        """Results should be merged in the order the lists subscribed, even if a later list finishes first."""
+        slow_actions, fast_actions = MagicMock(), MagicMock()
+        slow_list = make_filter_list("slow", (slow_actions, ["slow message"], {}), delay=0.05)
+        fast_list = make_filter_list("fast", (fast_actions, ["fast message"], {}))
+        self.cog.subscribe(slow_list, Event.MESSAGE)
+        self.cog.subscribe(fast_list, Event.MESSAGE)
+
+        result_actions, messages, _ = await self.cog._resolve_action(self.ctx)
+
+        union.assert_called_once_with(slow_actions, fast_actions)
+        self.assertEqual(result_actions, union.return_value)
+        self.assertEqual(list(messages), [slow_list, fast_list])
+
+    @patch("bot.exts.filtering.filtering.constants.Filters.list_timeout", new=0.01)
+    async def test_hanging_list_skipped(self):
+        """A list exceeding its time budget should be skipped without holding back the others."""
+        fast_actions = MagicMock()
+        hanging_list = make_filter_list("hanging", (MagicMock(), ["hanging message"], {}), delay=10)
+        fast_list = make_filter_list("fast", (fast_actions, ["fast message"], {}))
+        self.cog.subscribe(hanging_list, Event.MESSAGE)
+        self.cog.subscribe(fast_list, Event.MESSAGE)
+
+        result_actions, messages, _ = await self.cog._resolve_action(self.ctx)
+
+        self.assertEqual(result_actions, fast_actions)
+        self.assertEqual(list(messages), [fast_list])
+        self.bot.stats.incr.assert_called_once_with("filters.lists.hanging.timeout")
+        self.assertEqual(self.bot.stats.timing.call_count, 2)
+
+
+def make_attachment(content: bytes, encoding: str = "utf-8", filename: str = "file.txt") -> MagicMock:
+    """Create a mock text attachment with the given content."""
+    attachment = MagicMock(filename=filename, size=len(content), url=f"https://cdn.example/{filename}")
+    attachment.content_type = f"text/plain; charset={encoding}"
+    attachment.read = AsyncMock(return_value=content)
+    return attachment
+
+
+class StreamedBody:
+    """A response body which hands out the content in small chunks, and tracks how much was read."""
+
+    def __init__(self, content: bytes, chunk_size: int = 100):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    async def read(self, n: int) -> bytes:
+        chunk = self.content[self.position:self.position + min(n, self.chunk_size)]
+        self.position += len(chunk)
+        return chunk
+
+
+class ExtractTextAttachmentsTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for reading the beginning of text attachments."""
+
+    def setUp(self):
+        self.bodies = {}
+        response = MagicMock()
+        session = MagicMock()
+
+        def get(url, **_kwargs):
+            response.content = self.bodies[url]
+            context_manager = MagicMock()
+            context_manager.__aenter__ = AsyncMock(return_value=response)
+            context_manager.__aexit__ = AsyncMock(return_value=False)
+            return context_manager
+
+        session.get.side_effect = get
+        patcher = patch("bot.exts.filtering.filtering.bot.instance", new=MagicMock(http_session=session))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stream(self, attachment: MagicMock, content: bytes) -> StreamedBody:
+        body = self.bodies[attachment.url] = StreamedBody(content)
+        return body
+
+    async def test_small_attachment_read_whole(self):
+        """An attachment smaller than the limit should be read and truncated like before."""
+        content = "\n".join(f"line {i}" for i in range(50)).encode()
+        attachment = make_attachment(content)
+
+        result = await filtering._extract_text_file_content(attachment)
+
+        attachment.read.assert_awaited_once()
+        self.assertEqual(result, "file.txt: " + "\n".join(f"line {i}" for i in range(30)))
+
+    async def test_large_attachment_prefix_read(self):
+        """Only a bounded prefix of a large attachment should be read, with the same result as reading all of it."""
+        content = ("ä" * 10_000 + "\n") * 100
+        attachment = make_attachment(content.encode())
+        body = self.stream(attachment, content.encode())
+
+        result = await filtering._extract_text_file_content(attachment)
+
+        attachment.read.assert_not_awaited()
+        self.assertEqual(body.position, filtering.ATTACHMENT_MAX_BYTES)
+        self.assertEqual(result, "file.txt: " + content[:filtering.ATTACHMENT_MAX_CHARS])
+
+    async def test_multibyte_boundary(self):
+        """A character cut off at the end of the prefix should be left out instead of failing to decode."""
+        content = "a" + "€" * 1_000
+        for encoding in ("utf-8", "utf-16"):
+            with self.subTest(encoding=encoding):
+                attachment = make_attachment(content.encode(encoding), encoding=encoding)
+                self.stream(attachment, content.encode(encoding))
+
+                result = await filtering._extract_text_file_content(attachment, max_bytes=100)
+
+                self.assertTrue(content.startswith(result.removeprefix("file.txt: ")))
+
+    @patch("bot.exts.filtering.filtering.constants.Filters.attachment_bytes_budget", new=150)
+    async def test_byte_budget(self):
+        """The attachments of a message should share the byte budget, and ones past it should be skipped."""
+        attachments = [make_attachment(b"x" * 100, filename=f"{i}.txt") for i in range(3)]
+        bodies = [self.stream(attachment, b"x" * 100) for attachment in attachments]
+        binary = MagicMock(content_type="image/png")
+
+        result = await filtering._extract_text_attachments([binary, *attachments])
+
+        self.assertEqual(result, ["0.txt: " + "x" * 100, "1.txt: " + "x" * 50])
+        attachments[0].read.assert_awaited_once()
+        self.assertEqual(bodies[1].position, 50)
+        attachments[2].read.assert_not_awaited()
+        self.assertEqual(bodies[2].position, 0)
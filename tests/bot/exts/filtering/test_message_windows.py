@@ -0,0 +1,92 @@
+import unittest
+from datetime import timedelta
+
+import arrow
+
+from bot.exts.filtering._message_windows import AuthorWindowedMessageCache, MessageFeatures
+from tests.helpers import MockMember, MockMessage
+
+
+class MessageFeaturesTests(unittest.TestCase):
+    """Tests for the precomputed properties of a message."""
+
+    def test_features(self):
+        """The features should count the properties of the content the antispam rules look at."""
+        content = "hi :smile: 😄\n\n\nhttps://example.com\n```:not_counted:```"
+        message = MockMessage(content=content, attachments=[object(), object()], role_mentions=[object()])
+
+        features = MessageFeatures.from_message(message)
+
+        self.assertEqual(features.chars, len(content))
+        self.assertEqual(features.attachments, 2)
+        self.assertEqual(features.emojis, 2)
+        self.assertEqual(features.links, 1)
+        self.assertEqual(features.newlines, 4)
+        self.assertEqual(features.max_consecutive_newlines, 3)
+        self.assertEqual(features.role_mentions, 1)
+
+
+class AuthorWindowedMessageCacheTests(unittest.TestCase):
+    """Tests for keeping the per-author windows in sync with the cache."""
+
+    def setUp(self):
+        self.authors = [MockMember(id=1), MockMember(id=2)]
+        self.now = arrow.utcnow().datetime
+        self.message_id = 0
+
+    def make_message(self, author: MockMember, seconds_ago: float = 0) -> MockMessage:
+        self.message_id += 1
+        return MockMessage(
+            id=self.message_id, author=author, content="", created_at=self.now - timedelta(seconds=seconds_ago)
+        )
+
+    def window_ids(self, cache: AuthorWindowedMessageCache, author: MockMember, seconds: float = 60) -> list[int]:
+        since = self.now - timedelta(seconds=seconds)
+        return [features.message.id for features in cache.author_window(author, since)]
+
+    def test_window_matches_cache(self):
+        """An author's window should hold the same messages as filtering the cache by the author."""
+        cache = AuthorWindowedMessageCache(maxlen=5)
+        for i in range(12):
+            cache.append(self.make_message(self.authors[i % 3 == 0], seconds_ago=12 - i))
+
+        for author in self.authors:
+            with self.subTest(author=author.id):
+                expected = [msg.id for msg in cache if msg.author == author]
+                self.assertEqual(self.window_ids(cache, author), expected)
+
+    def test_window_respects_cutoff(self):
+        """Only messages newer than the cutoff should be returned."""
+        cache = AuthorWindowedMessageCache(maxlen=10)
+        for seconds_ago in (30, 20, 10, 0):
+            cache.append(self.make_message(self.authors[0], seconds_ago=seconds_ago))
+
+        self.assertEqual(self.window_ids(cache, self.authors[0], seconds=15), [4, 3])
+        self.assertEqual(self.window_ids(cache, self.authors[1]), [])
+
+    def test_removal(self):
+        """Popping and clearing the cache should also update the windows."""
+        cache = AuthorWindowedMessageCache(maxlen=10)
+        for i in range(4):
+            cache.append(self.make_message(self.authors[i % 2]))
+
+        cache.pop()
+        cache.popleft()
+        self.assertEqual(self.window_ids(cache, self.authors[0]), [3])
+        self.assertEqual(self.window_ids(cache, self.authors[1]), [2])
+
+        cache.clear()
+        self.assertEqual(self.window_ids(cache, self.authors[0]), [])
+
+    def test_update_recomputes_features(self):
+        """Updating a message with a new object should recompute its features."""
+        cache = AuthorWindowedMessageCache(maxlen=10)
+        message = self.make_message(self.authors[0])
+        cache.append(message)
+
+        edited = MockMessage(id=message.id, author=message.author, created_at=message.created_at, content="longer")
+        self.assertTrue(cache.update(edited))
+
+        [features] = cache.author_window(self.authors[0], self.now - timedelta(seconds=1))
+        self.assertIs(features.message, edited)
+        self.assertEqual(features.chars, len("longer"))
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+
+from bot.exts.filtering._filter_context import Event, FilterContext
+from bot.exts.filtering._utils import NormalizedContent, clean_input, expand_spoilers
+from tests.helpers import MockMember, MockTextChannel
+
+
+class NormalizedContentTests(unittest.TestCase):
+    """Tests for the lazily computed normalized forms of content."""
+
+    def test_forms_match_direct_normalization(self):
+        """Each form should be the same as normalizing the content directly."""
+        test_cases = (
+            "",
+            "plain text",
+            "line\none\n\nline two",
+            "z̸͎a̵l̷g̶o and​invisible",
+            "quoted%0Anewline and %7C%7Cquoted spoiler%7C%7C",
+            "escaped \\\\n and ||spoiler\nover lines||",
+        )
+
+        for content in test_cases:
+            with self.subTest(content=content):
+                normalized = NormalizedContent(content)
+                self.assertEqual(normalized.cleaned, clean_input(content))
+                self.assertEqual(normalized.cleaned_with_newlines, clean_input(content, keep_newlines=True))
+                expanded = expand_spoilers(content) if "||" in content else content
+                self.assertEqual(normalized.spoilers_expanded, clean_input(expanded))
+
+    def test_nfkc_forms(self):
+        """The NFKC forms should normalize compatibility characters and drop combining characters."""
+        normalized = NormalizedContent("\uff46\uff55\uff4c\uff4c \u2460")
+
+        self.assertEqual(normalized.nfkc, "full 1")
+        self.assertEqual(normalized.nfkc_without_combining, "full 1")
+        self.assertEqual(NormalizedContent("ë̄").nfkc_without_combining, "ë")
+
+    @patch("bot.exts.filtering._utils.clean_input", wraps=clean_input)
+    def test_shared_by_context(self, clean_input_mock):
+        """Every access through a context with the same content should reuse the same computation."""
+        ctx = FilterContext(Event.MESSAGE, MockMember(), MockTextChannel(), "some content", None)
+
+        self.assertEqual(ctx.normalized.cleaned, "some content")
+        self.assertEqual(ctx.replace(matches=["match"]).normalized.cleaned_with_newlines, "some content")
+        self.assertEqual(clean_input_mock.call_count, 1)
+
+        self.assertEqual(ctx.replace(content="other content").normalized.cleaned, "other content")
+        self.assertEqual(clean_input_mock.call_count, 2)
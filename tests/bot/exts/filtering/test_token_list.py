@@ -0,0 +1,127 @@
+import re
+import unittest
+from unittest.mock import MagicMock
+
+import arrow
+
+from bot.exts.filtering._filter_lists.filter_list import ListType
+from bot.exts.filtering._filter_lists.token import MATCHER_BLOCK_SIZE, TokenMatcher, TokensList
+from bot.exts.filtering._filters.token import TokenFilter
+
+
+def make_filter_data(id_: int, pattern: str) -> dict:
+    now = arrow.utcnow().timestamp()
+    return {
+        "id": id_,
+        "content": pattern,
+        "description": None,
+        "settings": {},
+        "additional_settings": {},
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def make_filter(id_: int, pattern: str) -> TokenFilter:
+    return TokenFilter(make_filter_data(id_, pattern))
+
+
+class TokenMatcherTests(unittest.TestCase):
+    """Tests for the combined regex matcher of the token list."""
+
+    def test_candidates_include_every_matching_filter(self):
+        """Any filter whose pattern matches the content should be a candidate, in the original order."""
+        patterns = [f"word{i}" for i in range(MATCHER_BLOCK_SIZE * 3)] + [r"bla\d{2,4}", r"h[a4]ck", "^start", "end$"]
+        filters = [make_filter(id_, pattern) for id_, pattern in enumerate(patterns)]
+        matcher = TokenMatcher(filters)
+
+        test_contents = (
+            "nothing to see here",
+            "WORD5 and word150",
+            "bla1",
+            "bla123 h4ck",
+            "start at the end",
+            "the start isn't the end",
+        )
+        for content in test_contents:
+            with self.subTest(content=content):
+                candidates = matcher.candidates(content)
+                expected = [filter_ for filter_ in filters if re.search(filter_.content, content, re.IGNORECASE)]
+
+                self.assertTrue(set(expected) <= set(candidates))
+                self.assertEqual(candidates, sorted(candidates, key=filters.index))
+
+    def test_no_candidates_for_clean_content(self):
+        """Content not matching any combinable pattern should only yield the standalone filters."""
+        filters = [make_filter(1, "spam"), make_filter(2, "eggs")]
+        matcher = TokenMatcher(filters)
+
+        self.assertEqual(matcher.candidates("ham"), [])
+
+    def test_literal_prefixes_are_not_split_from_quantifiers_or_alternations(self):
+        """Patterns sharing a literal prefix should keep their meaning when the prefix is factored out."""
+        filters = [
+            make_filter(1, "spam"),
+            make_filter(2, "spa*m"),
+            make_filter(3, "spx|ham"),
+            make_filter(4, r"sp\s*eggs"),
+        ]
+        matcher = TokenMatcher(filters)
+
+        test_cases = (
+            ("SPAM", True),
+            ("spm", True),
+            ("ham", True),
+            ("sp  eggs", True),
+            ("sp", False),
+            ("spx", True),
+        )
+        for content, expected in test_cases:
+            with self.subTest(content=content):
+                self.assertEqual(bool(matcher.candidates(content)), expected)
+
+    def test_uncombinable_patterns_are_always_candidates(self):
+        """Patterns with backreferences, named groups or global flags should not be merged into the alternation."""
+        filters = [
+            make_filter(1, r"(a)\1"),
+            make_filter(2, r"(?P<word>b)(?P=word)"),
+            make_filter(3, r"(?s)c.d"),
+            make_filter(4, "plain"),
+        ]
+        matcher = TokenMatcher(filters)
+
+        self.assertEqual(matcher.standalone, filters[:3])
+        self.assertEqual(matcher.candidates("nothing"), filters[:3])
+        self.assertEqual(matcher.candidates("plain"), filters)
+
+
+class TokensListMatcherTests(unittest.TestCase):
+    """Tests that the token list keeps its matchers in sync with its filters."""
+
+    def setUp(self):
+        self.filter_list = TokensList(MagicMock())
+        now = arrow.utcnow().timestamp()
+        self.filter_list.add_list({
+            "id": 1,
+            "name": "token",
+            "list_type": ListType.DENY.value,
+            "created_at": now,
+            "updated_at": now,
+            "settings": {},
+            "filters": [make_filter_data(1, "spam")],
+        })
+
+    def test_matcher_built_on_load(self):
+        """Loading the list should build a matcher with its filters."""
+        matcher = self.filter_list.matchers[ListType.DENY]
+        self.assertEqual([filter_.id for filter_ in matcher.candidates("spam")], [1])
+
+    def test_matcher_rebuilt_on_add_and_remove(self):
+        """Adding and removing filters should be reflected by the matcher."""
+        self.filter_list.add_filter(ListType.DENY, make_filter_data(2, "eggs"))
+        matcher = self.filter_list.matchers[ListType.DENY]
+        self.assertEqual([filter_.id for filter_ in matcher.candidates("spam and eggs")], [1, 2])
+
+        self.filter_list.remove_filter(ListType.DENY, 1)
+        matcher = self.filter_list.matchers[ListType.DENY]
+        self.assertEqual([filter_.id for filter_ in matcher.candidates("spam and eggs")], [2])
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.info.doc import _batch_parser
+from bot.exts.info.doc._cog import DocItem
+from tests.helpers import MockBot
+
+
+def make_item(page: str, symbol_id: str) -> DocItem:
+    return DocItem("lib", "py:function", "https://lib.dev/", f"{page}.html", symbol_id)
+
+
+class BatchParserTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for parsing the queued symbols with a pool of workers."""
+
+    async def asyncSetUp(self):
+        self.bot = MockBot()
+        self.bot.loop = asyncio.get_running_loop()
+        self.bot.http_session = MagicMock()
+        response = self.bot.http_session.get.return_value.__aenter__.return_value
+        response.text = AsyncMock(return_value="<html></html>")
+
+        self.doc_cache = MagicMock(set_many=AsyncMock())
+        self.parsed = []
+        self.active_pages = []
+        self.max_active = 0
+        self.parse_lock = threading.Lock()
+
+        patch("bot.instance", self.bot).start()
+        patch.object(_batch_parser, "doc_cache", self.doc_cache).start()
+        patch.object(_batch_parser, "get_symbol_markdown", side_effect=self._parse).start()
+        self.addCleanup(patch.stopall)
+
+        with patch.object(_batch_parser, "StaleInventoryNotifier"):
+            self.parser = _batch_parser.BatchParser()
+
+    def _parse(self, _soup, doc_item: DocItem) -> str:
+        with self.parse_lock:
+            if doc_item.url in self.active_pages:
+                raise AssertionError(f"The page of {doc_item} is already being parsed.")
+            self.active_pages.append(doc_item.url)
+            self.max_active = max(self.max_active, len(self.active_pages))
+        time.sleep(0.001)
+        with self.parse_lock:
+            self.active_pages.remove(doc_item.url)
+            self.parsed.append(doc_item)
+        return f"Markdown of {doc_item.symbol_id}"
+
+    def add_page(self, page: str, symbols: int) -> list[DocItem]:
+        items = [make_item(page, f"{page}-{i}") for i in range(symbols)]
+        for item in items:
+            self.parser.add_item(item)
+        return items
+
+    async def drain(self) -> None:
+        while self.parser._workers:
+            await asyncio.gather(*self.parser._workers)
+
+    async def test_requested_item_parsed_first(self):
+        """The requested symbol should be parsed before the rest of the symbols of its page."""
+        items = self.add_page("page", 10)
+
+        self.assertEqual(await self.parser.get_markdown(items[7]), "Markdown of page-7")
+        self.assertEqual(self.parsed[0], items[7])
+
+        await self.drain()
+        self.assertCountEqual(self.parsed, items)
+
+    async def test_user_request_preempts_background_parsing(self):
+        """A symbol requested while other pages are parsed in the background should be parsed before them."""
+        first_page = self.add_page("first", 20)
+        second_page = self.add_page("second", 20)
+
+        with patch.object(_batch_parser.Doc, "parse_workers", 1):
+            await self.parser.get_markdown(first_page[0])
+            await self.parser.get_markdown(second_page[5])
+
+        parsed_position = self.parsed.index(second_page[5])
+        self.assertLess(parsed_position, 5)
+        await self.drain()
+        self.assertCountEqual(self.parsed, first_page + second_page)
+
+    async def test_workers_bounded(self):
+        """Pages should be parsed concurrently by up to the configured amount of workers, one symbol per page."""
+        pages = [self.add_page(f"page{i}", 5) for i in range(6)]
+
+        with patch.object(_batch_parser.Doc, "parse_workers", 3):
+            await asyncio.gather(*(self.parser.get_markdown(page[0]) for page in pages))
+            self.assertLessEqual(len(self.parser._workers), 3)
+            await self.drain()
+
+        self.assertLessEqual(self.max_active, 3)
+        self.assertEqual(len(self.parsed), 30)
+
+    async def test_page_queued_while_worker_flushes(self):
+        """A page queued while the last worker is flushing its writes should be parsed by a new worker."""
+        flushing = asyncio.Event()
+        release = asyncio.Event()
+
+        async def set_many(_values: dict) -> None:
+            flushing.set()
+            await release.wait()
+
+        self.doc_cache.set_many.side_effect = set_many
+        first_page = self.add_page("first", 1)
+        second_page = self.add_page("second", 1)
+
+        with patch.object(_batch_parser.Doc, "parse_workers", 1):
+            await self.parser.get_markdown(first_page[0])
+            await flushing.wait()
+            markdown = await asyncio.wait_for(self.parser.get_markdown(second_page[0]), timeout=1)
+            release.set()
+            await self.drain()
+
+        self.assertEqual(markdown, "Markdown of second-0")
+        self.assertEqual(self.parser._workers, set())
+
+    async def test_writes_batched(self):
+        """Parsed Markdown should be written to redis in batches, with the rest written once parsing is done."""
+        items = self.add_page("page", 12)
+
+        with patch.object(_batch_parser.Doc, "redis_batch_size", 5):
+            await self.parser.get_markdown(items[0])
+            await self.drain()
+
+        written = [call.args[0] for call in self.doc_cache.set_many.await_args_list]
+        self.assertEqual([len(values) for values in written], [5, 5, 2])
+        self.assertEqual({item: markdown for values in written for item, markdown in values.items()}, {
+            item: f"Markdown of {item.symbol_id}" for item in items
+        })
+
+    async def test_pending_write_returned(self):
+        """Markdown that's waiting to be written to redis should be returned without fetching the page again."""
+        item = make_item("page", "symbol")
+        self.parser._pending_writes[item] = "Markdown"
+
+        self.assertEqual(await self.parser.get_markdown(item), "Markdown")
+        self.bot.http_session.get.assert_not_called()
+
+    async def test_failed_fetch_not_left_pending(self):
+        """If the page can't be fetched, the error should be raised and the symbol should be requestable again."""
+        item = self.add_page("page", 1)[0]
+        self.bot.http_session.get.return_value.__aenter__.side_effect = [ValueError, MagicMock(
+            text=AsyncMock(return_value="<html></html>")
+        )]
+
+        with self.assertRaises(ValueError):
+            await self.parser.get_markdown(item)
+        self.assertEqual(await self.parser.get_markdown(item), "Markdown of page-0")
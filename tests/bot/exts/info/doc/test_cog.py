@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.info.doc import _cog
+from bot.exts.info.doc._inventory_parser import FetchedInventory
+from tests.helpers import MockBot
+
+PACKAGES = [
+    {"package": "python", "base_url": "", "inventory_url": "https://docs.python.org/3/objects.inv"},
+    {"package": "lib", "base_url": "https://lib.dev/", "inventory_url": "https://lib.dev/objects.inv"},
+]
+
+
+def make_inventory(*symbols: str) -> defaultdict:
+    return defaultdict(list, {"py:function": [(symbol, f"api.html#{symbol}") for symbol in symbols]})
+
+
+class InventorySnapshotTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for loading the inventories from a snapshot, and only refreshing the inventories which changed."""
+
+    async def asyncSetUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        snapshot_patcher = patch.object(_cog.Doc, "snapshot_path", Path(temp_dir.name, "snapshot.json.gz"))
+        snapshot_patcher.start()
+        self.addCleanup(snapshot_patcher.stop)
+
+        self.bot = MockBot()
+        self.bot.api_client.get = AsyncMock(return_value=PACKAGES)
+        self.cog = self.make_cog()
+
+        self.inventories = {
+            "https://docs.python.org/3/objects.inv": make_inventory("print", "len"),
+            "https://lib.dev/objects.inv": make_inventory("print", "run"),
+        }
+        self.modified = set(self.inventories)
+        self.fetch = patch.object(_cog, "fetch_inventory_if_modified", side_effect=self._fetch).start()
+        self.addCleanup(patch.stopall)
+
+    async def _fetch(self, url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedInventory:
+        if etag is not None and url not in self.modified:
+            return FetchedInventory(None, etag, last_modified)
+        return FetchedInventory(self.inventories[url], f'"{url}"', None)
+
+    def make_cog(self) -> _cog.DocCog:
+        with patch("bot.exts.info.doc._batch_parser.StaleInventoryNotifier"):
+            return _cog.DocCog(self.bot)
+
+    async def test_snapshot_restores_symbols(self):
+        """A new cog should load the same symbols and inventories from the snapshot that the refresh created."""
+        await self.cog.refresh_inventories()
+
+        new_cog = self.make_cog()
+        self.assertTrue(await new_cog.load_snapshot())
+
+        self.assertEqual(new_cog.doc_symbols, self.cog.doc_symbols)
+        self.assertEqual(new_cog.renamed_symbols, self.cog.renamed_symbols)
+        self.assertEqual(new_cog.base_urls, self.cog.base_urls)
+        self.assertEqual(new_cog.inventories, self.cog.inventories)
+
+    async def test_no_snapshot(self):
+        """Loading should report that there's no snapshot if none was saved."""
+        self.assertFalse(await self.cog.load_snapshot())
+
+    async def test_unchanged_inventories_not_rebuilt(self):
+        """If no inventory changed, the symbols should be kept as they are."""
+        await self.cog.refresh_inventories()
+        self.modified.clear()
+
+        with patch.object(self.cog, "update_single") as update_single:
+            await self.cog.refresh_inventories()
+
+        update_single.assert_not_called()
+        self.assertIn("run", self.cog.doc_symbols)
+        self.fetch.assert_any_await("https://lib.dev/objects.inv", '"https://lib.dev/objects.inv"', None)
+
+    async def test_changed_inventory_rebuilt(self):
+        """If an inventory changed, the symbols should be rebuilt, reusing the unchanged inventories."""
+        await self.cog.refresh_inventories()
+        self.inventories["https://lib.dev/objects.inv"] = make_inventory("walk")
+        self.modified = {"https://lib.dev/objects.inv"}
+
+        await self.cog.refresh_inventories()
+
+        self.assertIn("walk", self.cog.doc_symbols)
+        self.assertNotIn("run", self.cog.doc_symbols)
+        self.assertIn("len", self.cog.doc_symbols)
+
+    async def test_cog_load_refreshes_in_background_with_snapshot(self):
+        """With a snapshot, the cog should load it and refresh the inventories in a background task."""
+        await self.cog.refresh_inventories()
+        new_cog = self.make_cog()
+
+        with patch.object(_cog.scheduling, "create_task") as create_task:
+            new_cog.background_refresh = MagicMock()
+            await new_cog.cog_load()
+
+        create_task.assert_called_once()
+        self.assertIn("len", new_cog.doc_symbols)
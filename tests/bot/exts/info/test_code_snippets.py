@@ -0,0 +1,151 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.exts.info import code_snippets
+from bot.exts.info.code_snippets import CodeSnippets
+from tests.helpers import MockBot
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+FILE = "\n".join(f"line_{i} = {i}" for i in range(1, 11))
+
+
+class GitHubStub:
+    """A stand-in for the parts of the GitHub API used by the cog."""
+
+    def __init__(self):
+        self.requests: list[str] = []
+        self.conditional: list[str] = []
+        self.delay = 0
+        self.fetching = 0
+        self.most_fetching = 0
+
+        self.app = web.Application()
+        self.app.router.add_get("/repos/{owner}/{repo}/branches", self.refs)
+        self.app.router.add_get("/repos/{owner}/{repo}/tags", self.refs)
+        self.app.router.add_get("/repos/{owner}/{repo}/contents/{path:.+}", self.contents)
+
+    async def refs(self, request: web.Request) -> web.Response:
+        self.requests.append(request.path)
+        headers = {"ETag": '"v1"', "X-RateLimit-Remaining": "4999"}
+        if request.headers.get("If-None-Match") == '"v1"':
+            self.conditional.append(request.path)
+            return web.Response(status=304, headers=headers)
+
+        names = ["main", "feature/snippets"] if request.path.endswith("branches") else ["v1.0"]
+        return web.json_response([{"name": name} for name in names], headers=headers)
+
+    async def contents(self, request: web.Request) -> web.Response:
+        self.requests.append(f"{request.path}?ref={request.query['ref']}")
+        self.fetching += 1
+        self.most_fetching = max(self.most_fetching, self.fetching)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.fetching -= 1
+        return web.Response(text=FILE)
+
+
+class CodeSnippetsFetchTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for fetching the snippets of messages from a stand-in GitHub API."""
+
+    async def asyncSetUp(self):
+        self.github = GitHubStub()
+        server = TestServer(self.github.app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+
+        self.bot = MockBot()
+        self.bot.http_session = aiohttp.ClientSession()
+        self.addAsyncCleanup(self.bot.http_session.close)
+        self.cog = CodeSnippets(self.bot)
+
+        for patcher in (
+            patch.object(code_snippets, "GITHUB_API_URL", str(server.make_url("")).rstrip("/")),
+            patch("bot.utils.caching.bot.instance", new=MagicMock()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_refs_fetched_once_per_repo(self):
+        """Links to the same repo should share a single lookup of its branches and tags."""
+        content = (
+            "https://github.com/owner/repo/blob/main/bot.py#L1 "
+            "https://github.com/owner/repo/blob/feature/snippets/bot.py#L2-L3"
+        )
+
+        snippets = await self.cog._parse_snippets(content)
+
+        self.assertEqual(self.github.requests.count("/repos/owner/repo/branches"), 1)
+        self.assertEqual(self.github.requests.count("/repos/owner/repo/tags"), 1)
+        self.assertIn("/repos/owner/repo/contents/bot.py?ref=feature/snippets", self.github.requests)
+        self.assertIn("line_1 = 1", snippets)
+        self.assertLess(snippets.index("line_1 = 1"), snippets.index("line_2 = 2"))
+
+    async def test_permalink_contents_cached(self):
+        """Permalinks should skip the ref lookup, and their contents should be fetched only once."""
+        content = f"https://github.com/owner/repo/blob/{SHA}/bot.py#L4"
+
+        first = await self.cog._parse_snippets(content)
+        second = await self.cog._parse_snippets(content)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.github.requests, [f"/repos/owner/repo/contents/bot.py?ref={SHA}"])
+
+    async def test_branch_contents_not_cached(self):
+        """Files on a branch can change, so their contents should be fetched every time."""
+        content = "https://github.com/owner/repo/blob/main/bot.py#L4"
+
+        await self.cog._parse_snippets(content)
+        await self.cog._parse_snippets(content)
+
+        self.assertEqual(self.github.requests.count("/repos/owner/repo/contents/bot.py?ref=main"), 2)
+
+    async def test_expired_refs_revalidated(self):
+        """Once the cached refs expire, they should be revalidated with the ETag of the last response."""
+        content = "https://github.com/owner/repo/blob/feature/snippets/bot.py#L1"
+        await self.cog._parse_snippets(content)
+        self.cog._refs.clear()
+
+        snippets = await self.cog._parse_snippets(content)
+
+        self.assertEqual(self.github.conditional, ["/repos/owner/repo/branches", "/repos/owner/repo/tags"])
+        self.assertIn("`bot.py` line 1", snippets)
+        self.bot.stats.incr.assert_called_with("code_snippets.github.not_modified")
+        self.bot.stats.gauge.assert_called_with("code_snippets.github.ratelimit_remaining", 4999)
+
+    async def test_fetches_bounded_per_message(self):
+        """At most the configured amount of snippets of a message should be fetched at once."""
+        self.github.delay = 0.05
+        content = " ".join(f"https://github.com/owner/repo/blob/{SHA}/file_{i}.py#L1" for i in range(5))
+
+        with patch.object(code_snippets, "MAX_CONCURRENT_FETCHES", 2):
+            snippets = await self.cog._parse_snippets(content)
+
+        self.assertEqual(self.github.most_fetching, 2)
+        self.assertEqual(snippets.count("line_1 = 1"), 5)
+
+    async def test_failed_link_skipped(self):
+        """A link which fails with an unexpected error should be skipped, keeping the other snippets."""
+        fetch_github_snippet = self.cog._fetch_github_snippet
+
+        async def handler(**kwargs) -> str:
+            if kwargs["path"].endswith("broken.py"):
+                raise TimeoutError
+            return await fetch_github_snippet(**kwargs)
+
+        self.cog.pattern_handlers[0] = (code_snippets.GITHUB_RE, handler)
+        content = (
+            f"https://github.com/owner/repo/blob/{SHA}/broken.py#L1 "
+            f"https://github.com/owner/repo/blob/{SHA}/bot.py#L2"
+        )
+
+        with self.assertLogs(code_snippets.log, "ERROR"):
+            snippets = await self.cog._parse_snippets(content)
+
+        self.assertIn("line_2 = 2", snippets)
+        self.assertNotIn("broken.py", snippets)
@@ -0,0 +1,149 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from bot.exts.moderation.infraction import _utils
+from bot.exts.moderation.infraction._index import ActiveInfractionIndex
+from bot.exts.moderation.infraction.infractions import Infractions
+from bot.exts.moderation.infraction.management import ModManagement
+from bot.exts.moderation.infraction.superstarify import Superstarify
+from tests.helpers import MockBot, MockContext, MockMember
+
+
+def make_infraction(id_: int, user: int, type_: str = "ban", active: bool = True, expires_at: str | None = None):
+    return {"id": id_, "user": user, "type": type_, "active": active, "expires_at": expires_at}
+
+
+class ActiveInfractionIndexTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for keeping the index of active infractions."""
+
+    def setUp(self):
+        self.index = ActiveInfractionIndex({"ban", "timeout"})
+
+    async def test_not_warm_until_reconciled(self):
+        """The index should only cover its types once it was populated from the site."""
+        self.assertFalse(self.index.covers("ban"))
+
+        await self.index.reconcile(AsyncMock(return_value=[make_infraction(1, 10)])(), permanent=True)
+        self.assertFalse(self.index.covers("ban"))
+        await self.index.reconcile(AsyncMock(return_value=[])(), permanent=False)
+
+        self.assertTrue(self.index.covers("ban"))
+        self.assertFalse(self.index.covers("superstar"))
+        self.assertEqual(self.index.get(10, "ban")["id"], 1)
+        self.assertIsNone(self.index.get(10, "timeout"))
+
+    def test_add_and_remove(self):
+        """Only active infractions of the index's types should be added, and removed by their id."""
+        self.index.add(make_infraction(1, 10))
+        self.index.add(make_infraction(2, 10, active=False, type_="timeout"))
+        self.index.add(make_infraction(3, 11, type_="superstar"))
+        self.assertEqual(len(self.index), 1)
+
+        self.index.remove(make_infraction(4, 10))
+        self.assertEqual(self.index.get(10, "ban")["id"], 1)
+
+        self.index.remove(make_infraction(1, 10))
+        self.assertIsNone(self.index.get(10, "ban"))
+
+    def test_inactive_infraction_removed(self):
+        """Adding an infraction which is no longer active should remove its indexed entry."""
+        self.index.add(make_infraction(1, 10))
+
+        self.index.add(make_infraction(1, 10, active=False))
+
+        self.assertIsNone(self.index.get(10, "ban"))
+
+    async def test_reconcile_keeps_other_kind(self):
+        """Reconciling the temporary infractions should keep the indexed permanent infractions, and vice versa."""
+        self.index.add(make_infraction(1, 10))
+        self.index.add(make_infraction(2, 10, type_="timeout", expires_at="2100-01-01T00:00:00+00:00"))
+
+        await self.index.reconcile(AsyncMock(return_value=[])(), permanent=False)
+
+        self.assertEqual(self.index.get(10, "ban")["id"], 1)
+        self.assertIsNone(self.index.get(10, "timeout"))
+
+    async def test_reconcile_keeps_local_changes(self):
+        """Infractions added or removed while the site is being fetched should be kept as they are locally."""
+        self.index.add(make_infraction(1, 10))
+        fetched = asyncio.get_running_loop().create_future()
+        reconcile = asyncio.create_task(self.index.reconcile(fetched, permanent=True))
+        await asyncio.sleep(0)
+
+        self.index.remove(make_infraction(1, 10))
+        self.index.add(make_infraction(2, 11))
+        fetched.set_result([make_infraction(1, 10), make_infraction(3, 12)])
+        await reconcile
+
+        self.assertIsNone(self.index.get(10, "ban"))
+        self.assertEqual(self.index.get(11, "ban")["id"], 2)
+        self.assertEqual(self.index.get(12, "ban")["id"], 3)
+
+
+class IndexedLookupTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for answering active infraction lookups from the index."""
+
+    async def asyncSetUp(self):
+        self.bot = MockBot()
+        self.cog = Infractions(self.bot)
+        self.member = MockMember(id=10)
+        self.ctx = MockContext(bot=self.bot)
+
+    async def test_get_active_infraction_from_index(self):
+        """Once the index is warm, active infractions should be looked up without the API."""
+        self.bot.api_client.get.return_value = []
+        self.assertIsNone(await _utils.get_active_infraction(
+            self.ctx, self.member, "ban", index=self.cog.active_infractions
+        ))
+        self.bot.api_client.get.assert_awaited_once()
+
+        self.bot.api_client.get.reset_mock()
+        await self.cog.active_infractions.reconcile(AsyncMock(return_value=[make_infraction(1, 10)])(), permanent=True)
+        await self.cog.active_infractions.reconcile(AsyncMock(return_value=[])(), permanent=False)
+        result = await _utils.get_active_infraction(self.ctx, self.member, "ban", index=self.cog.active_infractions)
+
+        self.assertEqual(result["id"], 1)
+        self.bot.api_client.get.assert_not_awaited()
+        self.ctx.send.assert_awaited_once()
+
+    async def test_reconcile_schedules_temporary_infractions(self):
+        """Reconciling should index the permanent and temporary infractions separately, scheduling temporary ones."""
+        permanent = make_infraction(1, 10)
+        temporary = make_infraction(2, 11, type_="timeout", expires_at="2100-01-01T00:00:00+00:00")
+        self.bot.api_client.get.side_effect = [[temporary], [permanent]]
+        self.cog.schedule_expiration = MagicMock()
+
+        await self.cog.reconcile_active_infractions(permanent=False)
+        await self.cog.reconcile_active_infractions(permanent=True)
+
+        self.assertEqual(len(self.cog.active_infractions), 2)
+        self.cog.schedule_expiration.assert_called_once_with(temporary)
+        params = [call.kwargs["params"]["permanent"] for call in self.bot.api_client.get.await_args_list]
+        self.assertEqual(params, ["false", "true"])
+
+    async def test_on_member_join_uses_index(self):
+        """Returning members should be checked for active timeouts in the index once it's warm."""
+        for permanent in (False, True):
+            await self.cog.active_infractions.reconcile(AsyncMock(return_value=[])(), permanent=permanent)
+        self.cog.reapply_infraction = AsyncMock()
+
+        await self.cog.on_member_join(self.member)
+
+        self.bot.api_client.get.assert_not_awaited()
+        self.cog.reapply_infraction.assert_not_awaited()
+
+
+class EditedInfractionIndexTests(unittest.TestCase):
+    """Tests for finding the index to update after an infraction is edited."""
+
+    def test_scheduler_of_infraction_type(self):
+        """The cog which handles the type of the edited infraction should be returned."""
+        bot = MockBot()
+        infractions, superstarify = Infractions(bot), Superstarify(bot)
+        bot.cogs = {"Infractions": infractions, "Superstarify": superstarify}
+        cog = ModManagement(bot)
+
+        self.assertIs(cog._get_scheduler("superstar"), superstarify)
+        self.assertIs(cog._get_scheduler("ban"), infractions)
+        self.assertIsNone(cog._get_scheduler("unknown"))
@@ -123,7 +123,9 @@ class VoiceMuteTests(unittest.IsolatedAsyncioTestCase):
         """Should return early when user already have Voice Mute infraction."""
         get_active_infraction.return_value = {"foo": "bar"}
         self.assertIsNone(await self.cog.apply_voice_mute(self.ctx, self.user, "foobar"))
-        get_active_infraction.assert_awaited_once_with(self.ctx, self.user, "voice_mute")
+        get_active_infraction.assert_awaited_once_with(
+            self.ctx, self.user, "voice_mute", index=self.cog.active_infractions
+        )
         post_infraction_mock.assert_not_awaited()
 
     @patch("bot.exts.moderation.infraction.infractions._utils.post_infraction")
@@ -1,4 +1,7 @@
+import asyncio
 import unittest
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from bot.exts.moderation.clean import Clean
@@ -102,3 +105,113 @@ class CleanTests(unittest.IsolatedAsyncioTestCase):
         sent_message = mocked_mods.send.await_args[0][0]
         self.assertIn(self.log_url, sent_message)
         self.assertIn("2 messages", sent_message)
+
+    @patch("bot.exts.moderation.clean.is_mod_channel", MagicMock(return_value=True))
+    async def test_clean_searches_history_only_for_uncached_channels(self):
+        """Clean command should only search the histories of channels which aren't fully cached."""
+        self.ctx.reply = AsyncMock()
+        cached, uncached = MockTextChannel(id=1), MockTextChannel(id=2)
+        self.cog._use_cache = MagicMock(side_effect=lambda channel, _limit: channel is cached)
+        self.cog._get_messages_from_cache = MagicMock(return_value=(defaultdict(list), []))
+        self.cog._clean_channels = AsyncMock(return_value=[])
+
+        await self.cog._clean_messages(
+            self.ctx,
+            [cached, uncached],
+            first_limit=datetime(2020, 1, 1, tzinfo=UTC),
+            attempt_delete_invocation=False,
+        )
+
+        self.assertEqual(self.cog._get_messages_from_cache.call_args.kwargs["channels"], {cached})
+        self.assertEqual(self.cog._clean_channels.await_args.kwargs["channels"], {uncached})
+
+    def test_cache_search_uses_author_index(self):
+        """Searching the cache for the messages of specific users should only look at those users' messages."""
+        channel = MockTextChannel(id=1)
+        start = datetime(2020, 1, 1, tzinfo=UTC)
+        messages = [
+            MockMessage(id=id_, channel=channel, author=author, created_at=start + timedelta(minutes=id_))
+            for id_, author in ((1, self.user), (2, self.mod), (3, self.user))
+        ]
+        for message in messages:
+            self.cog.message_index.add(message)
+        self.cog.cleaning = True
+        self.cog.message_index.channel_history = MagicMock()
+
+        mappings, message_ids = self.cog._get_messages_from_cache({channel}, lambda _: True, start, users=[self.user])
+
+        self.assertEqual(mappings[channel], [messages[2], messages[0]])
+        self.assertEqual(message_ids, [3, 1])
+        self.cog.message_index.channel_history.assert_not_called()
+
+
+class CleanChannelsTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for scanning and cleaning channel histories concurrently."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.ctx = MockContext(bot=self.bot)
+        self.cog = Clean(self.bot)
+        self.cog.cleaning = True
+        self.start = datetime(2020, 1, 1, tzinfo=UTC)
+
+        self.scanning = 0
+        self.most_scanning = 0
+        self.events = []
+
+    def make_channel(self, id_: int, messages: int) -> MockTextChannel:
+        channel = MockTextChannel(id=id_)
+        history = [MockMessage(id=id_ * 100 + i, channel=channel) for i in range(messages)]
+
+        async def iterate_history(**_kwargs):
+            self.scanning += 1
+            self.most_scanning = max(self.most_scanning, self.scanning)
+            for message in history:
+                await asyncio.sleep(0.001)
+                yield message
+            self.scanning -= 1
+            self.events.append(f"scanned {id_}")
+
+        channel.history = iterate_history
+        return channel
+
+    async def delete_found(self, mappings: dict) -> list:
+        [(channel, messages)] = mappings.items()
+        self.events.append(f"deleting {channel.id}")
+        return messages
+
+    async def test_channels_scanned_concurrently(self):
+        """Up to the configured amount of channel histories should be scanned at once, deleting all found messages."""
+        channels = {self.make_channel(id_, 5) for id_ in range(1, 8)}
+        self.cog._delete_found = AsyncMock(side_effect=self.delete_found)
+
+        with patch("bot.exts.moderation.clean.CleanMessages.scan_concurrency", 3):
+            deleted = await self.cog._clean_channels(self.ctx, channels, lambda _: True, self.start)
+
+        self.assertEqual(self.most_scanning, 3)
+        self.assertEqual(len(deleted), 35)
+        self.assertEqual(self.cog._delete_found.await_count, 7)
+
+    async def test_deletion_overlaps_scanning(self):
+        """A channel should be cleaned as soon as it's scanned, while the other channels are still being scanned."""
+        channels = {self.make_channel(1, 1), self.make_channel(2, 50)}
+        self.cog._delete_found = AsyncMock(side_effect=self.delete_found)
+
+        await self.cog._clean_channels(self.ctx, channels, lambda _: True, self.start)
+
+        self.assertLess(self.events.index("deleting 1"), self.events.index("scanned 2"))
+
+    async def test_cancelled_clean_stops_scanning(self):
+        """Cancelling the clean should stop scanning, keeping only what was already deleted."""
+        channels = {self.make_channel(1, 1), self.make_channel(2, 50)}
+
+        async def delete_and_cancel(mappings: dict) -> list:
+            self.cog.cleaning = False
+            return await self.delete_found(mappings)
+
+        self.cog._delete_found = AsyncMock(side_effect=delete_and_cancel)
+
+        deleted = await self.cog._clean_channels(self.ctx, channels, lambda _: True, self.start)
+
+        self.assertEqual([message.id for message in deleted], [100])
+        self.assertNotIn("scanned 2", self.events)
@@ -0,0 +1,131 @@
+import json
+import unittest
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+from bot.exts.moderation import metabase
+from bot.exts.moderation.metabase import Metabase, MetabaseExport, _ExportCache, iter_csv_records, iter_json_rows
+
+
+class FakeStream:
+    """A stream which returns its data in chunks of a fixed size."""
+
+    def __init__(self, data: bytes, chunk_size: int = 7):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def iter_chunked(self, _size: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(self.data), self.chunk_size):
+            yield self.data[start:start + self.chunk_size]
+
+
+async def collect(iterator: AsyncIterator) -> list:
+    return [item async for item in iterator]
+
+
+class StreamingParseTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for parsing exports incrementally as they arrive."""
+
+    async def test_csv_records_split_across_chunks(self):
+        """Records should be reassembled across chunks, including quoted newlines and split characters."""
+        data = 'name,note\r\nLemon,"sour\r\nyellow"\r\nCafé,sweet\r\n'.encode()
+
+        records = await collect(iter_csv_records(FakeStream(data, chunk_size=3)))
+
+        self.assertEqual(records, ["name,note\r\n", 'Lemon,"sour\r\nyellow"\r\n', "Café,sweet\r\n"])
+
+    async def test_json_rows_split_across_chunks(self):
+        """Rows of a JSON array should be yielded once each of them has arrived."""
+        rows = [{"id": 1, "name": 'Lemon, "the" [fruit]'}, {"id": 2, "name": None}]
+
+        data = json.dumps(rows).encode()
+        parsed = await collect(iter_json_rows(FakeStream(data, chunk_size=5)))
+
+        self.assertEqual([row for row, _ in parsed], rows)
+        self.assertEqual(sum(size for _, size in parsed), len(data) - len("[, ]"))
+
+    async def test_json_not_an_array(self):
+        """A JSON export which isn't an array or is cut off should be an error."""
+        for data in (b'{"error": "oops"}', b'[{"id": 1}, {"id"'):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                await collect(iter_json_rows(FakeStream(data)))
+
+
+class ReadExportTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for reading exports into the columnar export and the paste."""
+
+    async def test_json_paste_formatted(self):
+        """The paste of a JSON export should be formatted like the whole export dumped at once."""
+        rows = [{"b": 1, "a": [1, 2]}, {"a": None, "b": 2}]
+
+        export, paste = await Metabase._read_json_export(FakeStream(json.dumps(rows).encode()))
+
+        self.assertEqual(paste.read(), json.dumps(rows, indent=4, sort_keys=True))
+        self.assertEqual(list(export), rows)
+        self.assertEqual(export.column("b"), [1, 2])
+
+    async def test_empty_json_export(self):
+        """An empty JSON export should be pasted as an empty array."""
+        export, paste = await Metabase._read_json_export(FakeStream(b"[]"))
+
+        self.assertEqual(paste.read(), "[]")
+        self.assertEqual(len(export), 0)
+
+    async def test_rows_capped(self):
+        """Reading should stop at the row cap, and the export should be marked as truncated."""
+        data = "id\n" + "".join(f"{i}\n" for i in range(10))
+
+        with patch.object(metabase.MetabaseConfig, "max_export_rows", 4):
+            export, paste = await Metabase._read_csv_export(FakeStream(data.encode()))
+
+        self.assertTrue(export.truncated)
+        self.assertEqual(export.column("id"), ["0", "1", "2", "3"])
+        self.assertEqual(paste.read(), "id\n0\n1\n2\n3\n")
+
+    async def test_bytes_capped(self):
+        """Reading should stop once the rows exceed the byte cap, and the export should be marked as truncated."""
+        csv_data = "id\n" + "".join(f"{i}\n" for i in range(10))
+        json_data = json.dumps([{"id": i} for i in range(10)])
+
+        with patch.object(metabase.MetabaseConfig, "max_export_bytes", 6):
+            csv_export, _ = await Metabase._read_csv_export(FakeStream(csv_data.encode()))
+            json_export, _ = await Metabase._read_json_export(FakeStream(json_data.encode()))
+
+        self.assertTrue(csv_export.truncated)
+        self.assertEqual(csv_export.column("id"), ["0", "1", "2"])
+        self.assertTrue(json_export.truncated)
+        self.assertEqual(len(json_export), 0)
+
+    async def test_paste_capped(self):
+        """Rows which would exceed the paste size limit should be left out of the paste, but kept in the export."""
+        data = "id\n" + "".join(f"{i}\n" for i in range(10))
+
+        with patch.object(metabase, "MAX_PASTE_SIZE", 10):
+            export, paste = await Metabase._read_csv_export(FakeStream(data.encode()))
+
+        self.assertFalse(export.truncated)
+        self.assertEqual(len(export), 10)
+        self.assertEqual(paste.rows, 3)
+        self.assertEqual(paste.read(), "id\n0\n1\n2\n")
+
+
+class ExportStorageTests(unittest.TestCase):
+    """Tests for keeping exports around for internal eval."""
+
+    def test_rows_with_different_columns(self):
+        """Columns added by later rows should be filled in with None for the earlier rows."""
+        export = MetabaseExport()
+        export.append_mapping({"a": 1})
+        export.append_mapping({"b": 2})
+
+        self.assertEqual(list(export), [{"a": 1, "b": None}, {"a": None, "b": 2}])
+
+    def test_least_recently_used_export_evicted(self):
+        """Once the cache is full, the export which wasn't accessed for the longest should be evicted."""
+        exports = _ExportCache(max_size=2)
+        exports[1] = MetabaseExport()
+        exports[2] = MetabaseExport()
+        self.assertEqual(len(exports[1]), 0)
+        exports[3] = MetabaseExport()
+
+        self.assertEqual(list(exports), [1, 3])
@@ -1,10 +1,11 @@
 import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import discord
 
 from bot.exts.moderation.modlog import ModLog
 from bot.utils.modlog import send_log_message
-from tests.helpers import MockBot, MockTextChannel
+from tests.helpers import MockBot, MockMember, MockMessage, MockTextChannel
 
 
 class ModLogTests(unittest.IsolatedAsyncioTestCase):
@@ -25,7 +26,74 @@ class ModLogTests(unittest.IsolatedAsyncioTestCase):
             title="bar",
             text="foo bar" * 3000
         )
-        embed = self.channel.send.call_args[1]["embed"]
+        embed = self.channel.send.call_args[1]["embeds"][0]
         self.assertEqual(
             embed.description, ("foo bar" * 3000)[:4093] + "..."
         )
+
+
+class RawMessageEditTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for logging edits of messages which aren't cached."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = ModLog(self.bot)
+        self.channel = MockTextChannel(id=1)
+        self.channel.fetch_message = AsyncMock()
+        self.message = MockMessage(id=2, channel=self.channel, author=MockMember(bot=False))
+
+        self.cog.is_channel_ignored = MagicMock(return_value=False)
+        self.cog.is_message_blacklisted = MagicMock(return_value=False)
+        get_channel_patcher = patch(
+            "bot.exts.moderation.modlog.get_or_fetch_channel", AsyncMock(return_value=self.channel)
+        )
+        self.get_or_fetch_channel = get_channel_patcher.start()
+        self.addCleanup(get_channel_patcher.stop)
+        send_log_patcher = patch("bot.exts.moderation.modlog.send_log_message", AsyncMock())
+        self.send_log_message = send_log_patcher.start()
+        self.addCleanup(send_log_patcher.stop)
+
+    def make_event(self, data: dict, cached: bool = False) -> MagicMock:
+        return MagicMock(
+            guild_id=3,
+            channel_id=self.channel.id,
+            message_id=self.message.id,
+            data=data,
+            message=self.message,
+            cached_message=self.message if cached else None,
+        )
+
+    async def test_cached_message_skipped(self):
+        """An edit of a cached message should be left to the cached event, without any requests."""
+        await self.cog.on_raw_message_edit(self.make_event({}, cached=True))
+
+        self.get_or_fetch_channel.assert_not_awaited()
+        self.send_log_message.assert_not_awaited()
+        self.bot.stats.incr.assert_called_once_with("mod_log.edit_fetches_avoided")
+
+    async def test_ignored_channel_not_fetched(self):
+        """An edit in an ignored channel shouldn't fetch the message."""
+        self.cog.is_channel_ignored.return_value = True
+
+        await self.cog.on_raw_message_edit(self.make_event({}))
+
+        self.channel.fetch_message.assert_not_awaited()
+        self.send_log_message.assert_not_awaited()
+
+    async def test_logged_from_payload(self):
+        """An edit with the whole message in the payload should be logged without fetching the message."""
+        await self.cog.on_raw_message_edit(self.make_event({"content": "new", "author": {}}))
+
+        self.channel.fetch_message.assert_not_awaited()
+        self.assertEqual(self.send_log_message.await_count, 2)
+        self.bot.stats.incr.assert_called_once_with("mod_log.edit_fetches_avoided")
+
+    async def test_fetched_without_content(self):
+        """An edit without the message's content in the payload should fetch the message to log it."""
+        self.channel.fetch_message.return_value = self.message
+
+        await self.cog.on_raw_message_edit(self.make_event({"embeds": []}))
+
+        self.channel.fetch_message.assert_awaited_once_with(self.message.id)
+        self.assertEqual(self.send_log_message.await_count, 2)
+        self.bot.stats.incr.assert_not_called()
@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+from discord.utils import utcnow
+
+from bot.exts.moderation.watchchannels import _watchchannel
+from bot.exts.moderation.watchchannels.bigbrother import BigBrother
+from tests.helpers import MockAsyncWebhook, MockAttachment, MockBot, MockMember, MockMessage, MockTextChannel
+
+
+class WatchChannelRelayTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for relaying the queued messages of watched users to the webhook."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = BigBrother(self.bot)
+        self.cog.webhook = MockAsyncWebhook()
+        self.cog.webhook.guild.filesize_limit = 10_000
+        self.cog.watched_users = {1: {"actor": 2, "inserted_at": utcnow(), "reason": "Testing"}}
+        self.cog.send_header = AsyncMock()
+
+        self.author = MockMember(id=1, display_name="Watched")
+        self.channel = MockTextChannel(id=3)
+
+    def make_message(self, content: str, **kwargs) -> MockMessage:
+        return MockMessage(
+            author=self.author,
+            channel=self.channel,
+            content=content,
+            clean_content=content,
+            embeds=[],
+            created_at=utcnow() - timedelta(seconds=1),
+            **kwargs,
+        )
+
+    def queue(self, *messages: MockMessage) -> None:
+        for message in messages:
+            self.cog.message_queue[message.author.id][message.channel.id].append(message)
+
+    @property
+    def sent_contents(self) -> list[str]:
+        return [call.kwargs["content"] for call in self.cog.webhook.send.call_args_list]
+
+    async def test_consecutive_messages_packed(self):
+        """Consecutive messages of an author in a channel should be relayed in a single webhook message."""
+        self.queue(*(self.make_message(f"message {i}") for i in range(3)))
+
+        await self.cog.consume_messages(delay_consumption=False)
+
+        self.cog.send_header.assert_awaited_once()
+        self.assertEqual(self.sent_contents, ["message 0\nmessage 1\nmessage 2"])
+        self.assertEqual(self.cog.message_history.message_count, 3)
+
+    async def test_packed_content_within_limit(self):
+        """Messages should be split across webhook messages rather than exceed the content limit."""
+        self.queue(*(self.make_message(str(i) * 800) for i in range(3)))
+
+        await self.cog.consume_messages(delay_consumption=False)
+
+        self.assertEqual(self.sent_contents, [f"{'0' * 800}\n{'1' * 800}", "2" * 800])
+
+    async def test_header_repeated_after_limit(self):
+        """A new header should be sent once the header message limit is reached, and packing restart after it."""
+        with patch.object(_watchchannel.BigBrotherConfig, "header_message_limit", 2):
+            self.queue(*(self.make_message(f"message {i}") for i in range(3)))
+            await self.cog.consume_messages(delay_consumption=False)
+
+        self.assertEqual(self.cog.send_header.await_count, 2)
+        self.assertEqual(self.sent_contents, ["message 0\nmessage 1", "message 2"])
+
+    async def test_attachments_read_concurrently(self):
+        """Attachments should be downloaded at once, and uploaded together after the message they belong to."""
+        reading = 0
+        most_reading = 0
+
+        async def read() -> bytes:
+            nonlocal reading, most_reading
+            reading += 1
+            most_reading = max(most_reading, reading)
+            await asyncio.sleep(0.01)
+            reading -= 1
+            return b"image"
+
+        attachments = [MockAttachment(filename=f"{i}.png", size=5, read=read) for i in range(3)]
+        large = MockAttachment(filename="large.png", size=20_000, url="https://example.com/large.png")
+        self.queue(self.make_message("look", attachments=[*attachments, large]), self.make_message("after"))
+
+        await self.cog.consume_messages(delay_consumption=False)
+
+        self.assertEqual(most_reading, 3)
+        calls = self.cog.webhook.send.call_args_list
+        self.assertEqual([call.kwargs["content"] for call in calls], ["look", None, "after"])
+        self.assertEqual([file.filename for file in calls[1].kwargs["files"]], ["0.png", "1.png", "2.png"])
+        self.assertIn("large.png", calls[1].kwargs["embeds"][0].description)
+
+    async def test_unavailable_attachment_reported(self):
+        """Attachments which can't be retrieved should be reported with an embed."""
+        read = AsyncMock(side_effect=discord.NotFound(MagicMock(status=404), "Unknown"))
+        self.queue(self.make_message("", attachments=[MockAttachment(size=5, read=read)]))
+
+        await self.cog.consume_messages(delay_consumption=False)
+
+        self.cog.webhook.send.assert_awaited_once()
+        embed = self.cog.webhook.send.call_args.kwargs["embeds"][0]
+        self.assertIn("could not be retrieved", embed.description)
+
+    async def test_stats_recorded(self):
+        """The relay lag of each message and the queue depth should be reported."""
+        self.queue(*(self.make_message(f"message {i}") for i in range(2)))
+
+        await self.cog.consume_messages(delay_consumption=False)
+
+        lags = [call.args for call in self.bot.stats.timing.call_args_list]
+        self.assertEqual([name for name, _ in lags], ["watchchannels.bigbrother.relay_lag"] * 2)
+        self.assertTrue(all(lag >= 1000 for _, lag in lags))
+        self.bot.stats.gauge.assert_called_with("watchchannels.bigbrother.queue_depth", 0)
@@ -1,8 +1,8 @@
-import unittest
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, Mock, patch
 
 from bot.exts.recruitment.talentpool import _review
+from tests.base import RedisTestCase
 from tests.helpers import MockBot, MockMember, MockMessage, MockReaction, MockTextChannel
 
 
@@ -44,7 +44,7 @@ def nomination(
     )
 
 
-class ReviewerTests(unittest.IsolatedAsyncioTestCase):
+class ReviewerTests(RedisTestCase):
     """Tests for the talentpool reviewer."""
 
     def setUp(self):
@@ -63,95 +63,88 @@ class ReviewerTests(unittest.IsolatedAsyncioTestCase):
         """Tests for the `is_ready_for_review` function."""
         too_recent = datetime.now(UTC) - timedelta(hours=1)
         not_too_recent = datetime.now(UTC) - timedelta(days=7)
-        ticket_reaction = MockReaction(users=[self.bot_user], emoji="\N{TICKET}")
 
         cases = (
             # Only one active review, and not too recent, so ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="wookie for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=not_too_recent),
-                ],
-                not_too_recent.timestamp(),
-                True,
-            ),
+            ({1: False}, not_too_recent.timestamp(), True),
 
             # Three active reviews, so not ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="Chrisjl for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Zig for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Scaleios for Helper!", created_at=not_too_recent),
-                ],
-                not_too_recent.timestamp(),
-                False,
-            ),
+            ({1: False, 2: False, 3: False}, not_too_recent.timestamp(), False),
 
             # Only one active review, but too recent, so not ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="Chrisjl for Helper!", created_at=too_recent),
-                ],
-                too_recent.timestamp(),
-                False,
-            ),
+            ({1: False}, too_recent.timestamp(), False),
 
             # Only two active reviews, and not too recent, so ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=too_recent),
-                    MockMessage(author=self.bot_user, content="wookie for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="wookie for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=not_too_recent),
-                ],
-                not_too_recent.timestamp(),
-                True,
-            ),
+            ({1: False, 2: False}, not_too_recent.timestamp(), True),
 
             # Over the active threshold, but below the total threshold
-            (
-                [
-                    MockMessage(
-                        author=self.bot_user,
-                        content="joe for Helper!",
-                        created_at=not_too_recent,
-                        reactions=[ticket_reaction]
-                    )
-                ] * 6,
-                not_too_recent.timestamp(),
-                True
-            ),
+            ({i: True for i in range(6)}, not_too_recent.timestamp(), True),
 
             # Over the total threshold
-            (
-                [
-                    MockMessage(
-                        author=self.bot_user,
-                        content="joe for Helper!",
-                        created_at=not_too_recent,
-                        reactions=[ticket_reaction]
-                    )
-                ] * 11,
-                not_too_recent.timestamp(),
-                False
-            ),
+            ({i: True for i in range(11)}, not_too_recent.timestamp(), False),
 
-            # No messages, so ready.
-            ([], None, True),
+            # No reviews, so ready.
+            ({}, None, True),
         )
 
-        for messages, last_review_timestamp, expected in cases:
-            with self.subTest(messages=messages, expected=expected):
-                self.voting_channel.history = AsyncIterator(messages)
-
-                cache_get_mock = AsyncMock(return_value=last_review_timestamp)
-                self.reviewer.status_cache.get = cache_get_mock
+        for reviews, last_review_timestamp, expected in cases:
+            with self.subTest(reviews=reviews, expected=expected):
+                await self.flush()
+                await self.reviewer.status_cache.set("last_reconcile_date", datetime.now(UTC).timestamp())
+                if last_review_timestamp:
+                    await self.reviewer.status_cache.set("last_vote_date", last_review_timestamp)
+                if reviews:
+                    await self.reviewer.review_cache.update(reviews)
 
                 res = await self.reviewer.is_ready_for_review()
 
                 self.assertIs(res, expected)
-                cache_get_mock.assert_called_with("last_vote_date")
+                self.voting_channel.history.assert_not_called()
+
+    async def test_reviews_reconciled_with_history(self):
+        """The tracked reviews should be replaced with the reviews in the voting channel once they're due."""
+        ticket_reaction = MockReaction(users=[self.bot_user], emoji="\N{TICKET}")
+        messages = [
+            MockMessage(id=1, author=self.bot_user, content="wookie for Helper!"),
+            MockMessage(id=2, author=self.bot_user, content="Not a review"),
+            MockMessage(id=3, author=self.bot_user, content="joe for Helper!", reactions=[ticket_reaction]),
+            MockMessage(id=4, author=MockMember(bot=False), content="Chrisjl for Helper!"),
+        ]
+        self.voting_channel.history = AsyncIterator(messages)
+        await self.reviewer.review_cache.set(5, False)
+        last_reconcile = datetime.now(UTC) - _review.RECONCILE_INTERVAL - timedelta(minutes=1)
+        await self.reviewer.status_cache.set("last_reconcile_date", last_reconcile.timestamp())
+
+        self.assertTrue(await self.reviewer.is_ready_for_review())
+
+        self.assertEqual(await self.reviewer.review_cache.to_dict(), {1: False, 3: True})
+        self.assertGreater(await self.reviewer.status_cache.get("last_reconcile_date"), last_reconcile.timestamp())
+
+    async def test_review_events_tracked(self):
+        """Reviews should be tracked as they're ticketed and deleted, ignoring untracked messages."""
+        await self.reviewer.review_cache.update({1: False, 2: False})
+
+        await self.reviewer.mark_review_ticketed(1)
+        await self.reviewer.mark_review_ticketed(3)
+        await self.reviewer.forget_review(2)
+
+        self.assertEqual(await self.reviewer.review_cache.to_dict(), {1: True})
+
+    async def test_removed_ticket_tracked(self):
+        """Reviews should be tracked as not ticketed once their last ticket is removed, ignoring untracked messages."""
+        await self.reviewer.review_cache.update({1: True, 2: True})
+        ticket_reaction = MockReaction(users=[MockMember()], emoji="\N{TICKET}")
+        thumbs_up_reaction = MockReaction(users=[MockMember()], emoji="\N{THUMBS UP SIGN}")
+        messages = {
+            1: MockMessage(id=1, reactions=[thumbs_up_reaction]),
+            2: MockMessage(id=2, reactions=[ticket_reaction]),
+            3: MockMessage(id=3, reactions=[]),
+        }
+
+        for message_id, message in messages.items():
+            await self.reviewer.unmark_review_ticketed(Mock(id=message_id, fetch=AsyncMock(return_value=message)))
+
+        self.assertEqual(await self.reviewer.review_cache.to_dict(), {1: False, 2: True})
 
     @patch("bot.exts.recruitment.talentpool._review.MIN_NOMINATION_TIME", timedelta(days=7))
     async def test_get_nomination_to_review(self):
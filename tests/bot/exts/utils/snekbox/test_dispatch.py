@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import aiohttp
+
+from bot.exts.utils.snekbox import _dispatch
+from bot.exts.utils.snekbox._dispatch import JobDispatcher
+from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
+from scripts.snekbox_stub import SnekboxStub
+from tests.helpers import MockBot
+
+
+class JobDispatcherTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for queueing jobs fairly between users and reusing their results."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.started = []
+        self.release = asyncio.Event()
+        self.dispatcher = JobDispatcher(self.bot, self.execute)
+
+    @staticmethod
+    async def settle() -> None:
+        """Let the submitted jobs run until they're waiting in the queue or on the release."""
+        await asyncio.sleep(0.01)
+
+    async def execute(self, job: EvalJob) -> EvalResult:
+        self.started.append(job.args[0])
+        await self.release.wait()
+        return EvalResult(job.args[0], 0)
+
+    async def test_concurrency_bounded_per_version(self):
+        """At most the configured amount of jobs should run at once on each version."""
+        with patch.object(_dispatch.SnekboxJobs, "concurrency", 2):
+            tasks = [
+                asyncio.create_task(self.dispatcher.submit(EvalJob([f"{version}-{i}"], version=version), i))
+                for version in ("3.12", "3.13")
+                for i in range(3)
+            ]
+            await self.settle()
+
+            self.assertEqual(self.started, ["3.12-0", "3.12-1", "3.13-0", "3.13-1"])
+            self.assertEqual(self.dispatcher.waiting("3.12"), 1)
+
+            self.release.set()
+            results = await asyncio.gather(*tasks)
+
+        self.assertEqual([result.stdout for result in results][:3], ["3.12-0", "3.12-1", "3.12-2"])
+        self.assertEqual(self.dispatcher.running("3.12"), 0)
+        self.assertEqual(self.dispatcher.running("3.13"), 0)
+
+    async def test_users_take_turns(self):
+        """Once a version is at capacity, waiting jobs should be run in turns between users."""
+        with patch.object(_dispatch.SnekboxJobs, "concurrency", 1):
+            tasks = [asyncio.create_task(self.dispatcher.submit(EvalJob(["spam-0"]), "spammer"))]
+            await self.settle()
+            tasks += [asyncio.create_task(self.dispatcher.submit(EvalJob([f"spam-{i}"]), "spammer")) for i in (1, 2)]
+            tasks += [asyncio.create_task(self.dispatcher.submit(EvalJob([name]), name)) for name in ("a", "b")]
+            await self.settle()
+
+            self.release.set()
+            await asyncio.gather(*tasks)
+
+        self.assertEqual(self.started, ["spam-0", "spam-1", "a", "b", "spam-2"])
+
+    async def test_cancelled_waiting_job_leaves_queue(self):
+        """A job cancelled while waiting should be removed from the queue without taking a slot."""
+        with patch.object(_dispatch.SnekboxJobs, "concurrency", 1):
+            running = asyncio.create_task(self.dispatcher.submit(EvalJob(["first"]), 1))
+            await self.settle()
+            waiting = asyncio.create_task(self.dispatcher._run(EvalJob(["second"]), 2))
+            await self.settle()
+            self.assertEqual(self.dispatcher.waiting("3.12"), 1)
+            waiting.cancel()
+            await self.settle()
+
+            self.assertEqual(self.dispatcher.waiting("3.12"), 0)
+            self.release.set()
+            await running
+
+        self.assertEqual(self.started, ["first"])
+        self.assertEqual(self.dispatcher.running("3.12"), 0)
+
+    async def test_identical_jobs_reuse_result(self):
+        """Identical jobs should share a single execution, and later ones should reuse its result."""
+        self.release.set()
+        job = EvalJob.from_code("print(1)")
+
+        first, second = await asyncio.gather(self.dispatcher.submit(job, 1), self.dispatcher.submit(job, 2))
+        third = await self.dispatcher.submit(job, 3)
+        await self.dispatcher.submit(job.as_version("3.13"), 3)
+
+        self.assertEqual(self.started, ["main.py", "main.py"])
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.bot.stats.incr.assert_called_once_with("snekbox.results.reused")
+
+    async def test_failed_result_not_reused(self):
+        """Results of evaluations which failed should not be reused."""
+        async def fail(job: EvalJob) -> EvalResult:
+            self.started.append(job.args[0])
+            return EvalResult("Internal error", None)
+
+        self.dispatcher._execute = fail
+        job = EvalJob.from_code("print(1)")
+        await self.dispatcher.submit(job, 1)
+        await self.dispatcher.submit(job, 1)
+
+        self.assertEqual(len(self.started), 2)
+
+    async def test_killed_result_not_reused(self):
+        """Results of evaluations killed by a signal, such as a timeout, should not be reused."""
+        async def kill(job: EvalJob) -> EvalResult:
+            self.started.append(job.args[0])
+            return EvalResult("", 137)
+
+        self.dispatcher._execute = kill
+        job = EvalJob.from_code("while True: pass")
+        await self.dispatcher.submit(job, 1)
+        await self.dispatcher.submit(job, 1)
+
+        self.assertEqual(len(self.started), 2)
+
+    async def test_jobs_sent_to_snekbox(self):
+        """Jobs should be evaluated by the snekbox server, with the wait and execution times recorded."""
+        stub = SnekboxStub(delay=0.01)
+        url = await stub.start()
+        self.addAsyncCleanup(stub.stop)
+
+        async with aiohttp.ClientSession() as session:
+            async def post(job: EvalJob) -> EvalResult:
+                async with session.post(url, json=job.to_dict(), raise_for_status=True) as resp:
+                    return EvalResult.from_dict(await resp.json())
+
+            dispatcher = JobDispatcher(self.bot, post)
+            with patch.object(_dispatch.SnekboxJobs, "concurrency", 2):
+                results = await asyncio.gather(
+                    *(dispatcher.submit(EvalJob.from_code(f"print({i})"), i) for i in range(5))
+                )
+
+        self.assertEqual(results[3].stdout, "main.py\nprint(3)")
+        self.assertEqual(len(stub.jobs), 5)
+        self.assertEqual(stub.most_running["/snekbin/python/3.12/bin/python"], 2)
+        timings = [call.args[0] for call in self.bot.stats.timing.call_args_list]
+        self.assertEqual(timings.count("snekbox.queue_wait"), 5)
+        self.assertEqual(timings.count("snekbox.exec_time"), 5)
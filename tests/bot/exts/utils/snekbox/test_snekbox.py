@@ -318,7 +318,7 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
         expected_allowed_mentions = AllowedMentions(everyone=False, roles=False, users=[ctx.author])
         self.assertEqual(allowed_mentions.to_dict(), expected_allowed_mentions.to_dict())
 
-        self.cog.post_job.assert_called_once_with(job)
+        self.cog.post_job.assert_called_once_with(job, user_id=ctx.author.id)
         self.cog.format_output.assert_called_once_with("")
         self.cog.upload_output.assert_not_called()
 
@@ -346,7 +346,7 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
             "\n\n```ansi\nWay too long beard\n```\nFull output: lookatmybeard.com"
         )
 
-        self.cog.post_job.assert_called_once_with(job)
+        self.cog.post_job.assert_called_once_with(job, user_id=ctx.author.id)
         self.cog.format_output.assert_called_once_with("Way too long beard")
 
     async def test_send_job_with_non_zero_eval(self):
@@ -372,7 +372,7 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
             "\n\n```ansi\nERROR\n```"
         )
 
-        self.cog.post_job.assert_called_once_with(job)
+        self.cog.post_job.assert_called_once_with(job, user_id=ctx.author.id)
         self.cog.upload_output.assert_not_called()
 
     async def test_send_job_with_disallowed_file_ext(self):
@@ -405,7 +405,7 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
         )
         self.assertIn("Files with disallowed extensions can't be uploaded: **.disallowed, .disallowed2, ...**", res)
 
-        self.cog.post_job.assert_called_once_with(job)
+        self.cog.post_job.assert_called_once_with(job, user_id=ctx.author.id)
         self.cog.upload_output.assert_not_called()
 
     @patch("bot.exts.utils.snekbox._cog.partial")
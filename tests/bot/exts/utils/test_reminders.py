@@ -0,0 +1,142 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.utils import reminders
+from bot.exts.utils.reminders import Reminders
+from tests.helpers import MockBot, MockContext, MockGuild, MockMember, MockRole, MockTextChannel
+
+
+def make_reminder(id_: int, expiration: str, mentions: list[int] | None = None) -> dict:
+    return {
+        "id": id_,
+        "author": 1,
+        "channel_id": 2,
+        "content": "Content",
+        "expiration": expiration,
+        "jump_url": "https://discord.com/channels/1/2/3",
+        "mentions": mentions or [],
+    }
+
+
+class OverdueRemindersTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for catching up on the reminders which became due while the bot was down."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = Reminders(self.bot)
+        self.cog.scheduler = MagicMock()
+        self.cog.scheduler.schedule_at.side_effect = lambda _time, _task_id, coroutine: coroutine.close()
+
+        self.channel = MockTextChannel()
+        self.reply = self.channel.get_partial_message.return_value.reply = AsyncMock()
+        self.bot.get_channel.return_value = self.channel
+
+        self.guild = MockGuild()
+        self.guild.get_member.return_value = None
+        self.guild.get_role.return_value = None
+        self.bot.get_guild.return_value = self.guild
+
+    async def test_cog_load_does_not_wait_for_overdue_reminders(self):
+        """Future reminders should be scheduled right away, and overdue ones sent in the background."""
+        self.bot.api_client.get.return_value = [
+            make_reminder(1, "2100-01-01T00:00:00+00:00"),
+            make_reminder(2, "2000-01-02T00:00:00+00:00"),
+            make_reminder(3, "2000-01-01T00:00:00+00:00"),
+        ]
+
+        with patch.object(reminders.scheduling, "create_task") as create_task:
+            await self.cog.cog_load()
+
+        self.cog.scheduler.schedule_at.assert_called_once()
+        self.assertEqual(self.cog.scheduler.schedule_at.call_args.args[1], 1)
+        self.assertEqual(list(self.cog._overdue), [3, 2])
+        create_task.assert_called_once()
+        create_task.call_args.args[0].close()
+        self.reply.assert_not_awaited()
+
+    async def test_overdue_reminders_sent_concurrently(self):
+        """Overdue reminders should be sent by a bounded amount of workers, and deleted in batches."""
+        sending = 0
+        most_sending = 0
+
+        async def reply(**_kwargs) -> None:
+            nonlocal sending, most_sending
+            sending += 1
+            most_sending = max(most_sending, sending)
+            await asyncio.sleep(0.001)
+            sending -= 1
+
+        self.reply.side_effect = reply
+        self.cog._overdue = {id_: make_reminder(id_, "2000-01-01T00:00:00+00:00") for id_ in range(7)}
+
+        with (
+            patch.object(reminders.OverdueReminders, "concurrency", 3),
+            patch.object(reminders.OverdueReminders, "delete_batch_size", 5),
+        ):
+            await self.cog._send_overdue_reminders()
+
+        self.assertEqual(most_sending, 3)
+        self.assertEqual(self.reply.await_count, 7)
+        self.assertEqual(self.bot.api_client.delete.await_count, 7)
+        self.assertEqual(self.cog._overdue, {})
+
+    async def test_mentions_resolved_in_bulk(self):
+        """The mentions of all overdue reminders should be resolved with a single request."""
+        cached, fetched, role = MockMember(id=10), MockMember(id=11), MockRole(id=12)
+        self.guild.get_member.side_effect = {10: cached}.get
+        self.guild.get_role.side_effect = {12: role}.get
+        self.guild.query_members = AsyncMock(return_value=[fetched])
+        self.cog._overdue = {
+            1: make_reminder(1, "2000-01-01T00:00:00+00:00", [10, 11]),
+            2: make_reminder(2, "2000-01-01T00:00:00+00:00", [11, 12, 13]),
+        }
+
+        await self.cog._send_overdue_reminders()
+
+        self.guild.query_members.assert_awaited_once()
+        self.assertCountEqual(self.guild.query_members.call_args.kwargs["user_ids"], [11, 13])
+        contents = [call.kwargs["content"] for call in self.reply.await_args_list]
+        self.assertCountEqual(contents, [
+            f"{cached.mention} {fetched.mention}",
+            f"{fetched.mention} {role.mention}",
+        ])
+
+    async def test_edited_overdue_reminder_not_sent(self):
+        """An overdue reminder which is edited before it's sent should be rescheduled instead."""
+        reminder = make_reminder(1, "2000-01-01T00:00:00+00:00")
+        self.cog._overdue = {1: reminder}
+
+        await self.cog._reschedule_reminder({**reminder, "expiration": "2100-01-01T00:00:00+00:00"})
+        await self.cog._send_overdue_reminders()
+
+        self.cog.scheduler.cancel.assert_not_called()
+        self.cog.scheduler.schedule_at.assert_called_once()
+        self.reply.assert_not_awaited()
+
+    async def test_sent_overdue_reminder_not_modified(self):
+        """A sent overdue reminder waiting to be deleted shouldn't be edited, rescheduled or deleted separately."""
+        deleting = asyncio.Event()
+        release = asyncio.Event()
+
+        async def delete(_endpoint: str) -> None:
+            deleting.set()
+            await release.wait()
+
+        self.bot.api_client.delete.side_effect = delete
+        self.cog._overdue = {1: make_reminder(1, "2000-01-01T00:00:00+00:00")}
+        ctx = MockContext(bot=self.bot)
+
+        catch_up = asyncio.create_task(self.cog._send_overdue_reminders())
+        await deleting.wait()
+        await self.cog.edit_reminder(ctx, 1, {"expiration": "2100-01-01T00:00:00+00:00"})
+        deleted = await self.cog._delete_reminder(ctx, 1)
+        release.set()
+        await catch_up
+
+        self.assertFalse(deleted)
+        self.bot.api_client.patch.assert_not_awaited()
+        self.bot.api_client.get.assert_not_awaited()
+        self.cog.scheduler.schedule_at.assert_not_called()
+        self.bot.api_client.delete.assert_awaited_once_with("bot/reminders/1")
+        self.assertEqual(self.cog._claimed, set())
@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.utils.caching import AsyncTTLCache, TTLCache
+
+
+class TTLCacheTests(unittest.TestCase):
+    """Tests for the size-bounded TTL cache."""
+
+    @patch("bot.utils.caching.time.monotonic")
+    def test_entries_expire(self, monotonic):
+        """An entry should be retrievable until its TTL runs out."""
+        monotonic.return_value = 100
+        cache = TTLCache(max_size=10, ttl=5)
+        cache.set("key", "value")
+
+        monotonic.return_value = 104
+        self.assertEqual(cache.get("key"), "value")
+
+        monotonic.return_value = 105
+        self.assertIsNone(cache.get("key"))
+        self.assertNotIn("key", cache)
+
+    def test_cached_none_is_distinguishable(self):
+        """A cached None value should be considered present."""
+        cache = TTLCache(max_size=10, ttl=5)
+        cache.set("key", None)
+
+        self.assertIn("key", cache)
+        self.assertEqual(cache.get("key", "default"), None)
+
+    def test_least_recently_used_evicted(self):
+        """Once full, the least recently used entry should be evicted."""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+
+class AsyncTTLCacheTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the coalescing coroutine cache."""
+
+    async def test_result_cached(self):
+        """A second lookup should be answered from the cache."""
+        cache = AsyncTTLCache(max_size=10, ttl=60)
+        fetch = AsyncMock(return_value="value")
+
+        self.assertEqual(await cache.get_or_fetch("key", fetch), "value")
+        self.assertEqual(await cache.get_or_fetch("key", fetch), "value")
+        fetch.assert_awaited_once()
+
+    async def test_concurrent_lookups_coalesced(self):
+        """Concurrent lookups of the same key should share a single fetch."""
+        cache = AsyncTTLCache(max_size=10, ttl=60)
+        release = asyncio.Event()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "value"
+
+        lookups = [asyncio.create_task(cache.get_or_fetch("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await asyncio.gather(*lookups), ["value"] * 5)
+        self.assertEqual(calls, 1)
+
+    async def test_exceptions_not_cached(self):
+        """A failed fetch should propagate its exception, and be retried on the next lookup."""
+        cache = AsyncTTLCache(max_size=10, ttl=60)
+        fetch = AsyncMock(side_effect=[ValueError, "value"])
+
+        with self.assertRaises(ValueError):
+            await cache.get_or_fetch("key", fetch)
+        self.assertEqual(await cache.get_or_fetch("key", fetch), "value")
+
+    async def test_stats_recorded(self):
+        """Hits, misses and coalesced lookups should be counted under the stats prefix."""
+        cache = AsyncTTLCache(max_size=10, ttl=60, stats_prefix="test_cache")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "value"
+
+        with patch("bot.utils.caching.bot.instance", new=MagicMock()) as bot_instance:
+            lookups = [asyncio.create_task(cache.get_or_fetch("key", fetch)) for _ in range(2)]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*lookups)
+            await cache.get_or_fetch("key", fetch)
+
+        self.assertEqual(
+            [call.args[0] for call in bot_instance.stats.incr.call_args_list],
+            ["test_cache.miss", "test_cache.coalesced", "test_cache.hit"]
+        )
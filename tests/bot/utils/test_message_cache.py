@@ -1,7 +1,8 @@
 import unittest
+from datetime import UTC, datetime, timedelta
 
-from bot.utils.message_cache import MessageCache
-from tests.helpers import MockMessage
+from bot.utils.message_cache import MessageCache, MessageIndex
+from tests.helpers import MockMember, MockMessage, MockTextChannel
 
 
 # noinspection SpellCheckingInspection
@@ -211,3 +212,63 @@ class TestMessageCache(unittest.TestCase):
             with self.subTest(current_loop=current_loop):
                 self.assertEqual(len(cache), min(current_loop, 5))
                 cache.append(MockMessage())
+
+
+class TestMessageIndex(unittest.TestCase):
+    """Tests for the MessageIndex class in the `bot.utils.message_cache` module."""
+
+    def setUp(self):
+        self.start = datetime(2020, 1, 1, tzinfo=UTC)
+        self.index = MessageIndex(maxlen=3, since=self.start)
+        self.channels = [MockTextChannel(id=1), MockTextChannel(id=2)]
+        self.authors = [MockMember(id=10), MockMember(id=20)]
+
+    def make_message(self, id_: int, channel: int, author: int) -> MockMessage:
+        return MockMessage(
+            id=id_,
+            channel=self.channels[channel],
+            author=self.authors[author],
+            created_at=self.start + timedelta(minutes=id_),
+        )
+
+    def test_history_by_channel_and_author(self):
+        """Test if the messages of a channel or an author are returned newest first, after the given time."""
+        messages = [self.make_message(1, 0, 0), self.make_message(2, 1, 0), self.make_message(3, 0, 1)]
+        for message in messages:
+            self.index.add(message)
+
+        self.assertListEqual(list(self.index.channel_history(1, self.start)), [messages[2], messages[0]])
+        self.assertListEqual(list(self.index.author_history(10, self.start)), [messages[1], messages[0]])
+        self.assertListEqual(list(self.index.channel_history(1, messages[0].created_at)), [messages[2]])
+
+    def test_deleted_messages_skipped(self):
+        """Test if messages marked as deleted aren't returned anymore."""
+        messages = [self.make_message(1, 0, 0), self.make_message(2, 0, 0)]
+        for message in messages:
+            self.index.add(message)
+
+        self.index.remove(1)
+
+        self.assertNotIn(1, self.index)
+        self.assertEqual(len(self.index), 1)
+        self.assertListEqual(list(self.index.channel_history(1, self.start)), [messages[1]])
+
+    def test_coverage_moves_per_channel_on_eviction(self):
+        """Test if evicting a message only moves the coverage of its own channel past it."""
+        messages = [self.make_message(id_, channel, 0) for id_, channel in ((1, 0), (2, 1), (3, 1), (4, 1))]
+        for message in messages:
+            self.index.add(message)
+
+        self.assertFalse(self.index.covers(1, self.start))
+        self.assertTrue(self.index.covers(1, messages[0].created_at))
+        self.assertTrue(self.index.covers(2, self.start))
+        self.assertListEqual(list(self.index.channel_history(1, self.start)), [])
+
+    def test_seed_extends_coverage(self):
+        """Test if seeding the index covers all channels since the first seeded message."""
+        index = MessageIndex(maxlen=3, since=self.start + timedelta(days=1))
+
+        index.seed([self.make_message(1, 0, 0), self.make_message(2, 1, 1)])
+
+        self.assertTrue(index.covers(3, self.start + timedelta(minutes=1)))
+        self.assertEqual(len(index), 2)
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from bot.utils import modlog
+from bot.utils.modlog import LogDispatcher
+from tests.helpers import MockTextChannel
+
+
+def make_embed(description: str = "Logged") -> discord.Embed:
+    return discord.Embed(description=description)
+
+
+class LogDispatcherTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for packing log entries into messages."""
+
+    def setUp(self):
+        self.channel = MockTextChannel()
+        self.channel.send = AsyncMock(side_effect=lambda **_: MagicMock())
+        self.dispatcher = LogDispatcher(self.channel)
+
+    def sent_embeds(self) -> list[list[discord.Embed]]:
+        return [call.kwargs["embeds"] for call in self.channel.send.await_args_list]
+
+    async def test_entries_packed_in_order(self):
+        """Entries logged around the same time should be sent in a single message, in order."""
+        embeds = [make_embed(str(i)) for i in range(3)]
+
+        messages = await asyncio.gather(*(self.dispatcher.send(embed) for embed in embeds))
+
+        self.assertEqual(self.sent_embeds(), [embeds])
+        self.assertEqual(len(set(map(id, messages))), 1)
+
+    async def test_full_message_sent_without_waiting(self):
+        """Once the queued entries fill a message, it should be sent before the flush delay passes."""
+        embeds = [make_embed(str(i)) for i in range(12)]
+
+        with patch.object(modlog, "FLUSH_DELAY", 60):
+            futures = [self.dispatcher.send(embed) for embed in embeds]
+            async with asyncio.timeout(1):
+                await futures[9]
+
+        self.assertEqual(self.sent_embeds(), [embeds[:10]])
+        for future in futures[10:]:
+            self.assertFalse(future.done())
+        self.dispatcher._task.cancel()
+
+    async def test_embed_length_limit(self):
+        """Embeds which together exceed the length limit of a message should be sent in separate messages."""
+        embeds = [make_embed("a" * 4000), make_embed("b" * 4000)]
+
+        with patch.object(modlog, "FLUSH_DELAY", 0):
+            await asyncio.gather(*(self.dispatcher.send(embed) for embed in embeds))
+
+        self.assertEqual(self.sent_embeds(), [[embeds[0]], [embeds[1]]])
+
+    async def test_content_starts_new_message(self):
+        """An entry with content should start its own message, which later entries without content can join."""
+        embeds = [make_embed(str(i)) for i in range(3)]
+
+        with patch.object(modlog, "FLUSH_DELAY", 0.01):
+            await asyncio.gather(
+                self.dispatcher.send(embeds[0]),
+                self.dispatcher.send(embeds[1], content="Ping"),
+                self.dispatcher.send(embeds[2]),
+            )
+
+        self.assertEqual(self.sent_embeds(), [[embeds[0]], [embeds[1], embeds[2]]])
+        self.assertEqual(self.channel.send.await_args.kwargs["content"], "Ping")
+
+    async def test_send_error_raised_to_loggers(self):
+        """If the message can't be sent, the error should be raised to the loggers of its entries."""
+        self.channel.send.side_effect = discord.Forbidden(MagicMock(status=403), "Forbidden")
+
+        with patch.object(modlog, "FLUSH_DELAY", 0), self.assertRaises(discord.Forbidden):
+            await self.dispatcher.send(make_embed())
+
+    async def test_rejected_message_sent_separately(self):
+        """If a message of several entries is rejected, its entries should be sent alone, failing only bad ones."""
+        bad = make_embed("bad")
+        error = discord.HTTPException(MagicMock(status=400), "Invalid Form Body")
+
+        def send(*, embeds: list[discord.Embed], **_kwargs) -> MagicMock:
+            if bad in embeds:
+                raise error
+            return MagicMock()
+
+        self.channel.send.side_effect = send
+        embeds = [make_embed("first"), bad, make_embed("last")]
+
+        results = await asyncio.gather(*(self.dispatcher.send(embed) for embed in embeds), return_exceptions=True)
+
+        self.assertEqual(self.sent_embeds(), [embeds, [embeds[0]], [bad], [embeds[2]]])
+        self.assertIsInstance(results[0], MagicMock)
+        self.assertIs(results[1], error)
+        self.assertIsInstance(results[2], MagicMock)
@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from bot.utils import timers
+from bot.utils.timers import TimerService
+
+
+class TimerServiceTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for running scheduled coroutines from a single driver task."""
+
+    def setUp(self):
+        self.service = TimerService()
+        self.scheduler = self.service.scheduler("Tests")
+        self.ran = []
+
+    async def asyncTearDown(self):
+        if self.service._driver is not None:
+            self.service._driver.cancel()
+
+    async def record(self, value: object) -> None:
+        self.ran.append(value)
+
+    async def wait_until_done(self) -> None:
+        async with asyncio.timeout(1):
+            while len(self.scheduler):
+                await asyncio.sleep(0.001)
+
+    async def test_coroutines_run_in_order_of_time(self):
+        """Coroutines should run once they're due, regardless of the order they were scheduled in."""
+        self.scheduler.schedule_later(0.1, 2, self.record(2))
+        self.scheduler.schedule_at(datetime.now(tz=UTC) - timedelta(days=1), 0, self.record(0))
+        self.scheduler.schedule_later(0.05, 1, self.record(1))
+        self.assertIn(2, self.scheduler)
+
+        await self.wait_until_done()
+
+        self.assertEqual(self.ran, [0, 1, 2])
+        self.assertNotIn(2, self.scheduler)
+        self.assertEqual(len(self.scheduler), 0)
+
+    async def test_duplicate_id_not_scheduled(self):
+        """Scheduling an ID which is already scheduled should close the new coroutine instead."""
+        self.scheduler.schedule_later(0, 1, self.record("first"))
+        second = self.record("second")
+        self.scheduler.schedule_later(0, 1, second)
+
+        await self.wait_until_done()
+
+        self.assertEqual(self.ran, ["first"])
+        with self.assertRaises(RuntimeError):
+            second.send(None)
+
+    async def test_cancel_pending(self):
+        """Cancelled coroutines should be closed without running, and be dropped from the heap."""
+        self.scheduler.schedule_later(0.01, 1, self.record(1))
+        self.scheduler.schedule_later(0.01, 2, self.record(2))
+        self.scheduler.cancel(1)
+        self.assertNotIn(1, self.scheduler)
+
+        await self.wait_until_done()
+
+        self.assertEqual(self.ran, [2])
+        self.assertEqual(self.service._heap, [])
+
+    async def test_running_coroutine_can_cancel_itself(self):
+        """A running coroutine which cancels its own ID should keep running."""
+        async def cancel_self() -> None:
+            self.scheduler.cancel(1)
+            await asyncio.sleep(0)
+            self.ran.append("done")
+
+        self.scheduler.schedule_later(0, 1, cancel_self())
+        async with asyncio.timeout(1):
+            while not self.ran:
+                await asyncio.sleep(0.001)
+
+        self.assertEqual(self.ran, ["done"])
+
+    async def test_overdue_coroutines_bounded(self):
+        """At most the configured amount of due coroutines should run at once."""
+        running = 0
+        most_running = 0
+
+        async def track() -> None:
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+
+        with patch.object(timers.Timers, "max_concurrency", 3):
+            for task_id in range(10):
+                self.scheduler.schedule(task_id, track())
+            await self.wait_until_done()
+
+        self.assertEqual(most_running, 3)
+        self.assertEqual(self.service.running, 0)
+
+    def test_pending_counts(self):
+        """The pending counts should be reported per namespace."""
+        other = self.service.scheduler("Other")
+        with patch.object(self.service, "_push"):
+            self.scheduler.schedule_later(10, 1, self.record(1))
+            self.scheduler.schedule_later(10, 2, self.record(2))
+            other.schedule_later(10, 1, self.record(1))
+
+        self.assertEqual(self.service.pending_counts(), {"Tests": 2, "Other": 1})
+        self.scheduler.cancel_all()
+        other.cancel_all()